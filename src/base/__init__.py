@@ -1,9 +1,17 @@
 # AUTO-GENERATED — DO NOT EDIT
 
+from . import browser_pool
+from . import fetch_strategy
 from . import playwright_fetcher
+from .asset_cache import AssetCache
 from .base_scraper import BaseScraper
+from .base_stage import BaseStage
 
 __all__ = [
+    'browser_pool',
+    'fetch_strategy',
     'playwright_fetcher',
+    'AssetCache',
     'BaseScraper',
+    'BaseStage',
 ]
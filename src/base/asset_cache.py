@@ -0,0 +1,96 @@
+"""
+asset_cache.py
+
+Content-addressed disk cache for immutable static assets (Next.js
+/_next/static/* bundles, CSS, fonts), served to Playwright through a route:
+
+    cache = AssetCache(dir)
+    await cache.attach(context)      # every matching request goes through it
+
+The asset URLs carry a build hash, so a URL identifies its content: the
+first load stores the body under sha256(url), every later load in any
+context (or any later run, when the directory is kept) is fulfilled from
+disk. Only the document and data requests still hit the network.
+
+Anything that is not a plain 200 GET is passed through untouched.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+from typing import Any, Optional
+
+DEFAULT_ASSET_PATTERN = r"/_next/static/"
+
+# response headers worth replaying; the rest (dates, cookies, CDN ids) are per-response
+_KEEP_HEADERS = ("content-type", "cache-control", "access-control-allow-origin")
+
+
+class AssetCache:
+
+    def __init__(self, cache_dir: str, pattern: str = DEFAULT_ASSET_PATTERN):
+        self.cache_dir = cache_dir
+        self.pattern = re.compile(pattern)
+        self.stats = {"asset_hits": 0, "asset_stored": 0, "asset_bytes_saved": 0}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, url: str) -> tuple[str, str]:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, digest[:2], digest)
+        return base + ".body", base + ".json"
+
+    def load(self, url: str) -> Optional[tuple[dict[str, str], bytes]]:
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                headers = json.load(f)
+            with open(body_path, "rb") as f:
+                return headers, f.read()
+        except (OSError, ValueError):
+            return None
+
+    def store(self, url: str, headers: dict[str, str], body: bytes):
+        body_path, meta_path = self._paths(url)
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        # body first, metadata last: a half-written entry is never served
+        with open(body_path + ".tmp", "wb") as f:
+            f.write(body)
+        os.replace(body_path + ".tmp", body_path)
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({k: v for k, v in headers.items() if k.lower() in _KEEP_HEADERS}, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    # -----------------------------
+    # Playwright route
+    # -----------------------------
+    async def attach(self, context: Any):
+        await context.route(self.pattern, self._handle)
+
+    async def _handle(self, route: Any):
+        request = route.request
+        if request.method != "GET":
+            await route.continue_()
+            return
+
+        url = request.url
+        hit = await asyncio.to_thread(self.load, url)
+        if hit is not None:
+            headers, body = hit
+            self.stats["asset_hits"] += 1
+            self.stats["asset_bytes_saved"] += len(body)
+            await route.fulfill(status=200, headers=headers, body=body)
+            return
+
+        try:
+            response = await route.fetch()
+        except Exception:
+            await route.continue_()
+            return
+        if response.status == 200:
+            body = await response.body()
+            await asyncio.to_thread(self.store, url, response.headers, body)
+            self.stats["asset_stored"] += 1
+            await route.fulfill(response=response, body=body)
+        else:
+            await route.fulfill(response=response)
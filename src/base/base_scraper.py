@@ -1,14 +1,17 @@
-import json
 import os
 import time
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
-import requests
 from bs4 import BeautifulSoup
 
-from src.common import save_cache_html, load_cache_html
+from src.base.browser_pool import get_browser_pool
+
+from src.common import adaptive_ttl, save_cache_html, load_cache_html, snap_ttl_to_runs
+from src.common.delta_utils import DeltaStream, delta_path, write_delta
+from src.common.json_stream import ResultsWriter
+from src.common.records import as_plain, dumps_indented, is_record, to_dict
 
 PIPELINE_TTL = {
     "hourly": 1 * 60 * 60,
@@ -17,11 +20,25 @@ PIPELINE_TTL = {
     "monthly": 30 * 24 * 60 * 60,
 }
 
+# same cadence as the scrape_*.yml cron schedules
+PIPELINE_PERIOD_S = {
+    "hourly": 60 * 60,
+    "daily": 24 * 60 * 60,
+    "weekly": 7 * 24 * 60 * 60,
+    "monthly": 30 * 24 * 60 * 60,
+}
+
 class BaseScraper(ABC):
     def __init__(self, scraper: Any, scraper_settings: dict[str, Any]):
         self.url = scraper["url"]
         self.file_name = scraper["file_name"]
         self.scraper_settings = scraper_settings
+        # fields identifying one record of {"results": [...]}; enables delta files
+        self.record_key: Optional[list[str]] = scraper.get("record_key")
+        # {"min_s": ..., "max_s": ...}: learn the cache TTL from how often the page changes
+        self.adaptive_ttl: Optional[dict[str, int]] = scraper.get("adaptive_ttl")
+        # upper bound on every cache TTL (set by the daemon so a scheduled run never hits its own cache)
+        self.max_cache_age: Optional[int] = None
 
         root_dir = Path(__file__).resolve().parents[2]
         self.pipeline = scraper.get("pipeline", "daily")
@@ -42,53 +59,133 @@ class BaseScraper(ABC):
         # --- Final paths ---
         self.raw_html_path = os.path.join(html_dir, f"{self.file_name}.html")
         self.json_path = os.path.join(json_dir, f"{self.file_name}.json")
+        self.snapshot_path = os.path.join(html_dir, f"{self.file_name}.snapshot.json")
 
     def _fetch_html(self) -> Optional[BeautifulSoup]:
         retries = self.scraper_settings.get("retries", 3)
         delay = self.scraper_settings.get("delay", 5)
-        timeout = self.scraper_settings.get("timeout", 15)
+        # shared pool session: the same URL requested twice in one process is fetched once
+        pool = get_browser_pool(self.scraper_settings)
 
         for attempt in range(retries):
             print(f"Fetching HTML from {self.url} (Attempt {attempt + 1}/{retries})...", flush=True)
-            try:
-                response = requests.get(self.url, timeout=timeout)
-                response.raise_for_status()
-
-                save_cache_html(response.text, self.raw_html_path)
-
-                return BeautifulSoup(response.content, "lxml")
-            except requests.exceptions.RequestException as e:
-                print(f"Error fetching {self.url}: {e}", flush=True)
-                if attempt < retries - 1:
-                    print(f"Retrying in {delay} seconds...", flush=True)
-                    time.sleep(delay)
-                else:
-                    print("All retry attempts failed.", flush=True)
-                    return None
+            html = pool.fetch_static(self.url)
+            if html:
+                save_cache_html(html, self.raw_html_path)
+                return BeautifulSoup(html, "lxml")
+
+            if attempt < retries - 1:
+                print(f"Retrying in {delay} seconds...", flush=True)
+                time.sleep(delay)
+            else:
+                print("All retry attempts failed.", flush=True)
         return None
 
-    def save_to_json(self, data: dict[Any, Any] | list[Any]):
-        json_dir = os.path.dirname(self.json_path)
+    def _fetch_rendered_html(self, wait_for: str = "body", click: Optional[str] = None) -> Optional[BeautifulSoup]:
+        """JS-rendered page through the shared browser pool (tabs, retries, asset cache)."""
+        print(f"[Playwright] Fetching {self.url}", flush=True)
+        html = get_browser_pool(self.scraper_settings).fetch(self.url, wait_for=wait_for, click=click)
+        if not html:
+            print(f"[FETCH ERROR] No HTML for {self.url}", flush=True)
+            return None
+        save_cache_html(html, self.raw_html_path)
+        return BeautifulSoup(html, "lxml")
+
+    def save_to_json(self, data: dict[Any, Any] | list[Any], path: Optional[str] = None):
+        path = path or self.json_path
+        json_dir = os.path.dirname(path)
         if not os.path.exists(json_dir):
             os.makedirs(json_dir)
 
-        print(f"Saving data to {self.json_path}...")
-        with open(self.json_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
-        print(f"Successfully saved {self.json_path}")
+        print(f"Saving data to {path}...")
+        # tmp + replace: a stage reading it concurrently (daemon) never sees half a file
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(dumps_indented(data))
+        os.replace(path + ".tmp", path)
+        print(f"Successfully saved {path}")
 
     @abstractmethod
     def parse(self, soup: BeautifulSoup) -> dict[Any, Any] | list[Any]:
         pass
 
+    def iter_records(self, soup: BeautifulSoup) -> Optional[Iterator[Any]]:
+        """
+        Optional streaming protocol: yield the {"results": [...]} records one
+        by one. Scrapers that implement it are written incrementally by run()
+        instead of through parse(); None means "not supported".
+        """
+        return None
+
+    def cache_ttl(self, path: Optional[str] = None, for_schedule: bool = False) -> int:
+        """
+        How long a cached page stays fresh. In batch mode (cron runs one
+        pipeline period apart) it is snapped between runs so cron jitter never
+        decides whether a page is refetched; the daemon caps it instead
+        (max_cache_age), and `for_schedule` returns the raw value it
+        schedules adaptive jobs by.
+        """
+        path = path or self.raw_html_path
+        ttl = PIPELINE_TTL[self.pipeline]
+        if self.adaptive_ttl:
+            ttl = adaptive_ttl(
+                path,
+                self.adaptive_ttl.get("min_s", 15 * 60),
+                self.adaptive_ttl.get("max_s", PIPELINE_TTL["monthly"]),
+                ttl,
+            )
+        if self.max_cache_age is not None:
+            ttl = min(ttl, self.max_cache_age)
+        elif not for_schedule:
+            ttl = snap_ttl_to_runs(ttl, PIPELINE_PERIOD_S[self.pipeline])
+        if self.adaptive_ttl:
+            print(f"[CACHE] Adaptive TTL {ttl}s for {os.path.basename(path)}")
+        return ttl
+
     def run(self):
-        cached = load_cache_html(self.raw_html_path, PIPELINE_TTL[self.pipeline])
+        cached = load_cache_html(self.raw_html_path, self.cache_ttl())
         if cached:
             soup = cached
         else:
             soup = self._fetch_html()
         if soup:
+            records = self.iter_records(soup)
+            if records is not None:
+                self._stream(records)
+                return
             data = self.parse(soup)
             self.save_to_json(data)
+            self._write_delta(data)
         else:
             self.save_to_json({})
+            # never diff a failed fetch against the snapshot (it would look like "all removed")
+            self._drop_delta()
+
+    def _drop_delta(self):
+        """Remove an earlier run's <file>.delta.json so it is not uploaded again."""
+        if os.path.exists(delta_path(self.json_path)):
+            os.remove(delta_path(self.json_path))
+
+    def _stream(self, records: Iterator[Any]):
+        """Write records to the output file (and the delta) as they are produced."""
+        delta = DeltaStream(self.json_path, self.snapshot_path, self.record_key) if self.record_key else None
+        try:
+            with ResultsWriter(self.json_path) as out:
+                for record in records:
+                    out.write(record)
+                    if delta is not None:
+                        delta.add(to_dict(record) if is_record(record) else record)
+        except BaseException:
+            if delta is not None:
+                delta.abort()
+            # the previous output is kept; its old delta must not be applied a second time
+            self._drop_delta()
+            raise
+        if delta is not None:
+            delta.close()
+
+    def _write_delta(self, data: dict[Any, Any] | list[Any]):
+        if not self.record_key or not isinstance(data, dict):
+            return
+        results = data.get("results")
+        if isinstance(results, list):
+            write_delta(self.json_path, self.snapshot_path, as_plain(results), self.record_key)
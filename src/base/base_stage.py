@@ -0,0 +1,121 @@
+import json
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Optional
+
+# output path → (mtime_ns, size, parsed JSON); shared by all stages of one process.
+# Callers treat loaded outputs as read-only.
+_OUTPUT_MEMO: dict[str, tuple[int, int, Any]] = {}
+
+
+class BaseStage(ABC):
+    """
+    Post-scrape build step.
+
+    A stage reads JSON already written by the scrapers (any pipeline) and
+    writes a derived artifact into output/<pipeline>/json, exactly like a
+    scraper writes its own output. Configured under "stages" in config.json.
+    """
+
+    # None writes compact JSON (artifacts served as-is)
+    json_indent: Optional[int] = 4
+
+    def __init__(self, stage: Any, stage_settings: dict[str, Any]):
+        self.file_name = stage["file_name"]
+        self.stage = stage
+        self.stage_settings = stage_settings
+
+        self.root_dir = Path(__file__).resolve().parents[2]
+        self.output_root = os.path.join(self.root_dir, "output")
+        self.pipeline = stage.get("pipeline", "daily")
+
+        if stage.get("subfolder") is None:
+            subfolder = stage.get("file_name")
+        else:
+            subfolder = stage.get("subfolder", None)
+
+        html_dir = os.path.join(self.output_root, self.pipeline, "html")
+        json_dir = os.path.join(self.output_root, self.pipeline, "json")
+
+        if subfolder:
+            html_dir = os.path.join(html_dir, subfolder)
+            json_dir = os.path.join(json_dir, subfolder)
+
+        self.json_dir = json_dir
+        self.json_path = os.path.join(json_dir, f"{self.file_name}.json")
+        # stage bookkeeping lives next to the HTML cache (restored between CI runs)
+        self.state_path = os.path.join(html_dir, f"{self.file_name}.state.json")
+
+    # -----------------------------
+    # Inputs
+    # -----------------------------
+    def output_path(self, pipeline: str, file_name: str, subfolder: Optional[str] = None) -> str:
+        """Path of a scraper output, using the same layout as BaseScraper."""
+        folder = subfolder if subfolder is not None else file_name
+        return os.path.join(self.output_root, pipeline, "json", folder, f"{file_name}.json")
+
+    def load_output(self, pipeline: str, file_name: str, subfolder: Optional[str] = None) -> Optional[Any]:
+        path = self.output_path(pipeline, file_name, subfolder)
+        try:
+            st = os.stat(path)
+        except OSError:
+            print(f"[STAGE] Missing input → {path}")
+            return None
+
+        memo = _OUTPUT_MEMO.get(path)
+        if memo and memo[0] == st.st_mtime_ns and memo[1] == st.st_size:
+            return memo[2]
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            _OUTPUT_MEMO[path] = (st.st_mtime_ns, st.st_size, data)
+            return data
+        except Exception as e:
+            print(f"[STAGE ERROR] Failed loading {path}: {e}")
+            return None
+
+    # -----------------------------
+    # Incremental state
+    # -----------------------------
+    def load_state(self) -> dict[str, Any]:
+        if not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"[STAGE ERROR] Ignoring unreadable state {self.state_path}: {e}")
+            return {}
+
+    def save_state(self, state: dict[str, Any]):
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        with open(self.state_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+
+    # -----------------------------
+    # Outputs
+    # -----------------------------
+    def save_to_json(self, data: dict[Any, Any] | list[Any], path: Optional[str] = None):
+        path = path or self.json_path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        print(f"Saving data to {path}...")
+        # tmp + replace: a stage reading it concurrently (daemon) never sees half a file
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            if self.json_indent is None:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            else:
+                json.dump(data, f, ensure_ascii=False, indent=self.json_indent)
+        os.replace(path + ".tmp", path)
+        print(f"Successfully saved {path}")
+
+    @abstractmethod
+    def build(self) -> Optional[dict[Any, Any] | list[Any]]:
+        pass
+
+    def run(self):
+        data = self.build()
+        if data is not None:
+            self.save_to_json(data)
@@ -0,0 +1,457 @@
+"""
+browser_pool.py
+
+One shared headless Chromium with a bounded pool of tabs.
+
+Playwright's async API runs on a private event loop in a background thread;
+callers stay synchronous:
+
+    pool = get_browser_pool(scraper_settings)
+    html = pool.fetch(url)
+    pages = pool.fetch_many(urls)  # {url: html | None}, up to `tabs` in flight
+
+Each tab owns its own browser context (random UA / viewport, stealth init
+script). Politeness is a per-host minimum interval between navigations
+(HostRateLimiter) instead of fixed sleeps in the callers.
+
+Server-rendered pages can skip the browser: fetch_many_static() uses a
+pooled requests.Session under the same limiter and concurrency bound.
+
+Requests are coalesced per canonical URL (singleflight): concurrent callers
+of the same page share one in-flight fetch, and successful results stay
+reusable for the rest of the process (bounded by reuse_cache_mb). Duplicates
+are counted in the run report printed at close().
+
+Settings (scraper_settings["browser_pool"]):
+    tabs              parallel tabs / contexts          (default 4)
+    host_interval_s   min seconds between hits per host (default 0.5)
+    retries           attempts per URL                  (default 3)
+    pw_timeout        navigation timeout in ms          (default 60000)
+    reuse_cache_mb    completed pages kept for reuse    (default 64)
+    asset_cache_dir   disk cache for /_next/static/* assets, shared by all tabs
+                      and runs; null disables           (default output/.asset_cache)
+    asset_pattern     regex of asset URLs to cache      (default /_next/static/)
+    user_data_dir     persistent Chromium profile; tabs then share one context
+                      and its HTTP cache / cookies      (default none)
+
+fetch(url, click=selector) clicks an element once the page is ready (e.g. a
+dropdown that renders extra content) before reading the HTML.
+
+The pool is process-wide: the first get_browser_pool() caller's settings
+configure it, and a later caller whose pool settings (the keys above plus
+the top-level ones BrowserPool reads) differ gets a one-time warning.
+"""
+import asyncio
+import atexit
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+from urllib.parse import urlparse
+
+import requests
+from playwright.async_api import async_playwright
+from requests.adapters import HTTPAdapter
+
+from src.base.asset_cache import DEFAULT_ASSET_PATTERN, AssetCache
+from src.common.url_utils import canonical_url
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+
+DEFAULT_UA_POOL = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 13_5) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:125.0) Gecko/20100101 Firefox/125.0",
+]
+
+DEFAULT_VIEWPORT_POOL = [
+    {"width": 1366, "height": 768},
+    {"width": 1440, "height": 900},
+    {"width": 1536, "height": 864},
+    {"width": 1920, "height": 1080},
+]
+
+LAUNCH_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-infobars",
+    "--no-sandbox",
+    "--disable-gpu",
+]
+
+STEALTH_SCRIPT = "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+
+
+def backoff_delay(attempt: int, base: float = 1.0) -> float:
+    return base * (1.6 ** (attempt - 1)) + random.random() * 0.5
+
+
+class HostRateLimiter:
+    """Spaces out requests to the same host by at least `interval` seconds (+ small jitter)."""
+
+    def __init__(self, interval: float, jitter: float = 0.25):
+        self.interval = interval
+        self.jitter = jitter
+        self._next: dict[str, float] = {}
+        self._lock = asyncio.Lock()
+
+    async def wait(self, url: str):
+        host = urlparse(url).netloc
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, now))
+            self._next[host] = slot + self.interval + random.random() * self.jitter * self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class BrowserPool:
+
+    def __init__(self, settings: Optional[dict[str, Any]] = None):
+        settings = settings or {}
+        pool = settings.get("browser_pool", {})
+        self.tabs = int(pool.get("tabs", 4))
+        self.host_interval = float(pool.get("host_interval_s", 0.5))
+        self.retries = int(pool.get("retries", settings.get("retries", 3)))
+        self.pw_timeout = int(pool.get("pw_timeout", settings.get("pw_timeout", 60000)))
+        self.headless = settings.get("headless", True)
+        self.stealth = bool(settings.get("stealth", True))
+        self.ua_pool = settings.get("ua_pool", DEFAULT_UA_POOL)
+        self.viewport_pool = settings.get("viewport_pool", DEFAULT_VIEWPORT_POOL)
+
+        self.reuse_budget = int(float(pool.get("reuse_cache_mb", 64)) * 1024 * 1024)
+
+        asset_dir = pool.get("asset_cache_dir", os.path.join("output", ".asset_cache"))
+        self.assets = (AssetCache(os.path.join(ROOT_DIR, asset_dir), pool.get("asset_pattern", DEFAULT_ASSET_PATTERN))
+                       if asset_dir else None)
+        user_data_dir = pool.get("user_data_dir")
+        self.user_data_dir = os.path.join(ROOT_DIR, user_data_dir) if user_data_dir else None
+
+        self.stats = {
+            "fetched": 0, "failed": 0, "retries": 0,
+            "static_fetched": 0, "static_failed": 0,
+            "coalesced": 0,  # joined a fetch already in flight (or repeated within one call)
+            "reused": 0,     # served from a page completed earlier in the run
+        }
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="browser-pool", daemon=True)
+        self._thread.start()
+
+        self._pw = None
+        self._browser = None
+        self._context = None  # persistent profile context (user_data_dir only)
+        self._tabs: Optional[asyncio.Queue] = None
+        self._limiter = HostRateLimiter(self.host_interval)
+        self._static_slots = asyncio.Semaphore(self.tabs)
+        self._session: Optional[requests.Session] = None
+        self.static_timeout = int(settings.get("timeout", 15))
+        self._closed = False
+
+        # singleflight: key → task in flight / completed html (LRU, byte-bounded)
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self._done: OrderedDict[tuple, str] = OrderedDict()
+        self._done_bytes = 0
+
+    # -----------------------------
+    # Loop plumbing
+    # -----------------------------
+    def _call(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def _start(self):
+        if self._browser is not None or self._context is not None:
+            return
+        self._pw = await async_playwright().start()
+        if self.user_data_dir:
+            os.makedirs(self.user_data_dir, exist_ok=True)
+            self._context = await self._pw.chromium.launch_persistent_context(
+                self.user_data_dir, headless=self.headless, args=LAUNCH_ARGS,
+                **self._context_options(),
+            )
+            await self._prepare_context(self._context)
+        else:
+            self._browser = await self._pw.chromium.launch(headless=self.headless, args=LAUNCH_ARGS)
+        # a persistent profile opens with a blank page; reuse it as the first tab
+        spare = list(self._context.pages) if self._context is not None else []
+        self._tabs = asyncio.Queue()
+        for _ in range(self.tabs):
+            self._tabs.put_nowait(spare.pop() if spare else await self._new_tab())
+        print(f"[BrowserPool] Started Chromium with {self.tabs} tabs"
+              + (f", profile {self.user_data_dir}" if self.user_data_dir else "")
+              + (f", asset cache {self.assets.cache_dir}" if self.assets else ""))
+
+    def _context_options(self) -> dict[str, Any]:
+        return {
+            "user_agent": random.choice(self.ua_pool),
+            "viewport": random.choice(self.viewport_pool),
+            "locale": "en-US",
+            "timezone_id": "Etc/UTC",
+        }
+
+    async def _prepare_context(self, context):
+        if self.stealth:
+            await context.add_init_script(STEALTH_SCRIPT)
+        if self.assets:
+            await self.assets.attach(context)
+
+    async def _new_tab(self):
+        if self._context is not None:
+            return await self._context.new_page()
+        context = await self._browser.new_context(**self._context_options())
+        await self._prepare_context(context)
+        return await context.new_page()
+
+    async def _drop_tab(self, page):
+        # a persistent profile has a single context shared by all tabs: close only the page
+        try:
+            await (page.close() if self._context is not None else page.context.close())
+        except Exception:
+            pass
+
+    # -----------------------------
+    # Singleflight
+    # -----------------------------
+    async def _once(self, key: tuple, make: Callable[[], Awaitable[Optional[str]]]) -> Optional[str]:
+        html = self._done.get(key)
+        if html is not None:
+            self._done.move_to_end(key)
+            self.stats["reused"] += 1
+            return html
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.ensure_future(make())
+            task.add_done_callback(lambda t: self._settle(key, t))
+        else:
+            self.stats["coalesced"] += 1
+        # shield: one caller being cancelled must not cancel the shared fetch
+        return await asyncio.shield(task)
+
+    def _settle(self, key: tuple, task: asyncio.Future):
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        html = task.result()
+        # failures are not remembered, a later call may retry them
+        if not html or len(html) > self.reuse_budget:
+            return
+        self._done[key] = html
+        self._done_bytes += len(html)
+        while self._done_bytes > self.reuse_budget:
+            _, old = self._done.popitem(last=False)
+            self._done_bytes -= len(old)
+
+    def report(self) -> dict[str, Any]:
+        assets = self.assets.stats if self.assets else {}
+        return {**self.stats, **assets, "reuse_cache_pages": len(self._done)}
+
+    def new_run(self):
+        """Forget pages completed so far; a long-lived process calls this between runs so they refetch."""
+        self._loop.call_soon_threadsafe(self._clear_done)
+
+    def _clear_done(self):
+        self._done.clear()
+        self._done_bytes = 0
+
+    # -----------------------------
+    # Fetch
+    # -----------------------------
+    async def _load(self, page, url: str, wait_for: str = "body", click: Optional[str] = None) -> str:
+        await page.goto(url, timeout=self.pw_timeout, wait_until="domcontentloaded")
+        try:
+            await page.wait_for_selector(wait_for, timeout=15000)
+        except Exception:
+            print(f"[BrowserPool] {wait_for} not loaded — continue anyway ({url})")
+
+        if click:
+            try:
+                toggle = await page.query_selector(click)
+                if toggle:
+                    await toggle.click()
+                    await page.wait_for_timeout(200)
+            except Exception as e:
+                print(f"[BrowserPool] Click {click} failed — continue anyway ({url}): {e}")
+
+        # scroll once to trigger lazy-loaded images
+        await page.evaluate("window.scrollBy(0, document.body.scrollHeight)")
+        await page.wait_for_timeout(300)
+        return await page.content()
+
+    async def _fetch(self, url: str, wait_for: str = "body", click: Optional[str] = None) -> Optional[str]:
+        return await self._once(("browser", canonical_url(url), wait_for, click),
+                                lambda: self._fetch_browser(url, wait_for, click))
+
+    async def _fetch_browser(self, url: str, wait_for: str, click: Optional[str] = None) -> Optional[str]:
+        await self._start()
+        page = await self._tabs.get()
+        try:
+            for attempt in range(1, self.retries + 1):
+                await self._limiter.wait(url)
+                try:
+                    html = await self._load(page, url, wait_for, click)
+                    if html and len(html) >= 200:
+                        self.stats["fetched"] += 1
+                        return html
+                    print(f"[BrowserPool] Short HTML for {url} (attempt {attempt}/{self.retries})")
+                except Exception as e:
+                    print(f"[BrowserPool] Fetch error {url} (attempt {attempt}/{self.retries}): {e}")
+                    # a crashed page/context is replaced by a fresh one
+                    await self._drop_tab(page)
+                    page = await self._new_tab()
+
+                if attempt < self.retries:
+                    self.stats["retries"] += 1
+                    await asyncio.sleep(backoff_delay(attempt))
+
+            self.stats["failed"] += 1
+            return None
+        finally:
+            self._tabs.put_nowait(page)
+
+    async def _fetch_many(self, urls: list[str], wait_for: str, click: Optional[str] = None) -> dict[str, Optional[str]]:
+        unique = list(dict.fromkeys(urls))
+        self.stats["coalesced"] += len(urls) - len(unique)
+        results = await asyncio.gather(*(self._fetch(u, wait_for, click) for u in unique))
+        return dict(zip(unique, results))
+
+    def warm(self):
+        """Start Chromium and open the tabs now instead of on the first fetch."""
+        self._call(self._start())
+
+    def fetch(self, url: str, wait_for: str = "body", click: Optional[str] = None) -> Optional[str]:
+        return self._call(self._fetch(url, wait_for, click))
+
+    def fetch_many(self, urls: list[str], wait_for: str = "body",
+                   click: Optional[str] = None) -> dict[str, Optional[str]]:
+        """Fetch concurrently (bounded by `tabs`); returns {url: html or None}."""
+        if not urls:
+            return {}
+        started = time.monotonic()
+        pages = self._call(self._fetch_many(urls, wait_for, click))
+        ok = sum(1 for html in pages.values() if html)
+        print(f"[BrowserPool] {ok}/{len(pages)} pages in {time.monotonic() - started:.1f}s")
+        return pages
+
+    # -----------------------------
+    # Static (plain HTTP) fetch
+    # -----------------------------
+    def _http(self) -> requests.Session:
+        if self._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.tabs)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({"User-Agent": self.ua_pool[0], "Accept-Language": "en-US,en;q=0.9"})
+            self._session = session
+        return self._session
+
+    def _get(self, url: str) -> Optional[str]:
+        response = self._http().get(url, timeout=self.static_timeout)
+        response.raise_for_status()
+        if "charset" not in response.headers.get("Content-Type", "").lower():
+            response.encoding = "utf-8"  # requests would fall back to ISO-8859-1 for text/html
+        return response.text
+
+    async def _fetch_static(self, url: str) -> Optional[str]:
+        return await self._once(("static", canonical_url(url)), lambda: self._get_static(url))
+
+    async def _get_static(self, url: str) -> Optional[str]:
+        async with self._static_slots:
+            await self._limiter.wait(url)
+            try:
+                html = await asyncio.to_thread(self._get, url)
+                self.stats["static_fetched"] += 1
+                return html
+            except Exception as e:
+                print(f"[BrowserPool] Static fetch error {url}: {e}")
+                self.stats["static_failed"] += 1
+                return None
+
+    async def _fetch_many_static(self, urls: list[str]) -> dict[str, Optional[str]]:
+        unique = list(dict.fromkeys(urls))
+        self.stats["coalesced"] += len(urls) - len(unique)
+        results = await asyncio.gather(*(self._fetch_static(u) for u in unique))
+        return dict(zip(unique, results))
+
+    def fetch_static(self, url: str) -> Optional[str]:
+        return self._call(self._fetch_static(url))
+
+    def fetch_many_static(self, urls: list[str]) -> dict[str, Optional[str]]:
+        """Plain HTTP GETs (no JS), same per-host limit; {url: html or None}."""
+        if not urls:
+            return {}
+        return self._call(self._fetch_many_static(urls))
+
+    # -----------------------------
+    # Shutdown
+    # -----------------------------
+    async def _stop(self):
+        if self._context is not None:
+            await self._context.close()
+        if self._browser is not None:
+            await self._browser.close()
+        if self._pw is not None:
+            await self._pw.stop()
+        self._browser = self._context = self._pw = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        r = self.report()
+        if r["fetched"] or r["failed"] or r["static_fetched"] or r["static_failed"]:
+            print(f"[BrowserPool] Run report: browser {r['fetched']} ok / {r['failed']} failed "
+                  f"({r['retries']} retries), static {r['static_fetched']} ok / {r['static_failed']} failed, "
+                  f"duplicates: {r['coalesced']} coalesced, {r['reused']} reused"
+                  + (f", assets: {r['asset_hits']} from disk ({r['asset_bytes_saved'] // 1024} KiB), "
+                     f"{r['asset_stored']} stored" if self.assets else ""))
+        try:
+            self._call(self._stop())
+        except Exception as e:
+            print(f"[BrowserPool] Error closing browser: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+
+# -----------------------------
+# Shared instance
+# -----------------------------
+_shared: Optional[BrowserPool] = None
+_shared_settings: dict[str, Any] = {}
+_warned: list[dict[str, Any]] = []
+_shared_lock = threading.Lock()
+
+# top-level scraper_settings keys BrowserPool reads (besides "browser_pool")
+POOL_TOP_LEVEL_KEYS = ("retries", "pw_timeout", "headless", "stealth", "ua_pool", "viewport_pool", "timeout")
+
+
+def pool_settings(settings: Optional[dict[str, Any]]) -> dict[str, Any]:
+    """The part of scraper_settings that configures the pool."""
+    settings = settings or {}
+    return {"browser_pool": settings.get("browser_pool", {}),
+            **{k: settings[k] for k in POOL_TOP_LEVEL_KEYS if k in settings}}
+
+
+def get_browser_pool(settings: Optional[dict[str, Any]] = None) -> BrowserPool:
+    """Process-wide pool; the browser starts on first fetch and closes at exit."""
+    global _shared, _shared_settings
+    wanted = pool_settings(settings)
+    with _shared_lock:
+        if _shared is None or _shared._closed:
+            _shared = BrowserPool(settings)
+            _shared_settings = wanted
+            _warned.clear()
+            atexit.register(_shared.close)
+        elif wanted != _shared_settings and wanted not in _warned:
+            _warned.append(wanted)
+            diff = sorted(k for k in wanted.keys() | _shared_settings.keys()
+                          if wanted.get(k) != _shared_settings.get(k))
+            print(f"[BrowserPool] Warning: pool already running with other settings, ignoring {diff} "
+                  f"from this caller (the first caller's settings apply)")
+        return _shared
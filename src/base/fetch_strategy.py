@@ -0,0 +1,112 @@
+"""
+fetch_strategy.py
+
+Per-URL-pattern choice between a plain HTTP fetch and the headless browser.
+
+Rules come from scraper_settings["fetch_strategies"], first match wins:
+
+    {"name": "leekduck_events", "pattern": "^https://leekduck\\.com/events/",
+     "strategy": "static", "require": ["h1", "meta[property='og:image']"]}
+
+"static" pages are fetched with the pool's HTTP session and validated: every
+`require` selector must be present in the raw HTML, otherwise the URL falls
+back to the browser. URLs without a rule always use the browser.
+
+Success/failure counts per rule and strategy are kept in a small JSON file
+so the hit rate of the static path can be checked between runs.
+"""
+import json
+import os
+import re
+from typing import Any, Optional
+
+from bs4 import BeautifulSoup
+
+from src.base.browser_pool import get_browser_pool
+
+STATIC = "static"
+BROWSER = "browser"
+
+
+class FetchStrategySelector:
+
+    def __init__(self, settings: Optional[dict[str, Any]] = None, stats_path: Optional[str] = None):
+        self.settings = settings or {}
+        self.rules = [
+            {**rule, "_re": re.compile(rule["pattern"])}
+            for rule in self.settings.get("fetch_strategies", [])
+        ]
+        self.stats_path = stats_path
+        self.stats = self._load_stats()
+
+    # -----------------------------
+    # Stats
+    # -----------------------------
+    def _load_stats(self) -> dict[str, Any]:
+        if not self.stats_path or not os.path.exists(self.stats_path):
+            return {}
+        try:
+            with open(self.stats_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _record(self, rule_name: str, strategy: str, ok: bool):
+        slot = self.stats.setdefault(rule_name, {}).setdefault(strategy, {"ok": 0, "failed": 0})
+        slot["ok" if ok else "failed"] += 1
+
+    def save_stats(self):
+        if not self.stats_path:
+            return
+        for strategies in self.stats.values():
+            for slot in strategies.values():
+                total = slot["ok"] + slot["failed"]
+                slot["success_rate"] = round(slot["ok"] / total, 3) if total else None
+        os.makedirs(os.path.dirname(self.stats_path), exist_ok=True)
+        with open(self.stats_path, "w", encoding="utf-8") as f:
+            json.dump(self.stats, f, indent=2)
+
+    # -----------------------------
+    # Selection
+    # -----------------------------
+    def rule_for(self, url: str) -> Optional[dict[str, Any]]:
+        for rule in self.rules:
+            if rule["_re"].search(url):
+                return rule
+        return None
+
+    @staticmethod
+    def validate(html: Optional[str], rule: dict[str, Any]) -> bool:
+        if not html or len(html) < 200:
+            return False
+        soup = BeautifulSoup(html, "lxml")
+        return all(soup.select_one(sel) is not None for sel in rule.get("require", []))
+
+    def fetch_many(self, urls: list[str]) -> dict[str, Optional[str]]:
+        pool = get_browser_pool(self.settings)
+        pages: dict[str, Optional[str]] = {}
+
+        static: dict[str, dict[str, Any]] = {}
+        for url in dict.fromkeys(urls):
+            rule = self.rule_for(url)
+            if rule and rule.get("strategy") == STATIC:
+                static[url] = rule
+
+        for url, html in pool.fetch_many_static(list(static)).items():
+            ok = self.validate(html, static[url])
+            self._record(static[url]["name"], STATIC, ok)
+            if ok:
+                pages[url] = html
+
+        fallback = [u for u in dict.fromkeys(urls) if u not in pages]
+        if static:
+            print(f"[FetchStrategy] static: {len(static) - len(set(fallback) & set(static))}/{len(static)} ok, "
+                  f"browser: {len(fallback)}")
+
+        for url, html in pool.fetch_many(fallback).items():
+            rule = self.rule_for(url)
+            self._record(rule["name"] if rule else "default", BROWSER, bool(html))
+            pages[url] = html
+
+        self.save_stats()
+        return pages
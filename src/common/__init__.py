@@ -1,18 +1,30 @@
 # AUTO-GENERATED — DO NOT EDIT
 
+from . import block_extract
+from . import delta_utils
+from . import json_stream
 from . import normalize
+from . import records
 from . import text_utils
 from . import url_utils
 from . import utils
-from .cache_utils import (load_cache_html, load_cache_json, save_cache_html, save_cache_json)
+from .cache_utils import (adaptive_ttl, cache_age, file_digest, load_cache_html, load_cache_json, save_cache_html, save_cache_json, snap_ttl_to_runs)
 
 __all__ = [
+    'block_extract',
+    'delta_utils',
+    'json_stream',
     'text_utils',
     'normalize',
+    'records',
     'utils',
     'url_utils',
     'load_cache_json',
     'save_cache_json',
     'load_cache_html',
     'save_cache_html',
+    'file_digest',
+    'cache_age',
+    'adaptive_ttl',
+    'snap_ttl_to_runs',
 ]
@@ -0,0 +1,189 @@
+"""
+block_extract.py
+
+Declarative single-pass field extraction for repeated HTML cards/blocks.
+
+A BlockSpec maps field names to Field rules. The spec is compiled once
+(selectors are parsed and indexed by class / tag), then `extract(block)`
+walks the block's subtree a single time and keeps, for every field, the
+first matching element in document order — the same element
+`block.select_one(selector)` would return.
+
+Supported selectors: descendant chains of compound selectors made of an
+optional tag and classes, e.g. "img.shiny", ".pokemon-box img.w67".
+
+    SPEC = BlockSpec({
+        "name": Field(".top_list_poke_name", get=text),
+        "cp_box": Field(".font-s8"),
+        "cp": Field("span.gray", within="cp_box", get=text),  # inside the *first* .font-s8
+        "tl": Field(".font-12px", where=lambda el: "TL" in el.get_text(" ", strip=True)),
+    })
+    values = SPEC.extract(block)
+"""
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from bs4 import Tag
+
+Compound = tuple[Optional[str], frozenset[str]]  # (tag or None, classes)
+
+
+# -----------------------------
+# Getters
+# -----------------------------
+def text(el: Tag) -> str:
+    return el.get_text(strip=True)
+
+
+def attr(*names: str) -> Callable[[Tag], Optional[str]]:
+    """First truthy attribute, e.g. attr("data-src", "src") for lazy images."""
+    def get(el: Tag) -> Optional[str]:
+        for name in names:
+            value = el.get(name)
+            if value:
+                return value
+        return None
+    return get
+
+
+def exists(el: Tag) -> bool:
+    return True
+
+
+@dataclass
+class Field:
+    selector: str
+    get: Optional[Callable[[Tag], Any]] = None  # None → the matched Tag itself
+    within: Optional[str] = None  # only inside the element matched by that field
+    where: Optional[Callable[[Tag], bool]] = None  # first match that also satisfies this
+    default: Any = None
+
+
+def _parse_compound(part: str) -> Compound:
+    m = re.fullmatch(r"([a-zA-Z][\w-]*)?((?:\.[\w-]+)*)", part)
+    if not m:
+        raise ValueError(f"Unsupported selector part: {part!r}")
+    tag, classes = m.group(1), m.group(2)
+    return (tag.lower() if tag else None), frozenset(c for c in classes.split(".") if c)
+
+
+def _matches(name: str, classes: set[str], compound: Compound) -> bool:
+    tag, need = compound
+    return (tag is None or tag == name) and need <= classes
+
+
+class _Rule:
+    __slots__ = ("name", "target", "ancestors", "within", "where", "get", "default")
+
+    def __init__(self, name: str, field: Field):
+        parts = field.selector.split()
+        if not parts:
+            raise ValueError(f"Empty selector for field {name!r}")
+        compounds = [_parse_compound(p) for p in parts]
+        self.name = name
+        self.target = compounds[-1]
+        self.ancestors = compounds[:-1]
+        self.within = field.within
+        self.where = field.where
+        self.get = field.get
+        self.default = field.default
+
+
+class BlockSpec:
+
+    def __init__(self, fields: dict[str, Field]):
+        self.rules = [_Rule(name, f) for name, f in fields.items()]
+        by_name = {r.name: r for r in self.rules}
+
+        # index: first class of the target compound (or its tag) → rules
+        self.by_class: dict[str, list[_Rule]] = {}
+        self.by_tag: dict[str, list[_Rule]] = {}
+        self.anywhere: list[_Rule] = []
+        for rule in self.rules:
+            tag, classes = rule.target
+            if classes:
+                self.by_class.setdefault(min(classes), []).append(rule)
+            elif tag:
+                self.by_tag.setdefault(tag, []).append(rule)
+            else:
+                self.anywhere.append(rule)
+
+            if rule.within and rule.within not in by_name:
+                raise ValueError(f"Field {rule.name!r} is within unknown field {rule.within!r}")
+
+    # -----------------------------
+    # Single pass
+    # -----------------------------
+    def _candidates(self, name: str, classes: list[str]) -> list[_Rule]:
+        out = list(self.by_tag.get(name, ()))
+        for c in classes:
+            out.extend(self.by_class.get(c, ()))
+        return out + self.anywhere if self.anywhere else out
+
+    def match(self, block: Tag) -> dict[str, Optional[Tag]]:
+        """field → first matching descendant Tag (or None)."""
+        found: dict[str, Optional[Tag]] = {r.name: None for r in self.rules}
+        pending = len(self.rules)
+        stack: list[tuple[str, set[str]]] = []  # open ancestors (name, classes)
+        open_ids: set[int] = set()  # ids of open elements that were captured by some rule
+
+        def ancestors_ok(rule: _Rule) -> bool:
+            i = 0
+            for name, classes in stack:
+                if i == len(rule.ancestors):
+                    break
+                if _matches(name, classes, rule.ancestors[i]):
+                    i += 1
+            return i == len(rule.ancestors)
+
+        def walk(el: Tag) -> bool:
+            nonlocal pending
+            for child in el.children:
+                if not isinstance(child, Tag):
+                    continue
+
+                classes = child.get("class") or []
+                cls = set(classes)
+                captured = False
+                for rule in self._candidates(child.name, classes):
+                    if found[rule.name] is not None:
+                        continue
+                    if not _matches(child.name, cls, rule.target):
+                        continue
+                    if rule.within and (found[rule.within] is None or id(found[rule.within]) not in open_ids):
+                        continue
+                    if rule.ancestors and not ancestors_ok(rule):
+                        continue
+                    if rule.where and not rule.where(child):
+                        continue
+                    found[rule.name] = child
+                    captured = True
+                    pending -= 1
+
+                if not pending:
+                    return True
+
+                if child.contents:
+                    stack.append((child.name, cls))
+                    if captured:
+                        open_ids.add(id(child))
+                    done = walk(child)
+                    stack.pop()
+                    open_ids.discard(id(child))
+                    if done:
+                        return True
+            return False
+
+        walk(block)
+        return found
+
+    def extract(self, block: Tag) -> dict[str, Any]:
+        """field → value (getter applied to the match, else the field default)."""
+        out = {}
+        for rule, (name, el) in zip(self.rules, self.match(block).items()):
+            if el is None:
+                out[name] = rule.default
+            else:
+                out[name] = rule.get(el) if rule.get else el
+        return out
@@ -1,10 +1,16 @@
+import hashlib
 import json
 import os
+import re
 import time
 from typing import Any, Optional
 
 from bs4 import BeautifulSoup
 
+HISTORY_LIMIT = 20  # content hashes kept per cached page
+
+# scripts / styles / comments carry nonces and build ids that change on every fetch
+_VOLATILE = re.compile(r"<script\b.*?</script>|<style\b.*?</style>|<!--.*?-->", re.S | re.I)
 
 # -----------------------------
 # Internal helpers
@@ -14,29 +20,73 @@ def _meta_path(path: str) -> str:
     return f"{base}"
 
 
-def _is_cache_valid(path: str, max_age: int) -> bool:
+# meta path → (mtime_ns, size, meta); a long-running process stats instead of re-parsing
+_META_MEMO: dict[str, tuple[int, int, dict[str, Any]]] = {}
+
+
+def _load_meta(path: str) -> Optional[dict[str, Any]]:
+    """Metadata of a cached file, None when the file or its metadata is missing / unreadable."""
     meta_path = _meta_path(path)
+    try:
+        if not os.path.exists(path):
+            return None
+        st = os.stat(meta_path)
+    except OSError:
+        return None
 
-    if not os.path.exists(path) or not os.path.exists(meta_path):
-        return False
+    memo = _META_MEMO.get(meta_path)
+    if memo and memo[0] == st.st_mtime_ns and memo[1] == st.st_size:
+        return memo[2]
 
     try:
         with open(meta_path, "r", encoding="utf-8") as mf:
             meta = json.load(mf)
+    except Exception:
+        return None
+    _META_MEMO[meta_path] = (st.st_mtime_ns, st.st_size, meta)
+    return meta
 
-        age = time.time() - meta.get("created_time", 0)
-        return age <= max_age
 
-    except:
+def _is_cache_valid(path: str, max_age: int) -> bool:
+    meta = _load_meta(path)
+    if meta is None:
         return False
+    return time.time() - meta.get("created_time", 0) <= max_age
+
+
+def _read_meta(path: str) -> dict[str, Any]:
+    return _load_meta(path) or {}
 
 
-def _write_meta(path: str):
+def _write_meta(path: str, digest: Optional[str] = None):
     meta_file = _meta_path(path)
-    meta_data = {"created_time": int(time.time())}
+    now = int(time.time())
+    meta_data: dict[str, Any] = {"created_time": now}
+
+    if digest:
+        history = _read_meta(path).get("history", [])
+        history.append({"t": now, "hash": digest})
+        meta_data["hash"] = digest
+        meta_data["history"] = history[-HISTORY_LIMIT:]
 
     with open(meta_file, "w", encoding="utf-8") as f:
         json.dump(meta_data, f, indent=4)
+    st = os.stat(meta_file)
+    _META_MEMO[meta_file] = (st.st_mtime_ns, st.st_size, meta_data)
+
+
+def content_hash(html: str) -> str:
+    """sha1 of the page without scripts/styles/comments and with whitespace collapsed."""
+    text = re.sub(r"\s+", " ", _VOLATILE.sub("", html))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def cache_age(path: str) -> Optional[float]:
+    """Seconds since `path` was cached, None when missing / no metadata."""
+    meta = _load_meta(path)
+    if meta is None:
+        return None
+    return time.time() - meta.get("created_time", 0)
 
 
 # -----------------------------
@@ -48,7 +98,7 @@ def save_cache_html(html: str, path: str):
     with open(path, "w", encoding="utf-8") as f:
         f.write(html)
 
-    _write_meta(path)
+    _write_meta(path, content_hash(html))
     print(f"[CACHE] Saved HTML → {path}")
 
 
@@ -63,7 +113,7 @@ def load_cache_html(path: str, max_age: int = 86400) -> Optional[BeautifulSoup]:
         with open(path, "r", encoding="utf-8") as f:
             html = f.read()
 
-        age = int(time.time() - json.load(open(_meta_path(path)))["created_time"])
+        age = int(time.time() - _read_meta(path).get("created_time", 0))
         print(f"[CACHE] Loaded HTML → {path} (age={age}s)")
 
         return BeautifulSoup(html, "lxml")
@@ -95,18 +145,12 @@ def load_cache_json(path: str, max_age: int = 86400) -> Optional[Any]:
     if not _is_cache_valid(path, max_age):
         return None
 
-    meta_path = _meta_path(path)
-
     try:
         # Load JSON content
         with open(path, "r", encoding="utf-8") as f:
             data = json.load(f)
 
-        # Load metadata
-        with open(meta_path, "r", encoding="utf-8") as mf:
-            meta = json.load(mf)
-
-        age = int(time.time() - meta.get("created_time", 0))
+        age = int(time.time() - _read_meta(path).get("created_time", 0))
         print(f"[CACHE] Loaded JSON → {path} (age={age}s)")
 
         return data
@@ -114,3 +158,52 @@ def load_cache_json(path: str, max_age: int = 86400) -> Optional[Any]:
     except Exception as e:
         print(f"[CACHE ERROR] Failed loading: {e}")
         return None
+
+
+# -----------------------------
+# Adaptive TTL
+# -----------------------------
+def adaptive_ttl(path: str, min_ttl: int, max_ttl: int, default_ttl: int) -> int:
+    """
+    TTL learned from the page's content-hash history.
+
+    Changes seen over the observed span give a mean change interval; the page
+    is refetched at half that interval. A page that never changed is trusted
+    for as long as it has been observed. Clamped to [min_ttl, max_ttl].
+    """
+    history = _read_meta(path).get("history", [])
+    if len(history) < 2:
+        ttl = default_ttl
+    else:
+        span = history[-1]["t"] - history[0]["t"]
+        changes = sum(1 for a, b in zip(history, history[1:]) if a["hash"] != b["hash"])
+        ttl = span / changes / 2 if changes else max(span, default_ttl)
+
+    return int(min(max(ttl, min_ttl), max_ttl))
+
+
+def snap_ttl_to_runs(ttl: int, period: int) -> int:
+    """
+    TTL for a cache checked once per `period` (cron runs). A TTL near a
+    multiple of the period leaves the next run's fresh/stale decision to a
+    few seconds of jitter, so it is moved halfway between runs: the page is
+    refetched on the run nearest the TTL. Under half a period it is kept
+    (every run refetches anyway).
+    """
+    runs = round(ttl / period)
+    return int(ttl) if runs == 0 else int((runs - 0.5) * period)
+
+
+# -----------------------------
+# Content digests
+# -----------------------------
+def file_digest(path: str) -> Optional[str]:
+    """sha1 of a file's bytes, None when missing."""
+    if not os.path.exists(path):
+        return None
+
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
@@ -0,0 +1,263 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any, Iterator, Optional
+
+from src.common.records import dumps_indented
+
+DELTA_SUFFIX = ".delta.json"
+PENDING_SUFFIX = ".pending.json"
+
+
+# -----------------------------
+# Record identity
+# -----------------------------
+def record_id(record: dict[str, Any], key_fields: list[str]) -> str:
+    """Stable record key, e.g. ["name", "tier"] → "Raikou|5"."""
+    return "|".join("" if record.get(k) is None else str(record.get(k)) for k in key_fields)
+
+
+def record_digest(record: dict[str, Any]) -> str:
+    payload = json.dumps(record, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def index_records(records: list[dict[str, Any]], key_fields: list[str]) -> dict[str, dict[str, Any]]:
+    """id → record. Later duplicates of the same key win."""
+    return {record_id(r, key_fields): r for r in records if isinstance(r, dict)}
+
+
+# -----------------------------
+# Delta
+# -----------------------------
+def compute_delta(
+        previous: Optional[dict[str, dict[str, Any]]],
+        current: dict[str, dict[str, Any]],
+) -> dict[str, Any]:
+    """
+    Compare two id → record maps.
+    `previous=None` means there is no earlier snapshot (everything is added).
+    """
+    prev = previous or {}
+    added = [{"_id": k, **r} for k, r in current.items() if k not in prev]
+    removed = [{"_id": k, **r} for k, r in prev.items() if k not in current]
+    changed = [
+        {"_id": k, **r} for k, r in current.items()
+        if k in prev and record_digest(prev[k]) != record_digest(r)
+    ]
+
+    return {
+        "first_snapshot": previous is None,
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+        "counts": {
+            "added": len(added),
+            "removed": len(removed),
+            "changed": len(changed),
+            "total": len(current),
+        },
+    }
+
+
+def has_changes(delta: Optional[dict[str, Any]]) -> bool:
+    if delta is None or delta.get("first_snapshot"):
+        return True
+    counts = delta.get("counts", {})
+    return any(counts.get(k) for k in ("added", "removed", "changed"))
+
+
+# -----------------------------
+# Files
+# -----------------------------
+def delta_path(json_path: str) -> str:
+    return json_path[:-5] + DELTA_SUFFIX if json_path.endswith(".json") else json_path + DELTA_SUFFIX
+
+
+def is_delta_file(path: str) -> bool:
+    return path.endswith(DELTA_SUFFIX)
+
+
+def pending_snapshot_path(snapshot_path: str) -> str:
+    """Where the next snapshot waits until its upload is confirmed."""
+    return snapshot_path[:-5] + PENDING_SUFFIX if snapshot_path.endswith(".json") else snapshot_path + PENDING_SUFFIX
+
+
+def load_snapshot(snapshot_path: str) -> Optional[dict[str, dict[str, Any]]]:
+    if not os.path.exists(snapshot_path):
+        return None
+    try:
+        with open(snapshot_path, "r", encoding="utf-8") as f:
+            return json.load(f).get("records", {})
+    except Exception as e:
+        print(f"[DELTA] Ignoring unreadable snapshot {snapshot_path}: {e}")
+        return None
+
+
+def save_snapshot(snapshot_path: str, records: dict[str, dict[str, Any]], key_fields: list[str]):
+    os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+    with open(snapshot_path, "w", encoding="utf-8") as f:
+        json.dump({"key": key_fields, "created_time": int(time.time()), "records": records}, f, ensure_ascii=False)
+
+
+class DeltaStream:
+    """
+    Incremental write_delta: feed records one at a time with add(), then
+    close(). The new snapshot is streamed to disk as records arrive, and so
+    are added / changed records (a spool file, read back by close()). What
+    stays in memory is the previous snapshot (needed for "removed") and the
+    ids seen so far, not the records themselves, so a first snapshot, where
+    every record is "added", no longer holds the whole output.
+
+    The new snapshot is only staged (<snapshot>.pending.json): the diff base
+    stays the last snapshot the uploader confirmed (confirm_snapshot), so a
+    failed or skipped upload is carried into the next delta instead of lost.
+    """
+
+    def __init__(self, json_path: str, snapshot_path: str, key_fields: list[str]):
+        self.json_path = json_path
+        self.snapshot_path = snapshot_path
+        self.key_fields = key_fields
+        self.previous = load_snapshot(snapshot_path)
+        self._prev_digests = {k: record_digest(r) for k, r in (self.previous or {}).items()}
+        # id → ("added" | "changed", spool line of its latest version)
+        self.pending: dict[str, tuple[str, int]] = {}
+        self.seen: set[str] = set()
+
+        os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+        self.pending_path = pending_snapshot_path(snapshot_path)
+        self._tmp_path = self.pending_path + ".tmp"
+        self._f = open(self._tmp_path, "w", encoding="utf-8")
+        self._f.write(json.dumps({"key": key_fields, "created_time": int(time.time())}, ensure_ascii=False)[:-1])
+        self._f.write(', "records": {')
+        self._spool_path = self.pending_path + ".spool"
+        self._spool = open(self._spool_path, "w+", encoding="utf-8")
+        self._spooled = 0
+
+    def add(self, record: dict[str, Any]):
+        if not isinstance(record, dict):
+            return
+        rid = record_id(record, self.key_fields)
+        # a later duplicate of the same key wins, as in index_records
+        self.pending.pop(rid, None)
+        kind = "added" if rid not in self._prev_digests else (
+            "changed" if self._prev_digests[rid] != record_digest(record) else None)
+        if kind:
+            self._spool.write(json.dumps({"_id": rid, **record}, ensure_ascii=False) + "\n")
+            self.pending[rid] = (kind, self._spooled)
+            self._spooled += 1
+
+        self._f.write(", " if self.seen else "")
+        self._f.write(f"{json.dumps(rid, ensure_ascii=False)}: {json.dumps(record, ensure_ascii=False)}")
+        self.seen.add(rid)
+
+    def abort(self):
+        self._f.close()
+        os.remove(self._tmp_path)
+        self._spool.close()
+        os.remove(self._spool_path)
+
+    def _spooled_records(self, kind: str) -> Iterator[dict[str, Any]]:
+        self._spool.seek(0)
+        for line_no, line in enumerate(self._spool):
+            record = json.loads(line)
+            if self.pending.get(record["_id"]) == (kind, line_no):
+                yield record
+
+    def close(self) -> dict[str, Any]:
+        """
+        Write <file>.delta.json and stage the snapshot. Returns the delta
+        summary (everything but the record lists, which stay on disk).
+        """
+        self._f.write("}}")
+        self._f.close()
+
+        prev = self.previous or {}
+        removed = [{"_id": k, **r} for k, r in prev.items() if k not in self.seen]
+        kinds = [kind for kind, _ in self.pending.values()]
+        delta = {
+            "file": os.path.basename(self.json_path),
+            "key": self.key_fields,
+            "generated_at": int(time.time()),
+            "first_snapshot": self.previous is None,
+            # staged snapshot, relative to the output file (confirm_snapshot)
+            "snapshot": os.path.relpath(self.pending_path, os.path.dirname(os.path.abspath(self.json_path))),
+            "counts": {
+                "added": kinds.count("added"),
+                "removed": len(removed),
+                "changed": kinds.count("changed"),
+                "total": len(self.seen),
+            },
+        }
+
+        path = delta_path(self.json_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            # same layout as json.dump(..., indent=4), record lists streamed from the spool
+            f.write(dumps_indented(delta)[:-2])
+            for kind, records in (("added", self._spooled_records("added")),
+                                  ("removed", iter(removed)),
+                                  ("changed", self._spooled_records("changed"))):
+                f.write(f',\n    "{kind}": [')
+                first = True
+                for record in records:
+                    f.write("\n        " if first else ",\n        ")
+                    f.write(dumps_indented(record, "        "))
+                    first = False
+                f.write("]" if first else "\n    ]")
+            f.write("\n}")
+        os.replace(path + ".tmp", path)
+
+        self._spool.close()
+        os.remove(self._spool_path)
+        os.replace(self._tmp_path, self.pending_path)
+
+        c = delta["counts"]
+        print(f"[DELTA] {delta['file']}: +{c['added']} -{c['removed']} ~{c['changed']} (total {c['total']})")
+        return delta
+
+
+def write_delta(
+        json_path: str,
+        snapshot_path: str,
+        records: list[dict[str, Any]],
+        key_fields: list[str],
+) -> dict[str, Any]:
+    """
+    Diff `records` against the last confirmed snapshot, write <file>.delta.json
+    next to the output and stage the new snapshot for confirm_snapshot.
+    Returns the delta summary (load_delta reads the full patch).
+    """
+    stream = DeltaStream(json_path, snapshot_path, key_fields)
+    for record in records:
+        stream.add(record)
+    return stream.close()
+
+
+def load_delta(json_path: str) -> Optional[dict[str, Any]]:
+    """Delta written for an output file during this run, if any."""
+    path = delta_path(json_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"[DELTA] Failed loading {path}: {e}")
+        return None
+
+
+def confirm_snapshot(json_path: str, delta: Optional[dict[str, Any]]) -> bool:
+    """
+    Promote the snapshot staged with `delta` once its changes are stored
+    (e.g. uploaded), so the next delta is diffed against it.
+    """
+    rel = (delta or {}).get("snapshot")
+    if not rel:
+        return False
+    pending = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(json_path)), rel))
+    if not pending.endswith(PENDING_SUFFIX) or not os.path.exists(pending):
+        return False
+    os.replace(pending, pending[:-len(PENDING_SUFFIX)] + ".json")
+    return True
@@ -0,0 +1,57 @@
+"""
+json_stream.py
+
+Incremental writer for {"results": [...]} output files.
+
+    with ResultsWriter(path) as out:
+        for record in records:
+            out.write(record)
+
+Records are serialized one at a time (dicts or src.common.records classes),
+so the full result list never has to exist in memory. The layout is the
+same as json.dump(..., ensure_ascii=False, indent=4) of {"results": [...]}.
+
+Output goes to <path>.tmp and replaces `path` only when the block exits
+cleanly; a parse error mid-stream leaves the previous file untouched.
+"""
+import os
+from typing import Any, Optional, TextIO
+
+from src.common.records import dumps_indented
+
+_INDENT = " " * 8  # records sit two levels deep: {"results": [ {...} ]}
+
+
+class ResultsWriter:
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tmp_path = path + ".tmp"
+        self.count = 0
+        self._f: Optional[TextIO] = None
+
+    def __enter__(self) -> "ResultsWriter":
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        print(f"Streaming data to {self.path}...")
+        self._f = open(self.tmp_path, "w", encoding="utf-8")
+        self._f.write('{\n    "results": [')
+        return self
+
+    def write(self, record: Any):
+        self._f.write(",\n" if self.count else "\n")
+        self._f.write(_INDENT + dumps_indented(record, _INDENT))
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        f, self._f = self._f, None
+        if exc_type is not None:
+            f.close()
+            os.remove(self.tmp_path)
+            print(f"[STREAM] Aborted {self.path} after {self.count} records, previous file kept")
+            return False
+
+        f.write("\n    ]\n}" if self.count else ']\n}')
+        f.close()
+        os.replace(self.tmp_path, self.path)
+        print(f"Successfully saved {self.path} ({self.count} records)")
+        return False
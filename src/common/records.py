@@ -0,0 +1,179 @@
+"""
+records.py
+
+Slotted record classes for the high-volume scraper outputs.
+
+Parsers build these instead of free-form dicts: no per-instance __dict__,
+fixed field order, and no intermediate nested structure to flatten later.
+Construct them positionally in hot loops: keyword arguments roughly double
+the cost of the generated __init__ (slower than the dict literal they
+replace), positional arguments are faster than it.
+They are turned into plain dicts only where a dict is really needed:
+
+    to_dict(record)              one flat dict (field order = JSON key order)
+    as_plain(data)               {"results": [record, ...]} → plain dicts
+    json.dump(data, f, default=encode_record)
+    dumps_indented(data)         == json.dumps(data, ensure_ascii=False, indent=4, default=encode_record)
+
+to_dict uses one generated function per class ({"name": r.name, ...}, the
+way dataclasses builds __init__) instead of dataclasses.asdict, which walks
+and deep-copies every value. dumps_indented does the same for the JSON text:
+with indent set, json falls back to its pure-Python encoder, so one
+generated function per class that writes the fields straight to text skips
+both the intermediate dict and the generic encoder's per-value dispatch.
+"""
+import json
+import math
+from dataclasses import dataclass, fields
+from json.encoder import encode_basestring
+from typing import Any, Callable, Optional, Union
+
+
+@dataclass(slots=True)
+class RaidBoss:
+    name: str
+    tier: Union[int, str]
+    shiny_available: bool
+    cp_range: Optional[dict[str, int]]
+    boosted_cp_range: Optional[dict[str, int]]
+    types: list[str]
+    asset_url: Optional[str]
+
+
+@dataclass(slots=True)
+class ResearchReward:
+    """One reward of one field research task (the flattened research row)."""
+    title: str
+    task: str
+    reward_type: str
+    name: str
+    shiny_available: Optional[bool] = None
+    cp_range: Optional[dict[str, int]] = None
+    quantity: Optional[int] = None
+    asset_url: Optional[str] = None
+
+
+@dataclass(slots=True)
+class RaidNowEntry:
+    name: Optional[str]
+    post_id: Optional[str]
+    country: Optional[str]
+    image: Optional[str]
+    shiny: bool
+    cp: Optional[int]
+    cp_weather: Optional[int]
+    expired: bool
+    trainer_level: Optional[int]
+    stars: Optional[int]
+    is_hot: bool
+    is_mega: bool
+    limited_tl: Optional[int]
+    weather_icon: Optional[str]
+    team: Optional[str]
+
+
+RECORD_TYPES = (RaidBoss, ResearchReward, RaidNowEntry)
+
+
+# -----------------------------
+# Encoders
+# -----------------------------
+_TO_DICT: dict[type, Callable[[Any], dict[str, Any]]] = {}
+
+
+def _compile_to_dict(cls: type) -> Callable[[Any], dict[str, Any]]:
+    body = ", ".join(f"{f.name!r}: r.{f.name}" for f in fields(cls))
+    namespace: dict[str, Any] = {}
+    exec(f"def to_dict(r):\n    return {{{body}}}\n", namespace)
+    return namespace["to_dict"]
+
+
+def is_record(obj: Any) -> bool:
+    return isinstance(obj, RECORD_TYPES)
+
+
+def to_dict(record: Any) -> dict[str, Any]:
+    fn = _TO_DICT.get(type(record))
+    if fn is None:
+        fn = _TO_DICT[type(record)] = _compile_to_dict(type(record))
+    return fn(record)
+
+
+def encode_record(obj: Any) -> dict[str, Any]:
+    """`default=` hook for json.dump / json.dumps."""
+    if is_record(obj):
+        return to_dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# -----------------------------
+# Indented JSON text
+# -----------------------------
+_INDENT = "    "
+_TO_JSON: dict[type, Callable[[Any, str], str]] = {}
+
+
+def _compile_to_json(cls: type) -> Callable[[Any, str], str]:
+    parts = " + sep + ".join(f"{encode_basestring(f.name) + ': '!r} + _value(r.{f.name}, inner)" for f in fields(cls))
+    namespace: dict[str, Any] = {"_value": _value, "_INDENT": _INDENT}
+    exec(
+        "def to_json(r, pad):\n"
+        "    inner = pad + _INDENT\n"
+        "    sep = ',\\n' + inner\n"
+        f"    return '{{\\n' + inner + {parts} + '\\n' + pad + '}}'\n",
+        namespace,
+    )
+    return namespace["to_json"]
+
+
+def _value(v: Any, pad: str) -> str:
+    if isinstance(v, str):
+        return encode_basestring(v)
+    if v is None:
+        return "null"
+    if v is True:
+        return "true"
+    if v is False:
+        return "false"
+    if type(v) is int:
+        return int.__repr__(v)
+    if type(v) is float and math.isfinite(v):
+        return float.__repr__(v)
+    if is_record(v):
+        fn = _TO_JSON.get(type(v))
+        if fn is None:
+            fn = _TO_JSON[type(v)] = _compile_to_json(type(v))
+        return fn(v, pad)
+
+    inner = pad + _INDENT
+    if isinstance(v, (list, tuple)):
+        if not v:
+            return "[]"
+        return "[\n" + inner + (",\n" + inner).join(_value(x, inner) for x in v) + "\n" + pad + "]"
+    if isinstance(v, dict) and all(isinstance(k, str) for k in v):
+        if not v:
+            return "{}"
+        items = (encode_basestring(k) + ": " + _value(x, inner) for k, x in v.items())
+        return "{\n" + inner + (",\n" + inner).join(items) + "\n" + pad + "}"
+    # non-str keys, NaN, subclasses, ...: the stdlib encoder, shifted to this depth
+    return json.dumps(v, ensure_ascii=False, indent=4, default=encode_record).replace("\n", "\n" + pad)
+
+
+def dumps_indented(data: Any, pad: str = "") -> str:
+    """
+    json.dumps(data, ensure_ascii=False, indent=4, default=encode_record),
+    records written directly. `pad` is the indentation of the line the value
+    starts on (nested lines are shifted by it).
+    """
+    return _value(data, pad)
+
+
+def as_plain(data: Any) -> Any:
+    """Records (top level, in a list or in {"results": [...]}) → dicts; anything else unchanged."""
+    if is_record(data):
+        return to_dict(data)
+    if isinstance(data, list):
+        return [to_dict(r) if is_record(r) else r for r in data]
+    if isinstance(data, dict) and isinstance(data.get("results"), list):
+        return {**data, "results": as_plain(data["results"])}
+    return data
@@ -1,6 +1,25 @@
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
 def absolute_url(base, url):
     if url.startswith("http"):
         return url
     if url.startswith("/"):
         return base + url
     return base + "/" + url
+
+
+def canonical_url(url: str) -> str:
+    """
+    Key for "same page" checks: lower-case scheme/host, no default port,
+    no fragment, no trailing slash, sorted query.
+        HTTPS://LeekDuck.com:443/events/x/?b=2&a=1#top → https://leekduck.com/events/x?a=1&b=2
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ""))
@@ -0,0 +1,175 @@
+"""
+firestore_fake.py
+
+In-memory Firestore for exercising src.upload_firestore without touching
+production: the same collection / document / batch / select().stream()
+calls the uploader makes, with configurable round-trip latency and a
+transient error rate.
+
+    db = FakeFirestore(latency_ms=40, per_write_ms=0.05, error_rate=0.01, seed=7)
+    upload_tree(db, config, files, UploadRun(batch_size=250, concurrency=4))
+
+Like the real service:
+  - a batch commit is atomic (an injected error applies none of its writes),
+  - batches are limited to 500 writes and documents to 1 MiB,
+  - an array directly inside an array is rejected (INVALID_ARGUMENT),
+  - SERVER_TIMESTAMP is replaced by the commit time.
+Latency is a sleep outside the lock, so concurrent commits overlap.
+"""
+import json
+import random
+import threading
+import time
+from typing import Any, Iterator, Optional
+
+from firebase_admin import firestore
+
+MAX_BATCH_WRITES = 500
+MAX_DOC_BYTES = 1024 * 1024
+
+
+class FakeUnavailable(Exception):
+    """Injected transient failure (the fake's 503 UNAVAILABLE)."""
+
+
+class FakeFirestore:
+
+    def __init__(self, latency_ms: float = 0.0, per_write_ms: float = 0.0, error_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        self.latency_s = latency_ms / 1000.0
+        self.per_write_s = per_write_ms / 1000.0
+        self.error_rate = error_rate
+        self.docs: dict[str, dict[str, Any]] = {}
+        self.stats = {"rpcs": 0, "errors": 0, "writes": 0, "deletes": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def collection(self, name: str) -> "FakeCollection":
+        return FakeCollection(self, name)
+
+    def batch(self) -> "FakeBatch":
+        return FakeBatch(self)
+
+    # -----------------------------
+    # Transport
+    # -----------------------------
+    def _rpc(self, n_writes: int):
+        time.sleep(self.latency_s + self.per_write_s * n_writes)
+        with self._lock:
+            self.stats["rpcs"] += 1
+            if self.error_rate and self._rng.random() < self.error_rate:
+                self.stats["errors"] += 1
+                raise FakeUnavailable("503 UNAVAILABLE (injected)")
+
+    def _apply(self, writes: list[tuple[str, str, Optional[dict[str, Any]]]]):
+        now = time.time()
+        with self._lock:
+            for op, path, payload in writes:
+                if op == "set":
+                    self.docs[path] = {k: now if v is firestore.SERVER_TIMESTAMP else v for k, v in payload.items()}
+                    self.stats["writes"] += 1
+                else:
+                    self.docs.pop(path, None)
+                    self.stats["deletes"] += 1
+
+    @staticmethod
+    def _check_size(path: str, payload: dict[str, Any]):
+        """Reject what the real service rejects on write: oversized documents and nested arrays."""
+        size = len(json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"))
+        if size > MAX_DOC_BYTES:
+            raise ValueError(f"Document {path} is {size} bytes, over the {MAX_DOC_BYTES} byte limit")
+        nested = _nested_array(payload, "")
+        if nested is not None:
+            raise ValueError(f"Document {path}: cannot convert an array value in an array value ({nested})")
+
+
+def _nested_array(value: Any, field: str, in_array: bool = False) -> Optional[str]:
+    """Field path of the first array directly inside an array, None when there is none."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            found = _nested_array(item, f"{field}.{key}" if field else str(key))
+            if found is not None:
+                return found
+    elif isinstance(value, (list, tuple)):
+        if in_array:
+            return field
+        for i, item in enumerate(value):
+            found = _nested_array(item, f"{field}[{i}]", in_array=True)
+            if found is not None:
+                return found
+    return None
+
+
+class FakeSnapshot:
+
+    def __init__(self, doc_id: str, data: dict[str, Any]):
+        self.id = doc_id
+        self._data = data
+
+    def to_dict(self) -> dict[str, Any]:
+        return dict(self._data)
+
+
+class FakeCollection:
+
+    def __init__(self, db: FakeFirestore, path: str, fields: Optional[list[str]] = None):
+        self._db = db
+        self.path = path
+        self._fields = fields
+
+    def document(self, doc_id: str) -> "FakeDocument":
+        return FakeDocument(self._db, f"{self.path}/{doc_id}")
+
+    def select(self, fields: list[str]) -> "FakeCollection":
+        return FakeCollection(self._db, self.path, list(fields))
+
+    def stream(self) -> Iterator[FakeSnapshot]:
+        self._db._rpc(0)
+        prefix = self.path + "/"
+        with self._db._lock:
+            hits = [(path[len(prefix):], data) for path, data in self._db.docs.items()
+                    if path.startswith(prefix) and "/" not in path[len(prefix):]]
+        for doc_id, data in hits:
+            if self._fields is not None:
+                data = {k: data[k] for k in self._fields if k in data}
+            yield FakeSnapshot(doc_id, data)
+
+
+class FakeDocument:
+
+    def __init__(self, db: FakeFirestore, path: str):
+        self._db = db
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    def collection(self, name: str) -> FakeCollection:
+        return FakeCollection(self._db, f"{self.path}/{name}")
+
+    def set(self, payload: dict[str, Any]):
+        FakeFirestore._check_size(self.path, payload)
+        self._db._rpc(1)
+        self._db._apply([("set", self.path, payload)])
+
+    def get(self) -> Optional[FakeSnapshot]:
+        data = self._db.docs.get(self.path)
+        return FakeSnapshot(self.id, data) if data is not None else None
+
+
+class FakeBatch:
+
+    def __init__(self, db: FakeFirestore):
+        self._db = db
+        self._writes: list[tuple[str, str, Optional[dict[str, Any]]]] = []
+
+    def set(self, ref: FakeDocument, payload: dict[str, Any]):
+        FakeFirestore._check_size(ref.path, payload)
+        self._writes.append(("set", ref.path, payload))
+
+    def delete(self, ref: FakeDocument):
+        self._writes.append(("delete", ref.path, None))
+
+    def commit(self):
+        if len(self._writes) > MAX_BATCH_WRITES:
+            raise ValueError(f"Batch of {len(self._writes)} writes, over the {MAX_BATCH_WRITES} limit")
+        self._db._rpc(len(self._writes))
+        self._db._apply(self._writes)
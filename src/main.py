@@ -4,6 +4,17 @@ from src.pipelines.daily_pipeline import run_daily_pipeline
 from src.pipelines.hourly_pipeline import run_hourly_pipeline
 from src.pipelines.monthly_pipeline import run_monthly_pipeline
 from src.pipelines.weekly_pipeline import run_weekly_pipeline
+from src.pipelines.helpers import load_config
+
+
+def run_raidnow_poll():
+    from src.scrapers import RaidNowPoller
+
+    cfg = load_config()
+    RaidNowPoller(
+        scraper=cfg["scrapers"]["RaidNowScraper"],
+        scraper_settings=cfg["scraper_settings"]
+    ).run()
 
 
 def main():
@@ -25,6 +36,11 @@ def main():
         run_weekly_pipeline()
     elif mode == "monthly":
         run_monthly_pipeline()
+    elif mode == "raidnow-poll":
+        run_raidnow_poll()
+    elif mode == "daemon":
+        from src.pipelines.daemon import run_daemon
+        run_daemon()
     else:
         print("Unknown mode → running ALL")
         run_hourly_pipeline()
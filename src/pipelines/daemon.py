@@ -0,0 +1,187 @@
+"""
+daemon.py
+
+One long-lived process instead of a cron-started process per pipeline.
+
+    python -m src.main daemon
+
+Every enabled scraper is a job due every pipeline period (the same cadence
+as the scrape_*.yml workflows), or sooner when it learns an adaptive TTL.
+A page cached by one run must not be served to the next scheduled run (the
+hourly period equals the hourly cache TTL), so scraper caches are capped at
+half the wait until the job is due again.
+The stages of a pipeline run right after any of its scrapers ran, and on
+their own period otherwise.
+
+Jobs run in two lanes, each on its own thread: hourly jobs on the main
+thread, the long-period pipelines (daily / weekly / monthly, including the
+monthly species crawl) on a background worker, so a crawl of hours never
+holds up the hourly jobs. First runs are staggered by `stagger_s` within
+each lane, shortest period first. Jobs go through run_scraper_by_name /
+run_stage_by_name, so outputs, deltas and caches are written exactly as
+in batch mode.
+
+What the process keeps between jobs:
+  - the shared browser pool (Chromium + tabs started once, HTTP session),
+  - cache metadata (cache_utils) and parsed stage inputs such as the type
+    chart and move tables (BaseStage.load_output), re-read only when the
+    file on disk changes.
+
+Settings (optional) under "daemon" in config.json:
+    "tick_s": 30                     how often due jobs are checked
+    "schedule_s": {"NewsScraper": 900}   per scraper / stage interval override
+    "background_pipelines": ["daily", "weekly", "monthly"]
+    "stagger_s": 10                  delay between first runs in a lane
+SIGINT / SIGTERM let the running jobs finish, then close the browser.
+"""
+import signal
+import threading
+import time
+from typing import Any, Optional
+
+from src.base.base_scraper import PIPELINE_PERIOD_S
+from src.base.browser_pool import get_browser_pool
+from src.pipelines.helpers import load_config, run_scraper_by_name, run_stage_by_name
+
+BACKGROUND_PIPELINES = ("daily", "weekly", "monthly")
+
+
+class Job:
+
+    def __init__(self, kind: str, name: str, pipeline: str, interval: int):
+        self.kind = kind          # "scraper" | "stage"
+        self.name = name
+        self.pipeline = pipeline
+        self.interval = interval
+        self.due = 0.0            # monotonic; 0 = run on start
+        self.max_cache_age = interval // 2
+        self.runs = 0
+        self.failures = 0
+
+
+def build_jobs(cfg: dict[str, Any]) -> list[Job]:
+    overrides = cfg.get("daemon", {}).get("schedule_s", {})
+    jobs = []
+    for kind, section in (("scraper", "scrapers"), ("stage", "stages")):
+        for name, entry in cfg.get(section, {}).items():
+            if not entry.get("enabled"):
+                continue
+            pipeline = entry.get("pipeline", "daily")
+            interval = int(overrides.get(name, PIPELINE_PERIOD_S.get(pipeline, PIPELINE_PERIOD_S["daily"])))
+            jobs.append(Job(kind, name, pipeline, interval))
+    return jobs
+
+
+class Daemon:
+
+    def __init__(self, cfg: Optional[dict[str, Any]] = None):
+        self.cfg = cfg or load_config()
+        settings = self.cfg.get("daemon", {})
+        self.tick_s = float(settings.get("tick_s", 30))
+        self.jobs = build_jobs(self.cfg)
+        self._stop = threading.Event()
+
+        background = set(settings.get("background_pipelines", BACKGROUND_PIPELINES))
+        self.lanes = {
+            "main": [j for j in self.jobs if j.pipeline not in background],
+            "background": [j for j in self.jobs if j.pipeline in background],
+        }
+        # staggered first runs, shortest period first (the monthly crawl starts last)
+        stagger_s = float(settings.get("stagger_s", 10))
+        now = time.monotonic()
+        for jobs in self.lanes.values():
+            order = sorted(jobs, key=lambda j: (j.interval, j.kind == "stage"))
+            for i, job in enumerate(order):
+                job.due = now + i * stagger_s
+
+    def stop(self, *_):
+        if not self._stop.is_set():
+            print("[Daemon] Stop requested, finishing current jobs")
+        self._stop.set()
+
+    def _run_job(self, job: Job):
+        pool = get_browser_pool(self.cfg["scraper_settings"])
+        pool.new_run()
+        started = time.monotonic()
+        try:
+            if job.kind == "scraper":
+                inst = run_scraper_by_name(job.name, self.cfg, max_cache_age=job.max_cache_age)
+                wait = job.interval
+                # adaptive TTL: come back when the cached page is expected to be stale
+                if inst.adaptive_ttl:
+                    inst.max_cache_age = None
+                    wait = min(job.interval, inst.cache_ttl(for_schedule=True))
+                job.due = started + wait
+                # what this run cached is stale by the time the job is due again
+                job.max_cache_age = wait // 2
+            else:
+                run_stage_by_name(job.name, self.cfg)
+                job.due = started + job.interval
+            job.runs += 1
+        except Exception as e:
+            job.failures += 1
+            # retry on the next period rather than hammering a broken source
+            job.due = started + job.interval
+            print(f"[Daemon] {job.kind} {job.name} failed: {e}")
+        print(f"[Daemon] {job.name} done in {time.monotonic() - started:.1f}s, "
+              f"next in {int(job.due - time.monotonic())}s")
+
+    def tick(self, jobs: Optional[list[Job]] = None):
+        jobs = self.jobs if jobs is None else jobs
+        now = time.monotonic()
+        ran_pipelines: set[str] = set()
+        for job in jobs:
+            if self._stop.is_set():
+                return
+            if job.kind == "scraper" and job.due <= now:
+                self._run_job(job)
+                ran_pipelines.add(job.pipeline)
+
+        for job in jobs:
+            if self._stop.is_set():
+                return
+            if job.kind == "stage" and (job.due <= now or job.pipeline in ran_pipelines):
+                self._run_job(job)
+
+    def run(self, max_ticks: Optional[int] = None):
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, self.stop)
+
+        pool = get_browser_pool(self.cfg["scraper_settings"])
+        try:
+            pool.warm()
+        except Exception as e:
+            print(f"[Daemon] Browser not started ({e}), it will start on first fetch")
+
+        print(f"[Daemon] {len(self.lanes['main'])} jobs + {len(self.lanes['background'])} in background, "
+              f"checking every {self.tick_s:.0f}s")
+        worker = None
+        if self.lanes["background"]:
+            worker = threading.Thread(target=self._lane_loop, args=(self.lanes["background"], max_ticks),
+                                      name="daemon-background", daemon=True)
+            worker.start()
+        try:
+            self._lane_loop(self.lanes["main"], max_ticks)
+            if worker is not None and max_ticks:
+                worker.join()
+        finally:
+            self._stop.set()
+            if worker is not None:
+                worker.join()
+            pool.close()
+            summary = {j.name: f"{j.runs} ok / {j.failures} failed" for j in self.jobs if j.runs or j.failures}
+            print(f"[Daemon] Stopped: {summary}")
+
+    def _lane_loop(self, jobs: list[Job], max_ticks: Optional[int] = None):
+        ticks = 0
+        while not self._stop.is_set():
+            self.tick(jobs)
+            ticks += 1
+            if max_ticks and ticks >= max_ticks:
+                break
+            next_due = min((j.due for j in jobs), default=time.monotonic() + self.tick_s)
+            self._stop.wait(min(self.tick_s, max(0.0, next_due - time.monotonic())))
+
+
+def run_daemon():
+    Daemon().run()
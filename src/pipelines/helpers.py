@@ -1,8 +1,8 @@
 import json
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
-from src import scrapers
+from src import scrapers, stages
 
 def load_config() -> Dict[str, Any]:
     root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -10,12 +10,25 @@ def load_config() -> Dict[str, Any]:
         return json.load(f)
 
 
-def run_scraper_by_name(name: str, cfg: Dict[str, Any]):
+def run_scraper_by_name(name: str, cfg: Dict[str, Any], max_cache_age: Optional[int] = None):
     cls = getattr(scrapers, name)
     s_cfg = cfg["scrapers"][name]
     inst = cls(
         scraper=s_cfg,
         scraper_settings=cfg["scraper_settings"]
     )
+    inst.max_cache_age = max_cache_age
     print(f"→ Running {name}")
     inst.run()
+    return inst
+
+
+def run_stage_by_name(name: str, cfg: Dict[str, Any]):
+    cls = getattr(stages, name)
+    s_cfg = cfg["stages"][name]
+    inst = cls(
+        stage=s_cfg,
+        stage_settings=cfg.get("stage_settings", {})
+    )
+    print(f"→ Running stage {name}")
+    inst.run()
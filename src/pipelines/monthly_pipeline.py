@@ -1,4 +1,4 @@
-from src.pipelines.helpers import load_config, run_scraper_by_name
+from src.pipelines.helpers import load_config, run_scraper_by_name, run_stage_by_name
 
 
 def run_monthly_pipeline():
@@ -9,6 +9,10 @@ def run_monthly_pipeline():
         if entry.get("enabled") and entry.get("pipeline") == "monthly":
             run_scraper_by_name(name, cfg)
 
+    for name, entry in cfg.get("stages", {}).items():
+        if entry.get("enabled") and entry.get("pipeline") == "monthly":
+            run_stage_by_name(name, cfg)
+
     print("=== MONTHLY PIPELINE DONE ===")
 
 
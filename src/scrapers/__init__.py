@@ -4,6 +4,7 @@
 from src.scrapers.eggs import *
 from src.scrapers.events import *
 from src.scrapers.moves import *
+from src.scrapers.news import *
 from src.scrapers.pokemon import *
 from src.scrapers.raids import *
 from src.scrapers.research import *
@@ -15,8 +16,11 @@ __all__ = [
     'EggScraper',
     'EventPageScraper',
     'EventScraper',
+    'MovesScraper',
+    'NewsScraper',
     'PokemonDetailScraper',
     'RaidBossScraper',
+    'RaidNowPoller',
     'RaidNowScraper',
     'ResearchScraper',
     'RocketLineupScraper',
@@ -1,5 +1,5 @@
 import re
-from typing import Any, cast
+from typing import Any, Iterator, cast
 
 from bs4 import BeautifulSoup, Tag
 
@@ -7,23 +7,14 @@ from src.base import BaseScraper
 from src.common.utils import parse_pokemon_list
 
 
-def convert_egg_json(old_json: dict) -> dict:
-    result = []
-
-    for title, mons in old_json.items():
-        for mon in mons:
-            item = dict(mon)
-            item["title"] = title
-            result.append(item)
-
-    return {"results": result}
-
 class EggScraper(BaseScraper):
     def __init__(self, scraper: Any, scraper_settings: dict[str, Any]):
         super().__init__(scraper, scraper_settings)
 
     def parse(self, soup: BeautifulSoup) -> dict[str, Any]:
-        egg_pool: dict[str, Any] = {}
+        return {"results": list(self.iter_records(soup))}
+
+    def iter_records(self, soup: BeautifulSoup) -> Iterator[dict[str, Any]]:
         egg_group_titles = soup.select("article.article-page h2")
 
         for title_element in egg_group_titles:
@@ -47,7 +38,5 @@ class EggScraper(BaseScraper):
                         pokemon["rarity_tier"] = len(
                             card.select("div.rarity > svg.mini-egg")
                         )
-
-            egg_pool[egg_group_name] = pokemon_data
-
-        return convert_egg_json(egg_pool)
+                pokemon["title"] = egg_group_name
+                yield pokemon
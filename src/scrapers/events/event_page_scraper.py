@@ -1,38 +1,40 @@
 # src/scrapers/event_page_scraper.py
 import logging
-import random
+import os
 import time
+from datetime import datetime, timezone
 from typing import Any, Optional
 
 from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
 
-from src.common.utils import clean_banner_url
+from src.base.fetch_strategy import FetchStrategySelector
+from src.common import cache_age, save_cache_html
+from src.common.utils import clean_banner_url, process_time_data
 
 logger = logging.getLogger(__name__)
 
-# lightweight pools (override via settings if needed)
-DEFAULT_UA_POOL = [
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 13_5) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:125.0) Gecko/20100101 Firefox/125.0",
-]
+ACTIVE_PAGE_TTL = 6 * 60 * 60  # upcoming / ongoing events are re-checked this often
+LOCAL_TIME_GRACE = 14 * 60 * 60  # local-time events end last in UTC+14
 
-DEFAULT_VIEWPORT_POOL = [
-    {"width": 1366, "height": 768},
-    {"width": 1440, "height": 900},
-    {"width": 1536, "height": 864},
-    {"width": 1600, "height": 900},
-    {"width": 1920, "height": 1080},
-]
 
+def event_page_slug(url: str) -> str:
+    return url.rstrip("/").split("/")[-1]
 
-def jitter(base: float = 1.0, var: float = 0.6) -> float:
-    return base + random.random() * var
 
-
-def backoff_delay(attempt: int, base: float = 1.0) -> float:
-    return base * (1.6 ** (attempt - 1)) + random.random() * 0.5
+def event_end_epoch(event: dict[str, Any]) -> Optional[float]:
+    """UTC epoch after which the event is over everywhere, None when unknown."""
+    end = event.get("end_time")
+    if isinstance(end, (int, float)):
+        return float(end)
+    if isinstance(end, str) and end:
+        try:
+            dt = datetime.fromisoformat(end)
+        except ValueError:
+            return None
+        if dt.tzinfo is None:
+            return dt.replace(tzinfo=timezone.utc).timestamp() + LOCAL_TIME_GRACE
+        return dt.timestamp()
+    return None
 
 
 class EventPageScraper:
@@ -40,116 +42,25 @@ class EventPageScraper:
     Playwright-based scraper for a single event detail page.
     Public API:
       - scrape(url) -> dict | None
-      - close() -> closes any persistent browser resources (no-op here)
+      - scrape_many(urls) -> {url: dict | None}, fetched concurrently
+      - close() -> no-op (the shared browser pool closes at exit)
     """
 
-    def __init__(self, scraper_settings: dict[str, Any] | None = None):
-        scraper_settings = scraper_settings or {}
-        self.headless = scraper_settings.get("headless", True)
-        self.pw_timeout = int(scraper_settings.get("pw_timeout", 60000))
-        self.retries = int(scraper_settings.get("retries", 3))
-        self.wait_after_idle = float(scraper_settings.get("wait_after_idle", 0.8))
-        self.ua_pool = scraper_settings.get("ua_pool", DEFAULT_UA_POOL)
-        self.viewport_pool = scraper_settings.get("viewport_pool", DEFAULT_VIEWPORT_POOL)
-        self.stealth = bool(scraper_settings.get("stealth", True))
-        self.backoff_base = float(scraper_settings.get("backoff_base", 1.0))
-        # we do not keep a long-living browser here (creating/closing per request),
-        # because that matches the previous Selenium per-page approach and avoids reuse issues.
-
-    def _random_user_agent(self) -> str:
-        return random.choice(self.ua_pool)
-
-    def _random_viewport(self) -> dict:
-        return random.choice(self.viewport_pool)
-
-    def _humanize_page(self, page):
-        # small random mouse moves and scrolls
-        try:
-            for _ in range(random.randint(1, 3)):
-                x = random.randint(10, 1000)
-                y = random.randint(10, 800)
-                steps = random.randint(8, 25)
-                try:
-                    page.mouse.move(x, y, steps=steps)
-                except Exception:
-                    pass
-                time.sleep(random.random() * 0.12)
-            for _ in range(random.randint(1, 2)):
-                try:
-                    page.evaluate("window.scrollBy(0, window.innerHeight/3)")
-                except Exception:
-                    pass
-                time.sleep(random.random() * 0.18)
-        except Exception:
-            pass
-
-    def _fetch_html_with_playwright(self, url: str, attempt_limit: int = 3) -> Optional[str]:
-        for attempt in range(1, attempt_limit + 1):
-            ua = self._random_user_agent()
-            vp = self._random_viewport()
-            logger.info(f"[EventPageScraper] Fetch attempt {attempt} url={url}")
-
-            try:
-                with sync_playwright() as p:
-                    launch_args = [
-                        "--disable-blink-features=AutomationControlled",
-                        "--disable-infobars",
-                        "--no-sandbox",
-                        "--disable-gpu",
-                    ]
-                    browser = p.chromium.launch(headless=True, args=launch_args)
-
-                    ctx_kwargs = {
-                        "user_agent": ua,
-                        "viewport": vp,
-                        "locale": "en-US",
-                        "timezone_id": "Etc/UTC",
-                    }
-                    context = browser.new_context(**ctx_kwargs)
-
-                    if self.stealth:
-                        context.add_init_script(
-                            "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
-                        )
-
-                    page = context.new_page()
-
-                    # 🔥 FIX 1: dùng wait_until="domcontentloaded"
-                    page.goto(url, timeout=self.pw_timeout, wait_until="domcontentloaded")
-
-                    # 🔥 FIX 2: chờ body trước
-                    try:
-                        page.wait_for_selector("body", timeout=15000)
-                    except:
-                        logger.warning("[EventPageScraper] body not loaded — continue anyway")
-
-                    # 🔥 FIX 3: human scroll để kích hoạt lazyload
-                    self._humanize_page(page)
-                    page.evaluate("window.scrollBy(0, document.body.scrollHeight / 2)")
-                    time.sleep(0.3)
-                    page.evaluate("window.scrollBy(0, document.body.scrollHeight)")
-                    time.sleep(0.5)
-
-                    html = page.content()
-
-                    page.close()
-                    context.close()
-                    browser.close()
-
-                if not html or len(html) < 200:
-                    delay = backoff_delay(attempt, base=self.backoff_base)
-                    logger.warning(f"[EventPageScraper] short html ({len(html)}), retry after {delay:.1f}s")
-                    time.sleep(delay)
-                    continue
-
-                return html
-
-            except Exception as e:
-                delay = backoff_delay(attempt, base=self.backoff_base)
-                logger.error(f"[EventPageScraper] Fetch error attempt {attempt}: {e}; backoff {delay:.1f}s")
-                time.sleep(delay)
-
-        return None
+    def __init__(
+            self,
+            scraper_settings: dict[str, Any] | None = None,
+            stats_path: Optional[str] = None,
+            cache_dir: Optional[str] = None,
+            active_ttl: int = ACTIVE_PAGE_TTL,
+    ):
+        # fetching goes through the shared BrowserPool (one browser, pooled tabs,
+        # per-host rate limit); server-rendered pages use plain HTTP when the
+        # "fetch_strategies" rule for their URL allows it
+        self.scraper_settings = scraper_settings or {}
+        self.fetcher = FetchStrategySelector(self.scraper_settings, stats_path)
+        # <slug>.html page cache: ended events are kept forever
+        self.cache_dir = cache_dir
+        self.active_ttl = active_ttl
 
     def _parse_html(self, html: str, url: str) -> dict[str, Any]:
         soup = BeautifulSoup(html, "lxml")
@@ -180,6 +91,16 @@ class EventPageScraper:
             if d:
                 out["start_time"] = d.get_text(strip=True)
 
+        # end date (#event-date-end / #event-time-end, same format as the events list)
+        end_date = soup.select_one("#event-date-end")
+        end_time = soup.select_one("#event-time-end")
+        if end_date or end_time:
+            is_local = bool(end_time and "Local Time" in end_time.get_text())
+            end = process_time_data(end_date, end_time, is_local)
+            if end is not None:
+                out["end_time"] = end
+                out["is_local_time"] = is_local
+
         # description (first paragraph)
         p = soup.select_one(".entry-content p, .article-content p, p")
         if p:
@@ -210,8 +131,7 @@ class EventPageScraper:
 
         return out
 
-    def scrape(self, url: str) -> Optional[dict[str, Any]]:
-        html = self._fetch_html_with_playwright(url, attempt_limit=self.retries)
+    def _safe_parse(self, html: Optional[str], url: str) -> Optional[dict[str, Any]]:
         if not html:
             return None
         try:
@@ -220,6 +140,50 @@ class EventPageScraper:
             logger.exception(f"[EventPageScraper] parse error {e}")
             return None
 
+    def scrape(self, url: str) -> Optional[dict[str, Any]]:
+        return self.scrape_many([url]).get(url)
+
+    # -----------------------------
+    # Page cache
+    # -----------------------------
+    def _page_path(self, url: str) -> Optional[str]:
+        return os.path.join(self.cache_dir, f"{event_page_slug(url)}.html") if self.cache_dir else None
+
+    def _cached(self, url: str) -> Optional[dict[str, Any]]:
+        path = self._page_path(url)
+        age = cache_age(path) if path else None
+        if age is None:
+            return None
+
+        with open(path, "r", encoding="utf-8") as f:
+            parsed = self._safe_parse(f.read(), url)
+        if not parsed:
+            return None
+
+        end = event_end_epoch(parsed)
+        if end is not None and end < time.time():
+            return parsed  # finished events never change
+        return parsed if age <= self.active_ttl else None
+
+    def scrape_many(self, urls: list[str]) -> dict[str, Optional[dict[str, Any]]]:
+        """Cached pages first, the rest fetched concurrently (static HTTP or browser per rule)."""
+        out: dict[str, Optional[dict[str, Any]]] = {}
+        for url in dict.fromkeys(urls):
+            cached = self._cached(url)
+            if cached:
+                out[url] = cached
+
+        missing = [u for u in dict.fromkeys(urls) if u not in out]
+        if self.cache_dir:
+            print(f"[EventPageScraper] {len(out)} cached, fetching {len(missing)}", flush=True)
+
+        for url, html in self.fetcher.fetch_many(missing).items():
+            parsed = self._safe_parse(html, url)
+            if parsed and self.cache_dir:
+                save_cache_html(html, self._page_path(url))
+            out[url] = parsed
+        return out
+
     def close(self):
-        # stateless implementation: nothing to close
+        # the shared pool outlives a single scraper (closed at exit)
         return
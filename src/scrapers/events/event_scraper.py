@@ -1,14 +1,12 @@
 # src/scrapers/event_scraper.py
-import json
 import logging
 import os
-import time
-from typing import Any, Optional, cast
+from typing import Any, Iterator, Optional, cast
 
 import requests
 from bs4 import BeautifulSoup, Tag
 
-from .event_page_scraper import EventPageScraper, jitter
+from .event_page_scraper import ACTIVE_PAGE_TTL, EventPageScraper
 from ...base import BaseScraper
 from ...common.utils import clean_banner_url
 
@@ -18,24 +16,18 @@ logger = logging.getLogger(__name__)
 def scrape_single_event_page(url: str, scraper: EventPageScraper) -> Optional[dict[str, Any]]:
     return scraper.scrape(url)
 
-def convert_events_json(old_json: dict) -> dict:
-    result = []
-
-    for category, events in old_json.items():
-        for event in events:
-            flat = {
-                "category": category,
-                "title": event.get("title"),
-                "article_url": event.get("article_url"),
-                "banner_url": event.get("banner_url") or event.get("banner"),
-                "is_local_time": event.get("is_local_time"),
-                "start_time": event.get("start_time"),
-                "end_time": event.get("end_time"),
-                "description": event.get("description"),
-                "details": event.get("details", {}),
-            }
-            result.append(flat)
-    return {"results": result}
+def flatten_event(category: str, event: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "category": category,
+        "title": event.get("title"),
+        "article_url": event.get("article_url"),
+        "banner_url": event.get("banner_url") or event.get("banner"),
+        "is_local_time": event.get("is_local_time"),
+        "start_time": event.get("start_time"),
+        "end_time": event.get("end_time"),
+        "description": event.get("description"),
+        "details": event.get("details", {}),
+    }
 
 class EventScraper(BaseScraper):
     def __init__(
@@ -55,14 +47,14 @@ class EventScraper(BaseScraper):
         if self.check_existing_events:
             self._fetch_existing_events()
 
-        # prepare html dir for saved pages + progress
+        # prepare html dir for the event page cache (<slug>.html)
         base_html_dir = os.path.dirname(getattr(self, "raw_html_path", "") or "")
         if not base_html_dir:
             project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
             base_html_dir = os.path.join(project_root, "src", "html")
         self.html_dir = os.path.join(base_html_dir, f"{self.file_name}_pages")
         os.makedirs(self.html_dir, exist_ok=True)
-        self.progress_file = os.path.join(self.html_dir, "progress.json")
+        self.active_page_ttl = int(scraper.get("active_page_ttl_s", ACTIVE_PAGE_TTL))
 
     def _fetch_existing_events(self):
         if not self.github_user or not self.github_repo:
@@ -87,28 +79,16 @@ class EventScraper(BaseScraper):
             print(f"Could not fetch existing events: {e}", flush=True)
             self.existing_events_data = {}
 
-    def _load_progress(self) -> dict:
-        if os.path.exists(self.progress_file):
-            try:
-                with open(self.progress_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except Exception:
-                pass
-        return {"last_index": 0, "total": 0}
-
-    def _save_progress(self, last_index: int, total: int):
-        try:
-            with open(self.progress_file, "w", encoding="utf-8") as f:
-                json.dump({"last_index": last_index, "total": total}, f, indent=2)
-        except Exception as e:
-            logger.warning(f"[EventScraper] Could not write progress file: {e}")
-
     def parse(self, soup: BeautifulSoup) -> dict[str, list[dict[str, Any]]]:
+        """Index page soup → flat {"results": [...]} (existing events first, then new ones)."""
+        return {"results": list(self.iter_records(soup))}
+
+    def iter_records(self, soup: BeautifulSoup) -> Iterator[dict[str, Any]]:
         """
-        Parse index page soup into event list (same selectors as original).
-        This method preserves original behavior: returns merged events structure.
+        Yield flat events: the already published ones (check_existing_events),
+        then new ones chunk by chunk as their detail pages come in.
         """
-        events_to_scrape: list[dict[str, Any]] = []
+        events_to_scrape: dict[str, dict[str, Any]] = {}
         event_links = soup.select("a.event-item-link")
         print(f"Found {len(event_links)} event links", flush=True)
 
@@ -134,73 +114,55 @@ class EventScraper(BaseScraper):
             if image_element and image_element.has_attr("src"):
                 banner_url = clean_banner_url(str(image_element["src"]).strip())
 
-            events_to_scrape.append({
+            # keyed by article_url: a repeated link keeps its first position, last values
+            events_to_scrape[article_url] = {
                 "title": title_element.get_text(strip=True),
                 "article_url": article_url,
                 "banner_url": banner_url,
                 "category": category_element.get_text(strip=True) if category_element else "Event",
-            })
+            }
 
-        # build dict keyed by article_url
-        all_events_data = {e["article_url"]: e for e in events_to_scrape}
+        for category, events in self.existing_events_data.items():
+            for event in events:
+                yield flatten_event(category, event)
 
-        # fetch details using Playwright EventPageScraper
-        if events_to_scrape:
-            print(f"Initializing Playwright EventPageScraper for {len(events_to_scrape)} events...", flush=True)
-            page_scraper = EventPageScraper(self.scraper_settings)
-            try:
-                total = len(events_to_scrape)
-                progress = self._load_progress()
-                last = int(progress.get("last_index", 0))
-                # iterate with resume support
-                for idx, ev in enumerate(events_to_scrape, start=1):
-                    url = ev["article_url"]
-                    if idx <= last:
-                        # attempt to read saved html and parse it to keep results consistent
-                        slug = url.rstrip("/").split("/")[-1]
-                        saved = os.path.join(self.html_dir, f"{slug}.html")
-                        if os.path.exists(saved):
-                            with open(saved, "r", encoding="utf-8") as f:
-                                html = f.read()
-                                parsed = page_scraper._parse_html(html, url)
-                                if parsed:
-                                    all_events_data[url].update(parsed)
-                        continue
-
-                    print(f"Processing event {idx}/{total}: {ev['title']}", flush=True)
-                    try:
-                        parsed = scrape_single_event_page(url, page_scraper)
-                        if parsed:
-                            all_events_data[url].update(parsed)
-                            # save raw html already handled inside page scraper fetch (if you want)
-                            slug = url.rstrip("/").split("/")[-1]
-                            saved = os.path.join(self.html_dir, f"{slug}.html")
-                            # ensure saved exists (page scraper saved it); if not, create from parsed html if available
-                        else:
-                            logger.warning(f"[EventScraper] No parsed data for {url}")
-                    except Exception as e:
-                        logger.exception(f"[EventScraper] Error scraping detail {url}: {e}")
-
-                    # progress & polite sleep
-                    self._save_progress(idx, total)
-                    time.sleep(jitter(1.0, 0.6))
-
-            finally:
+        if not events_to_scrape:
+            return
+
+        # fetch details using the shared browser pool (EventPageScraper)
+        pending = list(events_to_scrape.values())
+        print(f"Initializing Playwright EventPageScraper for {len(pending)} events...", flush=True)
+        page_scraper = EventPageScraper(
+            self.scraper_settings,
+            stats_path=os.path.join(self.html_dir, "fetch_stats.json"),
+            cache_dir=self.html_dir,
+            active_ttl=self.active_page_ttl,
+        )
+        try:
+            total = len(pending)
+
+            # fetched in pool-sized chunks; each chunk's pages land in the page
+            # cache right away, so an interrupted run resumes from there
+            chunk = max(1, int(self.scraper_settings.get("browser_pool", {}).get("tabs", 4)) * 4)
+            for start in range(0, total, chunk):
+                batch = pending[start:start + chunk]
+                print(f"Processing events {start + 1}-{start + len(batch)}/{total}", flush=True)
                 try:
-                    page_scraper.close()
-                except Exception:
-                    pass
-
-        # group by category
-        new_events_by_category: dict[str, list[dict[str, Any]]] = {}
-        for ev in all_events_data.values():
-            cat = ev.get("category", "Event")
-            new_events_by_category.setdefault(cat, []).append(ev)
-
-        # merge with existing events
-        merged = self.existing_events_data.copy()
-        for cat, evs in new_events_by_category.items():
-            merged.setdefault(cat, []).extend(evs)
-
-        # convert to old flat results format if needed
-        return convert_events_json(merged)
+                    details = page_scraper.scrape_many([ev["article_url"] for ev in batch])
+                except Exception as e:
+                    logger.exception(f"[EventScraper] Error scraping details: {e}")
+                    details = {}
+
+                for ev in batch:
+                    parsed = details.get(ev["article_url"])
+                    if parsed:
+                        ev.update(parsed)
+                    else:
+                        logger.warning(f"[EventScraper] No parsed data for {ev['article_url']}")
+                    yield flatten_event(ev.get("category", "Event"), ev)
+
+        finally:
+            try:
+                page_scraper.close()
+            except Exception:
+                pass
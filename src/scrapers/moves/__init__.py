@@ -1,9 +1,7 @@
 # AUTO-GENERATED — DO NOT EDIT
 
-from . import move_table_parser
-from . import moves_scraper
+from .moves_scraper import MovesScraper
 
 __all__ = [
-    'moves_scraper',
-    'move_table_parser',
+    'MovesScraper',
 ]
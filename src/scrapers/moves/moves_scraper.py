@@ -1,11 +1,34 @@
 # moves/moves_scraper.py
+"""
+Fast / charged move lists from db.pokemongohub.net.
 
+The four tables (PvE and PvP for each category) are fetched concurrently on
+the shared browser pool, each through its own HTML cache file, and merged by
+move id into:
+  output/<pipeline>/json/moves/fast_moves.json    {"results": [...]}
+  output/<pipeline>/json/moves/charge_moves.json  {"results": [...]}
+
+With "crawl_details" enabled, /moves/<id> pages are crawled into
+move_details.json. Parsed details are kept in a state file next to the HTML
+cache together with the hash of the move's table row, so only new moves and
+moves whose row changed are fetched again.
+"""
 import json
+import os
+from typing import Any, Optional
+
+from bs4 import BeautifulSoup
 
-from playwright.sync_api import sync_playwright
+from src.base.base_scraper import BaseScraper
+from src.base.browser_pool import get_browser_pool
+from src.common import cache_age, save_cache_html
+from src.common.delta_utils import record_digest
+from src.scrapers.moves.parsers.move_detail_parser import parse_move_detail
+from src.scrapers.moves.parsers.move_table_parser import parse_move_table
 
-from src.scrapers.moves.move_table_parser import parse_move_table
+BASE = "https://db.pokemongohub.net"
 
+# key → (url, is_charge, is_pvp)
 URLS = {
     "fast_pve": ("https://db.pokemongohub.net/moves-list/category-fast", False, False),
     "fast_pvp": ("https://db.pokemongohub.net/moves-list/pvp/category-fast", False, True),
@@ -14,43 +37,129 @@ URLS = {
 }
 
 
-def fetch_html(url: str) -> str:
-    with sync_playwright() as pw:
-        browser = pw.chromium.launch(headless=True)
-        page = browser.new_page()
-        page.goto(url, timeout=60000)
-        page.wait_for_selector("table", timeout=10000)
-        html = page.content()
-        browser.close()
-    return html
+def merge_move_tables(tables: dict[str, dict[int, dict[str, Any]]]) -> tuple[list[dict], list[dict]]:
+    """Merge the per-table {id: move} dicts into (fast, charge) lists, pve/pvp combined."""
+    fast: dict[int, dict[str, Any]] = {}
+    charge: dict[int, dict[str, Any]] = {}
 
+    for key, data in tables.items():
+        target = charge if URLS[key][1] else fast
+        for move_id, move_data in data.items():
+            if move_id not in target:
+                target[move_id] = move_data
+                continue
+            if move_data["pve"]:
+                target[move_id]["pve"] = move_data["pve"]
+            if move_data["pvp"]:
+                target[move_id]["pvp"] = move_data["pvp"]
 
-def scrape_all_moves():
-    fast = {}
-    charge = {}
+    return list(fast.values()), list(charge.values())
 
-    for key, (url, is_charge, is_pvp) in URLS.items():
-        print(f"[SCRAPING] {key}...")
-        html = fetch_html(url)
-        data = parse_move_table(html, is_charge=is_charge, is_pvp=is_pvp)
 
-        for move_id, move_data in data.items():
-            target = charge if is_charge else fast
+class MovesScraper(BaseScraper):
 
-            if move_id not in target:
-                target[move_id] = move_data
+    def __init__(self, scraper: Any, scraper_settings: dict[str, Any]):
+        super().__init__(scraper, scraper_settings)
+        html_dir = os.path.dirname(self.raw_html_path)
+        json_dir = os.path.dirname(self.json_path)
+        self.table_paths = {key: os.path.join(html_dir, f"{key}.html") for key in URLS}
+        self.fast_path = os.path.join(json_dir, "fast_moves.json")
+        self.charge_path = os.path.join(json_dir, "charge_moves.json")
+
+        self.crawl_details = bool(scraper.get("crawl_details", False))
+        self.max_detail_fetches = scraper.get("max_detail_fetches")  # None → no cap
+        self.details_path = os.path.join(json_dir, "move_details.json")
+        self.details_state_path = os.path.join(html_dir, "move_details.state.json")
+
+    def _load_tables(self) -> dict[str, Optional[str]]:
+        """Cached tables where still fresh, the rest fetched in one concurrent batch."""
+        pages: dict[str, Optional[str]] = {}
+        for key, path in self.table_paths.items():
+            age = cache_age(path)
+            if age is not None and age <= self.cache_ttl(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    pages[key] = f.read()
+                print(f"[CACHE] Loaded HTML → {path} (age={int(age)}s)")
+
+        missing = {URLS[key][0]: key for key in URLS if key not in pages}
+        if missing:
+            print(f"[Moves] Fetching {len(missing)} move tables")
+            fetched = get_browser_pool(self.scraper_settings).fetch_many(list(missing), wait_for="table")
+            for url, html in fetched.items():
+                key = missing[url]
+                if html:
+                    save_cache_html(html, self.table_paths[key])
+                pages[key] = html
+
+        return pages
+
+    # ---------------------------------------------------
+    # Four tables are parsed in run() → disable parse()
+    # ---------------------------------------------------
+    def parse(self, soup: BeautifulSoup):
+        return []
+
+    def run(self):
+        pages = self._load_tables()
+
+        failed = [key for key, html in pages.items() if not html]
+        if failed:
+            # a partial merge would silently drop pve/pvp stats; keep the previous output
+            print(f"[Moves] Missing tables {failed}, skipping save")
+            return
+
+        tables = {
+            key: parse_move_table(pages[key], is_charge=is_charge, is_pvp=is_pvp)
+            for key, (_, is_charge, is_pvp) in URLS.items()
+        }
+        fast, charge = merge_move_tables(tables)
+        print(f"[Moves] {len(fast)} fast / {len(charge)} charged moves")
+
+        self.save_to_json({"results": fast}, self.fast_path)
+        self.save_to_json({"results": charge}, self.charge_path)
+
+        if self.crawl_details:
+            self._crawl_details(fast + charge)
+
+    # ---------------------------------------------------
+    # Move detail crawl (incremental)
+    # ---------------------------------------------------
+    def _load_details_state(self) -> dict[str, Any]:
+        if not os.path.exists(self.details_state_path):
+            return {}
+        try:
+            with open(self.details_state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"[Moves] Ignoring unreadable detail state: {e}")
+            return {}
+
+    def _crawl_details(self, moves: list[dict[str, Any]]):
+        state = self._load_details_state()  # str(id) → {"row_hash", "detail"}
+        row_hashes = {str(m["id"]): record_digest(m) for m in moves}
+
+        stale = [mid for mid, h in row_hashes.items() if state.get(mid, {}).get("row_hash") != h]
+        if self.max_detail_fetches is not None:
+            stale = stale[:int(self.max_detail_fetches)]
+        print(f"[Moves] Details: {len(row_hashes) - len(stale)} unchanged, fetching {len(stale)}")
+
+        urls = {f"{BASE}/moves/{mid}": mid for mid in stale}
+        pages = get_browser_pool(self.scraper_settings).fetch_many(list(urls), wait_for="h1")
+        for url, html in pages.items():
+            mid = urls[url]
+            detail = parse_move_detail(html, int(mid)) if html else None
+            if detail:
+                state[mid] = {"row_hash": row_hashes[mid], "detail": detail}
             else:
-                # merge pve/pvp
-                if move_data["pve"]:
-                    target[move_id]["pve"] = move_data["pve"]
-                if move_data["pvp"]:
-                    target[move_id]["pvp"] = move_data["pvp"]
+                # keep the previous detail; the row hash stays stale so it is retried
+                print(f"[Moves] No detail for move {mid}")
 
-    # save JSON
-    with open("fast_moves.json", "w", encoding="utf-8") as f:
-        json.dump(list(fast.values()), f, ensure_ascii=False, indent=2)
+        # moves that left the tables drop out of the state
+        state = {mid: entry for mid, entry in state.items() if mid in row_hashes}
 
-    with open("charge_moves.json", "w", encoding="utf-8") as f:
-        json.dump(list(charge.values()), f, ensure_ascii=False, indent=2)
+        os.makedirs(os.path.dirname(self.details_state_path), exist_ok=True)
+        with open(self.details_state_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
 
-    print("[DONE] Saved fast_moves.json & charge_moves.json")
+        details = [state[mid]["detail"] for mid in row_hashes if mid in state]
+        self.save_to_json({"results": details}, self.details_path)
@@ -1,2 +1,137 @@
-def parse(html):
-    return {{}}
+# moves/parsers/move_detail_parser.py
+"""
+Move detail page (db.pokemongohub.net/moves/<id>).
+
+Returns:
+  {
+    "id": int,
+    "name": str | None,
+    "description": str | None,
+    "sections": {snake_heading: {label: value, ...}},  # every table / list under a heading
+    "buffs": [{"target": ..., "stat": ..., "stages": int, "chance": float}],
+    "pvp_effects": {label: value},
+    "learners": [{"id": int, "name": str}],
+  }
+"""
+import re
+from typing import Any, Optional
+
+from bs4 import BeautifulSoup, Tag
+
+_BUFF = re.compile(
+    r"(?P<target>self|user|attacker|opponent|target|enemy)?\W*"
+    r"(?P<stat>attack|defense)\s*(?P<sign>[+\-−])\s*(?P<stages>\d+)",
+    re.I,
+)
+_CHANCE = re.compile(r"(\d+(?:\.\d+)?)\s*%")
+_POKEMON_HREF = re.compile(r"/pokemon/(\d+)")
+
+
+def _snake(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", (text or "").lower()).strip("_")
+
+
+def _num(text: str) -> Any:
+    t = (text or "").strip()
+    if re.fullmatch(r"-?\d+", t):
+        return int(t)
+    if re.fullmatch(r"-?\d+\.\d+", t):
+        return float(t)
+    return t
+
+
+def _pairs(node: Tag) -> dict[str, Any]:
+    """label → value from 2-column table rows and <dt>/<dd> lists."""
+    out: dict[str, Any] = {}
+    for tr in node.select("tr"):
+        cells = tr.find_all(["th", "td"])
+        if len(cells) == 2:
+            out[cells[0].get_text(" ", strip=True)] = _num(cells[1].get_text(" ", strip=True))
+    for dt in node.select("dt"):
+        dd = dt.find_next_sibling("dd")
+        if dd:
+            out[dt.get_text(" ", strip=True)] = _num(dd.get_text(" ", strip=True))
+    return out
+
+
+def _sections(soup: BeautifulSoup) -> dict[str, dict[str, Any]]:
+    sections: dict[str, dict[str, Any]] = {}
+    for hdr in soup.select("h2, h3"):
+        key = _snake(hdr.get_text(" ", strip=True))
+        if not key:
+            continue
+        # header + following siblings until the next header, else the wrapping article
+        pairs: dict[str, Any] = {}
+        for sib in hdr.find_next_siblings():
+            if sib.name in ("h2", "h3"):
+                break
+            pairs.update(_pairs(sib))
+        if not pairs:
+            block = hdr.find_parent("article") or hdr.find_parent("section")
+            pairs = _pairs(block) if block else {}
+        if pairs:
+            sections.setdefault(key, {}).update(pairs)
+    return sections
+
+
+def _buffs(texts: list[str]) -> list[dict[str, Any]]:
+    buffs = []
+    seen = set()
+    for text in texts:
+        chance = _CHANCE.search(text)
+        for m in _BUFF.finditer(text):
+            target = (m.group("target") or "self").lower()
+            target = "opponent" if target in ("opponent", "target", "enemy") else "self"
+            sign = -1 if m.group("sign") in "-−" else 1
+            buff = {
+                "target": target,
+                "stat": m.group("stat").lower(),
+                "stages": sign * int(m.group("stages")),
+                "chance": float(chance.group(1)) / 100 if chance else None,
+            }
+            key = tuple(buff.values())
+            if key not in seen:
+                seen.add(key)
+                buffs.append(buff)
+    return buffs
+
+
+def _learners(soup: BeautifulSoup) -> list[dict[str, Any]]:
+    learners: dict[int, dict[str, Any]] = {}
+    for a in soup.select("a[href*='/pokemon/']"):
+        m = _POKEMON_HREF.search(a.get("href", ""))
+        name = a.get_text(" ", strip=True) or (a.select_one("img") or {}).get("alt") if m else None
+        if m and name and int(m.group(1)) not in learners:
+            learners[int(m.group(1))] = {"id": int(m.group(1)), "name": name}
+    return list(learners.values())
+
+
+def parse_move_detail(html: str, move_id: int) -> Optional[dict[str, Any]]:
+    soup = BeautifulSoup(html, "lxml")
+    h1 = soup.select_one("h1")
+    if not h1:
+        return None
+
+    desc = soup.select_one("meta[name='description']")
+    sections = _sections(soup)
+
+    pvp_effects: dict[str, Any] = {}
+    for key, pairs in sections.items():
+        if "pvp" in key:
+            pvp_effects.update(pairs)
+
+    # buff text lives in "effect"/"buff" rows or free text mentioning Attack/Defense stages
+    texts = [f"{k} {v}" for pairs in sections.values() for k, v in pairs.items()
+             if re.search(r"buff|effect|chance", str(k), re.I)]
+    texts += [p.get_text(" ", strip=True) for p in soup.select("p, li")
+              if re.search(r"(attack|defense)\s*[+\-−]\s*\d", p.get_text(" ", strip=True), re.I)]
+
+    return {
+        "id": move_id,
+        "name": h1.get_text(strip=True),
+        "description": desc.get("content") if desc else None,
+        "sections": sections,
+        "buffs": _buffs(texts),
+        "pvp_effects": pvp_effects,
+        "learners": _learners(soup),
+    }
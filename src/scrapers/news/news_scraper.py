@@ -1,5 +1,186 @@
+# news/news_scraper.py
+"""
+Incremental news feed (WordPress category listing, newest first).
+
+List pages are walked from page 1 and paging stops at the first article id
+that was already seen, so a run with nothing new costs one list request.
+Detail pages of new articles are fetched concurrently through the shared
+fetch layer (static HTTP where the fetch_strategies rule allows it).
+
+Seen ids and the last `keep` articles live in a state file next to the HTML
+cache; the full feed is rewritten to JSON every run. Articles whose detail
+fetch failed are kept in the state as "pending" and retried on the next
+runs (up to `max_detail_retries`), since the early stop would never list
+them again once a newer article succeeded.
+
+A walk that stops short (a list page failed, or `max_pages` ran out before
+a seen id) leaves a gap between the articles it listed and the older seen
+ones. The state keeps a resume cursor for it ({"page", "boundary": ids of
+the last articles known before the gap}); later runs page on from there
+until they reach the boundary.
+"""
+import json
+import os
+from typing import Any, Optional
+
+from bs4 import BeautifulSoup
+
 from src.base.base_scraper import BaseScraper
+from src.base.browser_pool import get_browser_pool
+from src.base.fetch_strategy import FetchStrategySelector
+from src.scrapers.news.parsers import news_detail_parser, news_list_parser
+
+
+def _insert_by_date(items: list[dict[str, Any]], item: dict[str, Any]) -> list[dict[str, Any]]:
+    """Put a late-fetched article back in its newest-first place (at the end when undated)."""
+    published = item.get("published")
+    for i, other in enumerate(items):
+        if published and other.get("published") and other["published"] < published:
+            return items[:i] + [item] + items[i:]
+    return items + [item]
+
 
 class NewsScraper(BaseScraper):
-    def parse(self, soup):
-        return {}
+
+    def __init__(self, scraper: Any, scraper_settings: dict[str, Any]):
+        super().__init__(scraper, scraper_settings)
+        # "{page}" is replaced with 2, 3, ...; page 1 is `url`
+        self.page_url: Optional[str] = scraper.get("page_url")
+        self.max_pages = int(scraper.get("max_pages", 10))
+        self.keep = int(scraper.get("keep", 200))
+        self.max_detail_retries = int(scraper.get("max_detail_retries", 5))
+        self.state_path = os.path.join(os.path.dirname(self.raw_html_path), f"{self.file_name}.state.json")
+
+    # ---------------------------------------------------
+    # State
+    # ---------------------------------------------------
+    def _load_state(self) -> dict[str, Any]:
+        if not os.path.exists(self.state_path):
+            return {"items": [], "pending": []}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"[News] Ignoring unreadable state: {e}")
+            return {"items": [], "pending": []}
+
+    def _save_state(self, state: dict[str, Any]):
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        with open(self.state_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+
+    # ---------------------------------------------------
+    # Listing (early stop)
+    # ---------------------------------------------------
+    def _list_url(self, page: int) -> Optional[str]:
+        if page == 1:
+            return self.url
+        return self.page_url.format(page=page) if self.page_url else None
+
+    def _walk(self, start: int, known: set[str], stop_at: set[str]) -> tuple[list[dict[str, Any]], Optional[int]]:
+        """
+        Unknown list items from page `start` on, newest first, until an id in
+        `stop_at`. Returns (items, resume page); the resume page is None when
+        the walk completed, or the page to continue from when a list page
+        failed or `max_pages` ran out before the stop id was reached.
+        """
+        pool = get_browser_pool(self.scraper_settings)
+        new: list[dict[str, Any]] = []
+        listed = set()
+
+        for page in range(start, start + self.max_pages):
+            url = self._list_url(page)
+            if not url:
+                return new, None
+
+            html = pool.fetch_many_static([url]).get(url)
+            if not html:
+                print(f"[News] List page {page} failed, resuming there next run")
+                return new, page
+
+            items = news_list_parser.parse(html)
+            if not items:
+                return new, None
+
+            for item in items:
+                if item["id"] in stop_at:
+                    print(f"[News] Reached seen article {item['id']} on page {page}")
+                    return new, None
+                if item["id"] not in known and item["id"] not in listed:
+                    listed.add(item["id"])
+                    new.append(item)
+
+            if not stop_at:
+                return new, None  # first run: one page is enough to seed the feed
+
+        print(f"[News] No seen article within {self.max_pages} pages, resuming at page {start + self.max_pages}")
+        return new, start + self.max_pages
+
+    # ---------------------------------------------------
+    # This scraper walks its own pages → disable parse()
+    # ---------------------------------------------------
+    def parse(self, soup: BeautifulSoup):
+        return []
+
+    def run(self):
+        state = self._load_state()
+        items: list[dict[str, Any]] = state.get("items", [])
+        seen = {item["id"] for item in items}
+        # articles whose detail failed earlier: the listing stops before them once a newer one is seen
+        pending: list[dict[str, Any]] = [p for p in state.get("pending", []) if p["id"] not in seen]
+        pending_ids = {p["id"] for p in pending}
+
+        known = seen | pending_ids
+
+        # newest first, down to the first known article
+        new, resume_page = self._walk(1, known, known)
+        resume = state.get("resume")
+        late: list[dict[str, Any]] = []
+        if resume_page is not None:
+            # gap below the articles listed this run, down to the last complete boundary
+            boundary = resume["boundary"] if resume else [item["id"] for item in items[:20]]
+            resume = {"page": resume_page, "boundary": boundary}
+        elif resume:
+            # an earlier walk stopped short: keep paging from where it stopped, down to its boundary
+            late, gap_page = self._walk(resume["page"], known | {i["id"] for i in new}, set(resume["boundary"]))
+            resume = {**resume, "page": gap_page} if gap_page is not None else None
+        print(f"[News] {len(new)} new articles, {len(late)} from an earlier gap, retrying {len(pending)}")
+
+        todo = new + late + pending
+        if todo:
+            pages = FetchStrategySelector(
+                self.scraper_settings,
+                stats_path=os.path.join(os.path.dirname(self.raw_html_path), "fetch_stats.json"),
+            ).fetch_many([item["url"] for item in todo])
+
+            late_ids = {item["id"] for item in late}
+            fetched, retried, failed = [], [], []
+            for item in todo:
+                html = pages.get(item["url"])
+                try:
+                    if html:
+                        item.update(news_detail_parser.parse(html))
+                        older = item.pop("attempts", None) or item["id"] in late_ids
+                        (retried if older else fetched).append(item)
+                        continue
+                except Exception as e:
+                    print(f"[News] Detail parse failed for {item['url']}: {e}")
+
+                item["attempts"] = item.get("attempts", 0) + 1
+                if item["attempts"] < self.max_detail_retries:
+                    print(f"[News] No detail for {item['url']}, retrying next run")
+                    failed.append(item)
+                else:
+                    print(f"[News] No detail for {item['url']} after {item['attempts']} attempts, giving up")
+
+            items = fetched + items
+            for item in retried:
+                items = _insert_by_date(items, item)
+            items = items[:self.keep]
+            pending = failed[:self.keep]
+
+        self._save_state({"items": items, "pending": pending, "resume": resume})
+
+        data = {"results": items}
+        self.save_to_json(data)
+        self._write_delta(data)
@@ -1,2 +1,55 @@
-def parse(html):
-    return {{}}
+# news/parsers/news_detail_parser.py
+"""
+Single WordPress article → title, dates, author, categories/tags, banner,
+body text (paragraphs) and inline images.
+"""
+from typing import Any, Optional
+
+from bs4 import BeautifulSoup
+
+from src.common.utils import clean_banner_url
+
+
+def _meta(soup: BeautifulSoup, prop: str) -> Optional[str]:
+    el = soup.select_one(f"meta[property='{prop}']") or soup.select_one(f"meta[name='{prop}']")
+    return el.get("content") if el and el.get("content") else None
+
+
+def parse(html: str) -> dict[str, Any]:
+    soup = BeautifulSoup(html, "lxml")
+    out: dict[str, Any] = {}
+
+    h1 = soup.select_one("h1.entry-title, h1")
+    if h1:
+        out["title"] = h1.get_text(" ", strip=True)
+
+    time_el = soup.select_one("time[datetime]")
+    out["published"] = _meta(soup, "article:published_time") or (time_el.get("datetime") if time_el else None)
+    out["modified"] = _meta(soup, "article:modified_time")
+
+    author = soup.select_one("[rel='author'], .author-name, .author a")
+    if author:
+        out["author"] = author.get_text(" ", strip=True)
+
+    banner = _meta(soup, "og:image")
+    if banner:
+        out["banner_url"] = clean_banner_url(banner)
+
+    categories = [a.get_text(strip=True) for a in soup.select("a[rel~='category']")]
+    tags = [a.get_text(strip=True) for a in soup.select("a[rel~='tag']")]
+    tags += [el.get("content") for el in soup.select("meta[property='article:tag']") if el.get("content")]
+    if categories:
+        out["categories"] = list(dict.fromkeys(categories))
+    if tags:
+        out["tags"] = list(dict.fromkeys(tags))
+
+    body = soup.select_one(".entry-content, article .content, article")
+    if body:
+        paragraphs = [p.get_text(" ", strip=True) for p in body.select("p, li, h2, h3")]
+        out["content"] = "\n".join(p for p in paragraphs if p)
+        images = [clean_banner_url(i.get("data-src") or i.get("src")) for i in body.select("img")
+                  if i.get("data-src") or i.get("src")]
+        if images:
+            out["images"] = list(dict.fromkeys(images))
+
+    return {k: v for k, v in out.items() if v is not None}
@@ -1,2 +1,50 @@
-def parse(html):
-    return {{}}
+# news/parsers/news_list_parser.py
+"""
+WordPress category listing (newest first) → [{"id", "url", "title", "published", "thumbnail", "excerpt"}].
+
+The id is the WordPress post id (<article id="post-123">), falling back to the
+article slug when a theme does not expose it.
+"""
+import re
+from typing import Any
+
+from bs4 import BeautifulSoup
+
+_POST_ID = re.compile(r"post-(\d+)")
+
+
+def _slug(url: str) -> str:
+    return url.rstrip("/").split("/")[-1]
+
+
+def parse(html: str) -> list[dict[str, Any]]:
+    soup = BeautifulSoup(html, "lxml")
+    items: list[dict[str, Any]] = []
+    seen: set[str] = set()
+
+    for art in soup.select("article"):
+        link = art.select_one(".entry-title a, h2 a, h3 a") or art.select_one("a[href]")
+        if not link or not link.get("href"):
+            continue
+        url = link["href"]
+
+        m = _POST_ID.search(" ".join([art.get("id") or ""] + (art.get("class") or [])))
+        item_id = m.group(1) if m else _slug(url)
+        if item_id in seen:
+            continue
+        seen.add(item_id)
+
+        time_el = art.select_one("time[datetime]")
+        img = art.select_one("img")
+        excerpt = art.select_one(".entry-summary, .excerpt, p")
+
+        items.append({
+            "id": item_id,
+            "url": url,
+            "title": link.get_text(" ", strip=True) or None,
+            "published": time_el.get("datetime") if time_el else None,
+            "thumbnail": (img.get("data-src") or img.get("src")) if img else None,
+            "excerpt": excerpt.get_text(" ", strip=True) if excerpt else None,
+        })
+
+    return items
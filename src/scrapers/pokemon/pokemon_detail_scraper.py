@@ -3,7 +3,7 @@ pokemon_detail_scraper.py
 
 Main orchestrator class.
 - Reuses BaseScraper
-- Reuses external Playwright context if provided
+- Renders pages in the shared browser pool
 - Loads cached HTML if exists
 - Fetches page + expands form dropdown
 - Parses sections via TOC and delegates to small parser modules
@@ -12,15 +12,14 @@ Main orchestrator class.
 from typing import Optional, Any, Dict
 
 from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
 
 from src.base.base_scraper import BaseScraper
-from src.common import save_cache_html
 from src.common.normalize import normalize_url
 from src.common.utils import parse_toc
 from src.scrapers.pokemon.parsers import *
 
 BASE = "https://db.pokemongohub.net"
+FORM_SELECTOR = ".CoreSelect_select__ABUYR[role='combobox']"
 
 
 # ============================================================
@@ -28,79 +27,12 @@ BASE = "https://db.pokemongohub.net"
 # ============================================================
 class PokemonDetailScraper(BaseScraper):
 
-    def __init__(self, scraper: Any, scraper_settings: dict[str, Any], external_context=None):
-        super().__init__(scraper, scraper_settings)
-        self.external_context = external_context
-
     # ----------------------------------------
-    # Playwright fetch (with fallback)
+    # Playwright fetch (shared browser pool)
     # ----------------------------------------
     def _fetch_html(self) -> Optional[BeautifulSoup]:
-        print(f"[Playwright] Fetching {self.url}")
-
-        if self.external_context:
-            try:
-                page = self.external_context.new_page()
-                page.goto(self.url, timeout=60000)
-                page.wait_for_selector(".CoreSelect_select__ABUYR[role='combobox']", timeout=15000)
-                toggle = page.query_selector(".CoreSelect_select__ABUYR[role='combobox']")
-                if toggle:
-                    toggle.click()
-                    page.wait_for_timeout(200)
-                html = page.content()
-                save_cache_html(html, self.raw_html_path)
-                page.close()
-                return BeautifulSoup(html, "lxml")
-            except Exception as e:
-                print(f"[Context fetch error] {e}")
-
-        # ✓ 3. Create new browser context (slow path)
-        try:
-            with sync_playwright() as pw:
-                browser = pw.chromium.launch(
-                    headless=True,
-                    args=[
-                        "--disable-blink-features=AutomationControlled",
-                        "--disable-infobars",
-                        "--no-sandbox",
-                        "--disable-dev-shm-usage",
-                    ]
-                )
-                ctx = browser.new_context(
-                    user_agent=(
-                        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                        "AppleWebKit/537.36 (KHTML, like Gecko) "
-                        "Chrome/120 Safari/537.36"
-                    ),
-                    viewport={"width": 1280, "height": 900},
-                )
-                ctx.add_init_script("Object.defineProperty(navigator,'webdriver',{get:()=>undefined});")
-
-                page = ctx.new_page()
-                page.goto(self.url, timeout=60000)
-
-                # expand form dropdown
-                try:
-                    page.wait_for_selector(".CoreSelect_select__ABUYR[role='combobox']", timeout=15000)
-                    t = page.query_selector(".CoreSelect_select__ABUYR[role='combobox']")
-                    if t:
-                        t.click()
-                        page.wait_for_timeout(200)
-                except:
-                    pass
-
-                html = page.content()
-                save_cache_html(html, self.raw_html_path)
-
-                page.close()
-                ctx.close()
-                browser.close()
-
-                return BeautifulSoup(html, "lxml")
-
-        except Exception as e:
-            print(f"[FETCH ERROR] {e}")
-            return None
+        # expanding the form dropdown renders the form list parse_forms reads
+        return self._fetch_rendered_html(wait_for=FORM_SELECTOR, click=FORM_SELECTOR)
 
     # ============================================================
     #                            PARSE
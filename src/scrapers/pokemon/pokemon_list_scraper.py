@@ -4,7 +4,7 @@ from typing import Any, List
 
 import requests
 
-from src.base.base_scraper import BaseScraper, PIPELINE_TTL
+from src.base.base_scraper import BaseScraper
 from src.common import load_cache_json, save_cache_json
 from src.scrapers.pokemon.pokemon_detail_scraper import PokemonDetailScraper
 
@@ -14,6 +14,7 @@ class PokemonListScraper(BaseScraper):
     def __init__(self, scraper: Any, scraper_settings: dict[str, Any], external_context=None):
         super().__init__(scraper, scraper_settings)
         self.external_context = external_context
+        self.detail_adaptive_ttl = scraper.get("detail_adaptive_ttl")
 
     # ---------------------------------------------------
     # Completely override BaseScraper.run()
@@ -40,12 +41,15 @@ class PokemonListScraper(BaseScraper):
                 "file_name": f"{poke_id:04d}-{name}",
                 "pipeline": "monthly",
                 "subfolder": "pokemon",
-                "collection": "pokedex"
+                "collection": "pokedex",
+                "adaptive_ttl": self.detail_adaptive_ttl,
             }
             scraper = PokemonDetailScraper(
                 scraper=s_cfg,
-                scraper_settings={"timeout": 60000},
+                # same settings as the list: every detail page shares one browser pool
+                scraper_settings=self.scraper_settings,
             )
+            scraper.max_cache_age = self.max_cache_age
             scraper.run()
 
             time.sleep(random.uniform(0.3, 0.7))
@@ -56,7 +60,7 @@ class PokemonListScraper(BaseScraper):
     # Fetch JSON or load cache
     # ---------------------------------------------------
     def _load_or_fetch_species_list(self) -> list[dict[str, Any]]:
-        cached = load_cache_json(self.json_path, PIPELINE_TTL["monthly"])
+        cached = load_cache_json(self.json_path, self.cache_ttl(self.json_path))
         if cached:
             print("[CACHE] Loaded species list JSON")
             return self._normalize_results(cached.get("results", []))
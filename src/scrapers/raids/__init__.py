@@ -1,9 +1,11 @@
 # AUTO-GENERATED — DO NOT EDIT
 
 from .raid_boss_scraper import RaidBossScraper
+from .raid_now_poller import RaidNowPoller
 from .raid_now_scraper import RaidNowScraper
 
 __all__ = [
     'RaidBossScraper',
+    'RaidNowPoller',
     'RaidNowScraper',
 ]
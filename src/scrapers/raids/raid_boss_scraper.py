@@ -1,9 +1,10 @@
 import re
-from typing import Any, cast
+from typing import Any, Iterator, cast
 
 from bs4 import BeautifulSoup, Tag
 
 from src.base import BaseScraper
+from src.common.records import RaidBoss
 from src.common.utils import parse_cp_range
 
 
@@ -12,8 +13,9 @@ class RaidBossScraper(BaseScraper):
         super().__init__(scraper, scraper_settings)
 
     def parse(self, soup: BeautifulSoup) -> dict[str, Any]:
-        flat_list: list[dict[str, Any]] = []
+        return {"results": list(self.iter_records(soup))}
 
+    def iter_records(self, soup: BeautifulSoup) -> Iterator[RaidBoss]:
         tier_sections = soup.select(".raid-bosses .tier, .shadow-raid-bosses .tier")
 
         for section in tier_sections:
@@ -59,16 +61,13 @@ class RaidBossScraper(BaseScraper):
                     else None
                 )
 
-                boss_info = {
-                    "name": name,
-                    "tier": tier_value,
-                    "shiny_available": is_shiny,
-                    "cp_range": parse_cp_range(cp_range_str),
-                    "boosted_cp_range": parse_cp_range(boosted_cp_str),
-                    "types": types,
-                    "asset_url": asset_url,
-                }
-
-                flat_list.append(boss_info)
-
-        return {"results": flat_list}
\ No newline at end of file
+                # positional, in field order: keyword arguments double the construction cost
+                yield RaidBoss(
+                    name,
+                    tier_value,
+                    is_shiny,
+                    parse_cp_range(cp_range_str),
+                    parse_cp_range(boosted_cp_str),
+                    types,
+                    asset_url,
+                )
\ No newline at end of file
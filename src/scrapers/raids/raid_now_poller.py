@@ -0,0 +1,285 @@
+"""
+raid_now_poller.py
+
+Long-running RaidNow poll mode (`python -m src.main raidnow-poll`).
+
+One warm Playwright page stays on raidnow.leekduck.com. Every `interval_s`
+the DOM is re-read (a full reload only every `reload_every` polls), parsed
+with RaidNowScraper.parse and diffed by post_id against the posts on the
+previous page. Only changes are emitted:
+
+  {"event": "new",     "post_id": ..., "at": ..., "record": {...}}
+  {"event": "expired", "post_id": ..., "at": ..., "record": {...}}
+
+At most `max_active` records are held; past that window only the post id
+is kept, so a post still on the page is never re-emitted as new.
+
+Events go through a bounded queue to a sink thread (NDJSON file, or
+<collection>/<file_name>_live/records in Firestore, apart from the hourly
+upload). When the sink falls behind, the poll loop blocks on the full
+queue instead of growing memory.
+
+The NDJSON file is rotated to raidnow.events.<YYYYMMDD-HHMMSS>.ndjson
+(UTC, time of its last write) once it reaches `rotate_mb` or the day
+changes; only the newest `keep_files` rotated files are kept.
+"""
+import glob
+import json
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from bs4 import BeautifulSoup
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+
+from src.common.records import RaidNowEntry, to_dict
+from src.scrapers.raids.raid_now_scraper import RaidNowScraper
+
+POLL_DEFAULTS = {
+    "interval_s": 15,
+    "reload_every": 4,  # re-read the live DOM in between full reloads
+    "max_active": 500,  # records kept in memory (ids of older posts still on the page are kept)
+    "queue_size": 1000,
+    "sink": "ndjson",  # "ndjson" | "firestore"
+    "ndjson_file": "raidnow.events.ndjson",
+    "rotate_mb": 64,  # NDJSON rotation: at this size or when the UTC day changes
+    "keep_files": 14,  # rotated NDJSON files kept (oldest deleted)
+    "flush_every": 50,  # events per sink write (NDJSON flush / Firestore batch)
+}
+
+LIVE_DOC_SUFFIX = "_live"
+
+_STOP = object()
+
+
+class RaidNowPoller(RaidNowScraper):
+
+    def __init__(self, scraper: Any, scraper_settings: dict[str, Any]):
+        super().__init__(scraper, scraper_settings)
+        self.poll = {**POLL_DEFAULTS, **scraper.get("poll", {})}
+        self.scraper = scraper
+
+        # post id → record, None once the record was evicted (the id stays while the post is on the page)
+        self.active: OrderedDict[str, Optional[RaidNowEntry]] = OrderedDict()
+        self.events: queue.Queue = queue.Queue(maxsize=self.poll["queue_size"])
+        self.stats = {"polls": 0, "new": 0, "expired": 0, "evicted": 0, "blocked_s": 0.0}
+
+        self._stop = threading.Event()
+        self._pw = None
+        self._browser = None
+        self._page = None
+
+    # -------------------------------------------------
+    # Warm page
+    # -------------------------------------------------
+    def _open_page(self):
+        self._close_page()
+        self._pw = sync_playwright().start()
+        self._browser = self._pw.chromium.launch(headless=self.headless)
+        context = self._browser.new_context(user_agent=self.user_agent)
+        self._page = context.new_page()
+        self._goto()
+
+    def _goto(self, reload: bool = False):
+        if reload:
+            self._page.reload(timeout=self.pw_timeout)
+        else:
+            self._page.goto(self.url, timeout=self.pw_timeout)
+        try:
+            self._page.wait_for_load_state("networkidle", timeout=self.pw_timeout)
+        except PlaywrightTimeoutError:
+            print("[RaidNowPoll] Network idle timeout — continue anyway")
+
+    def _close_page(self):
+        try:
+            if self._browser:
+                self._browser.close()
+            if self._pw:
+                self._pw.stop()
+        except Exception as e:
+            print(f"[RaidNowPoll] Error closing browser: {e}")
+        self._pw = self._browser = self._page = None
+
+    def _read_blocks(self) -> Optional[list[RaidNowEntry]]:
+        n = self.stats["polls"]
+        try:
+            if self._page is None:
+                self._open_page()
+            elif n and n % self.poll["reload_every"] == 0:
+                self._goto(reload=True)
+            html = self._page.content()
+        except Exception as e:
+            print(f"[RaidNowPoll] Page error, reopening next poll: {e}")
+            self._close_page()
+            return None
+
+        if not html or len(html) < 200:
+            return None
+        return self.parse(BeautifulSoup(html, "lxml")).get("results", [])
+
+    # -------------------------------------------------
+    # Diff
+    # -------------------------------------------------
+    def diff(self, raids: list[RaidNowEntry]) -> list[dict[str, Any]]:
+        now = int(time.time())
+        events = []
+        seen = set()
+
+        for raid in raids:
+            pid = raid.post_id
+            if not pid:
+                continue
+            seen.add(pid)
+
+            if raid.expired:
+                if pid in self.active:
+                    self.active.pop(pid)
+                    events.append({"event": "expired", "post_id": pid, "at": now, "record": to_dict(raid)})
+                continue
+
+            if pid not in self.active:
+                events.append({"event": "new", "post_id": pid, "at": now, "record": to_dict(raid)})
+                self.active[pid] = raid
+            elif self.active[pid] is not None:
+                self.active[pid] = raid
+
+        # posts that dropped off the page are gone as well
+        for pid in [p for p in self.active if p not in seen]:
+            raid = self.active.pop(pid)
+            record = to_dict(raid) if raid is not None else {"post_id": pid}
+            events.append({"event": "expired", "post_id": pid, "at": now, "record": record})
+
+        # past the window drop the oldest records but keep their ids
+        held = [p for p, r in self.active.items() if r is not None]
+        for pid in held[:max(0, len(held) - self.poll["max_active"])]:
+            self.active[pid] = None
+            self.stats["evicted"] += 1
+
+        return events
+
+    def _emit(self, events: list[dict[str, Any]]):
+        for ev in events:
+            self.stats[ev["event"]] += 1
+            t0 = time.monotonic()
+            # blocks while the sink is behind (backpressure on the poll loop)
+            while not self._stop.is_set():
+                try:
+                    self.events.put(ev, timeout=1)
+                    break
+                except queue.Full:
+                    continue
+            self.stats["blocked_s"] += time.monotonic() - t0
+
+    # -------------------------------------------------
+    # Sinks
+    # -------------------------------------------------
+    def _ndjson_writer(self) -> Callable[[list[dict[str, Any]]], None]:
+        path = os.path.join(os.path.dirname(self.json_path), self.poll["ndjson_file"])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        stem, ext = os.path.splitext(path)
+        max_bytes = self.poll["rotate_mb"] * 1024 * 1024
+        print(f"[RaidNowPoll] Streaming events → {path}")
+
+        def rotate():
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                return
+            if st.st_size < max_bytes and time.gmtime(st.st_mtime)[:3] == time.gmtime()[:3]:
+                return
+            rotated = f"{stem}.{time.strftime('%Y%m%d-%H%M%S', time.gmtime(st.st_mtime))}{ext}"
+            os.replace(path, rotated)
+            print(f"[RaidNowPoll] Rotated → {rotated}")
+            # the stamps sort chronologically
+            for old in sorted(glob.glob(f"{glob.escape(stem)}.*{ext}"))[:-self.poll["keep_files"]]:
+                os.remove(old)
+
+        def write(batch: list[dict[str, Any]]):
+            rotate()
+            with open(path, "a", encoding="utf-8") as f:
+                for ev in batch:
+                    f.write(json.dumps(ev, ensure_ascii=False) + "\n")
+
+        return write
+
+    def _firestore_writer(self) -> Callable[[list[dict[str, Any]]], None]:
+        # "records" layout under its own doc (<collection>/raidnow_live/records/<id>):
+        # the hourly upload owns <collection>/raidnow and would delete these as stale
+        from src import upload_firestore as up
+
+        repo_root = up.get_repo_root()
+        db = up.init_firebase(os.path.join(repo_root, "serviceAccount.json"))
+        collection = up.resolve_collection(up.load_config(repo_root), f"{self.file_name}.json")
+        doc_id = self.file_name + LIVE_DOC_SUFFIX
+        records = db.collection(collection).document(doc_id).collection(up.RECORDS_SUBCOLLECTION)
+        print(f"[RaidNowPoll] Streaming events → {collection}/{doc_id}/{up.RECORDS_SUBCOLLECTION}")
+
+        def write(batch: list[dict[str, Any]]):
+            ops = []
+            for ev in batch:
+                ref = records.document(up.record_doc_id(ev["post_id"]))
+                if ev["event"] == "new":
+                    ops.append(("set", ref, up.record_payload(ev["record"])))
+                else:
+                    ops.append(("delete", ref, None))
+            up.commit_batched(db, ops)
+
+        return write
+
+    def _sink_loop(self, write: Callable[[list[dict[str, Any]]], None]):
+        done = False
+        while not done:
+            batch = [self.events.get()]
+            while len(batch) < self.poll["flush_every"]:
+                try:
+                    batch.append(self.events.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is _STOP:
+                batch.pop()
+                done = True
+            if batch:
+                try:
+                    write(batch)
+                except Exception as e:
+                    print(f"[RaidNowPoll] Sink error, dropped {len(batch)} events: {e}")
+
+    # -------------------------------------------------
+    # Loop
+    # -------------------------------------------------
+    def stop(self):
+        self._stop.set()
+
+    def run(self, max_polls: Optional[int] = None):
+        write = self._firestore_writer() if self.poll["sink"] == "firestore" else self._ndjson_writer()
+        sink = threading.Thread(target=self._sink_loop, args=(write,), daemon=True)
+        sink.start()
+
+        print(f"[RaidNowPoll] Polling {self.url} every {self.poll['interval_s']}s")
+        try:
+            while not self._stop.is_set():
+                started = time.monotonic()
+                raids = self._read_blocks()
+                self.stats["polls"] += 1
+
+                if raids is not None:
+                    events = self.diff(raids)
+                    self._emit(events)
+                    if events:
+                        print(f"[RaidNowPoll] +{sum(e['event'] == 'new' for e in events)} "
+                              f"-{sum(e['event'] == 'expired' for e in events)} "
+                              f"(active {len(self.active)}, queued {self.events.qsize()})")
+
+                if max_polls and self.stats["polls"] >= max_polls:
+                    break
+                self._stop.wait(max(0.0, self.poll["interval_s"] - (time.monotonic() - started)))
+        except KeyboardInterrupt:
+            print("[RaidNowPoll] Interrupted")
+        finally:
+            self._close_page()
+            self.events.put(_STOP)
+            sink.join()
+            print(f"[RaidNowPoll] Stopped: {self.stats}")
@@ -1,12 +1,15 @@
 import logging
+import re
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Iterator, Optional
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 
 from src.base import BaseScraper
 from src.common import save_cache_html
+from src.common.block_extract import BlockSpec, Field, exists, text
+from src.common.records import RaidNowEntry
 
 logger = logging.getLogger(__name__)
 
@@ -77,8 +80,9 @@ class RaidNowScraper(BaseScraper):
     # Parse
     # -------------------------------------------------
     def parse(self, soup: BeautifulSoup) -> dict[str, Any]:
-        raids: List[Dict[str, Any]] = []
+        return {"results": list(self.iter_records(soup))}
 
+    def iter_records(self, soup: BeautifulSoup) -> Iterator[RaidNowEntry]:
         blocks = (
                 soup.select("div.top_raids_list div.par_raid_list")
                 or soup.select("div.par_raid_list")
@@ -88,113 +92,90 @@ class RaidNowScraper(BaseScraper):
 
         for block in blocks:
             try:
-                # 1. Basic fields
-                img_el = block.select_one(".pokemon-box img.w67") or block.select_one(".pokemon-box img")
-                image = img_el.get("data-src") or img_el.get("src") if img_el else None
-
-                shiny = bool(block.select_one("img.shiny"))
-
-                # 2. CP values
-                cp = cp_weather = None
-                cp_c = block.select_one(".font-s8")
-                if cp_c:
-                    g = cp_c.select_one("span.gray")
-                    if g and g.text.strip().isdigit():
-                        cp = int(g.text.strip())
-                    w = cp_c.select_one("span.weather_color")
-                    if w and w.text.strip().isdigit():
-                        cp_weather = int(w.text.strip())
-
-                # 3. Expired
-                expired = False
-                t = block.select_one(".fa-clock-o")
-                if t:
-                    text = t.parent.get_text(" ", strip=True)
-                    expired = "Expired" in text or "expired" in text
-
-                # 4. Players
-
-                # 5. Country
-                country = None
-                flag = block.select_one(".national_flag_icon img")
-                if flag:
-                    src = flag.get("data-src") or flag.get("src") or ""
-                    country = src.split("/")[-1].split("?")[0].replace(".png", "")
-
-                # 6. Name & post id
-                name_el = block.select_one(".top_list_poke_name")
-                name = name_el.get_text(strip=True) if name_el else None
-                post_id = (block.select_one(".dpn") or {}).get_text(strip=True) if block.select_one(".dpn") else None
-
-                # 7. Stars
-                stars = None
-                star_el = block.select_one(".fa-star")
-                if star_el:
-                    import re
-                    m = re.search(r"\d+", star_el.parent.get_text())
-                    if m:
-                        stars = int(m.group(0))
-
-                # 8. Trainer Level
-                trainer_level = None
-                for el in block.select(".font-12px"):
-                    txt = el.get_text(" ", strip=True)
-                    if "TL" in txt:
-                        import re
-                        m = re.search(r"TL\s*:?(\d+)", txt)
-                        if m:
-                            trainer_level = int(m.group(1))
-                        break
-
-                # 9. Flags
-                is_hot = bool(block.select_one(".hot_post_label"))
-                is_mega = bool(block.select_one(".mega_poke_label"))
-
-                # 10. Limited
-                limited_tl = None
-                ltd = block.select_one(".limited_tl_label")
-                if ltd:
-                    import re
-                    nums = re.findall(r"\d+", ltd.text)
-                    if nums:
-                        limited_tl = int(nums[0])
-
-                # 11. Weather
-                weather_icon = None
-                w_ic = block.select_one(".current_wethar_icon")
-                if w_ic:
-                    weather_icon = w_ic.get("data-src") or w_ic.get("src")
-
-                # 12. Team
-                team = None
-                if block.select_one(".gym_color_valor"):
-                    team = "Valor"
-                elif block.select_one(".gym_color_mystic"):
-                    team = "Mystic"
-                elif block.select_one(".gym_color_instinct"):
-                    team = "Instinct"
-
-                raids.append(
-                    {
-                        "name": name,
-                        "post_id": post_id,
-                        "country": country,
-                        "image": image,
-                        "shiny": shiny,
-                        "cp": cp,
-                        "cp_weather": cp_weather,
-                        "expired": expired,
-                        "trainer_level": trainer_level,
-                        "stars": stars,
-                        "is_hot": is_hot,
-                        "is_mega": is_mega,
-                        "limited_tl": limited_tl,
-                        "weather_icon": weather_icon,
-                        "team": team,
-                    }
-                )
-
+                raid = parse_raid_block(block)
             except Exception as e:
                 logger.exception("Error parsing block: %s", e)
-
-        return {"results": raids}
\ No newline at end of file
+                continue
+            yield raid
+
+
+# -------------------------------------------------
+# Block spec (compiled once, one subtree walk per block)
+# -------------------------------------------------
+RAID_BLOCK_SPEC = BlockSpec({
+    "img_w67": Field(".pokemon-box img.w67"),
+    "img": Field(".pokemon-box img"),
+    "shiny": Field("img.shiny", get=exists, default=False),
+    "cp_box": Field(".font-s8"),
+    "cp": Field("span.gray", within="cp_box", get=lambda el: el.text.strip()),
+    "cp_weather": Field("span.weather_color", within="cp_box", get=lambda el: el.text.strip()),
+    "clock": Field(".fa-clock-o", get=lambda el: el.parent.get_text(" ", strip=True)),
+    "flag": Field(".national_flag_icon img", get=lambda el: el.get("data-src") or el.get("src") or ""),
+    "name": Field(".top_list_poke_name", get=text),
+    "post_id": Field(".dpn", get=text),
+    "star": Field(".fa-star", get=lambda el: el.parent.get_text()),
+    "tl": Field(".font-12px", get=lambda el: el.get_text(" ", strip=True),
+                where=lambda el: "TL" in el.get_text(" ", strip=True)),
+    "is_hot": Field(".hot_post_label", get=exists, default=False),
+    "is_mega": Field(".mega_poke_label", get=exists, default=False),
+    "limited": Field(".limited_tl_label", get=lambda el: el.text),
+    "weather_icon": Field(".current_wethar_icon", get=lambda el: el.get("data-src") or el.get("src")),
+    "valor": Field(".gym_color_valor", get=exists, default=False),
+    "mystic": Field(".gym_color_mystic", get=exists, default=False),
+    "instinct": Field(".gym_color_instinct", get=exists, default=False),
+})
+
+_NUM = re.compile(r"\d+")
+_TL = re.compile(r"TL\s*:?(\d+)")
+
+
+def parse_raid_block(block: Tag) -> RaidNowEntry:
+    f = RAID_BLOCK_SPEC.extract(block)
+
+    img_el = f["img_w67"] or f["img"]
+    image = img_el.get("data-src") or img_el.get("src") if img_el else None
+
+    stars = None
+    if f["star"] is not None:
+        m = _NUM.search(f["star"])
+        if m:
+            stars = int(m.group(0))
+
+    trainer_level = None
+    if f["tl"] is not None:
+        m = _TL.search(f["tl"])
+        if m:
+            trainer_level = int(m.group(1))
+
+    limited_tl = None
+    if f["limited"] is not None:
+        nums = _NUM.findall(f["limited"])
+        if nums:
+            limited_tl = int(nums[0])
+
+    team = None
+    if f["valor"]:
+        team = "Valor"
+    elif f["mystic"]:
+        team = "Mystic"
+    elif f["instinct"]:
+        team = "Instinct"
+
+    # positional, in field order: keyword arguments double the construction cost
+    return RaidNowEntry(
+        f["name"],
+        f["post_id"],
+        f["flag"].split("/")[-1].split("?")[0].replace(".png", "") if f["flag"] is not None else None,  # country
+        image,
+        f["shiny"],
+        int(f["cp"]) if f["cp"] and f["cp"].isdigit() else None,
+        int(f["cp_weather"]) if f["cp_weather"] and f["cp_weather"].isdigit() else None,
+        "Expired" in f["clock"] or "expired" in f["clock"] if f["clock"] is not None else False,  # expired
+        trainer_level,
+        stars,
+        f["is_hot"],
+        f["is_mega"],
+        limited_tl,
+        f["weather_icon"],
+        team,
+    )
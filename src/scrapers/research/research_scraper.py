@@ -1,42 +1,22 @@
 import re
-from typing import Any, cast
+from typing import Any, Iterator, cast
 
 from bs4 import BeautifulSoup, Tag
 
 from src.base import BaseScraper
+from src.common.records import ResearchReward
 from src.common.utils import parse_cp_range
 
 
-def convert_research_json(old_json: dict) -> dict:
-    result = []
-
-    for title, tasks in old_json.items():
-        for task_entry in tasks:
-            task_text = task_entry.get("task")
-            rewards = task_entry.get("rewards", [])
-
-            for reward in rewards:
-                item = {
-                    "title": title,                    # e.g. "High Voltage Tasks"
-                    "task": task_text,                 # e.g. "Catch 10 Electric-type Pokémon"
-                    "reward_type": reward.get("type"), # "encounter", "item", "resource"
-                    "name": reward.get("name"),
-                    "shiny_available": reward.get("shiny_available"),
-                    "cp_range": reward.get("cp_range"),
-                    "quantity": reward.get("quantity"),
-                    "asset_url": reward.get("asset_url"),
-                }
-
-                result.append(item)
-
-    return {"results": result}
-
 class ResearchScraper(BaseScraper):
     def __init__(self, scraper: Any, scraper_settings: dict[str, Any]):
         super().__init__(scraper, scraper_settings)
 
     def parse(self, soup: BeautifulSoup) -> dict[str, Any]:
-        research_data: dict[str, Any] = {}
+        return {"results": list(self.iter_records(soup))}
+
+    def iter_records(self, soup: BeautifulSoup) -> Iterator[ResearchReward]:
+        # one flat row per (task, reward), emitted directly
         task_categories = soup.find_all("div", class_="task-category")
 
         for category in task_categories:
@@ -46,7 +26,6 @@ class ResearchScraper(BaseScraper):
                 continue
 
             category_title = category_title_element.get_text(strip=True)
-            research_data[category_title] = []
 
             task_items = category.find_all("li", class_="task-item")
 
@@ -57,7 +36,6 @@ class ResearchScraper(BaseScraper):
                     continue
 
                 task_description = task_text_element.get_text(strip=True)
-                rewards_list: list[dict[str, Any]] = []
 
                 reward_elements = item.select("ul.reward-list > li.reward")
 
@@ -94,14 +72,14 @@ class ResearchScraper(BaseScraper):
                         )
                         cp_range = parse_cp_range(cp_text)
 
-                        rewards_list.append(
-                            {
-                                "type": "encounter",
-                                "name": label_text,
-                                "shiny_available": is_shiny,
-                                "cp_range": cp_range,
-                                "asset_url": asset_url,
-                            }
+                        yield ResearchReward(
+                            title=category_title,
+                            task=task_description,
+                            reward_type="encounter",
+                            name=label_text,
+                            shiny_available=is_shiny,
+                            cp_range=cp_range,
+                            asset_url=asset_url,
                         )
                     else:
                         quantity_element = reward_element.find("div", class_="quantity")
@@ -111,18 +89,11 @@ class ResearchScraper(BaseScraper):
                             else "1"
                         )
 
-                        rewards_list.append(
-                            {
-                                "type": reward_type,
-                                "name": re.sub(r"\s?×\d+$", "", label_text).strip(),
-                                "quantity": int(re.sub(r"\D", "", quantity)),
-                                "asset_url": asset_url,
-                            }
+                        yield ResearchReward(
+                            title=category_title,
+                            task=task_description,
+                            reward_type=reward_type,
+                            name=re.sub(r"\s?×\d+$", "", label_text).strip(),
+                            quantity=int(re.sub(r"\D", "", quantity)),
+                            asset_url=asset_url,
                         )
-
-                if rewards_list:
-                    research_data[category_title].append(
-                        {"task": task_description, "rewards": rewards_list}
-                    )
-
-        return convert_research_json(research_data)
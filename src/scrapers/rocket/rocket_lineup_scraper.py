@@ -1,4 +1,4 @@
-from typing import Any, cast
+from typing import Any, Iterator, cast
 
 from bs4 import BeautifulSoup, Tag
 
@@ -6,33 +6,14 @@ from src.base import BaseScraper
 from src.common.utils import parse_pokemon_list
 
 
-def convert_rocket_json(old_json: dict) -> dict:
-    result = []
-
-    for leader, slots in old_json.items():
-        for slot_info in slots:
-            slot = slot_info.get("slot")
-            is_encounter = slot_info.get("is_encounter", False)
-
-            for mon in slot_info.get("pokemons", []):
-                item = {
-                    "leader": leader,
-                    "slot": slot,
-                    "is_encounter": is_encounter,
-                    "name": mon.get("name"),
-                    "shiny_available": mon.get("shiny_available"),
-                    "asset_url": mon.get("asset_url"),
-                }
-                result.append(item)
-
-    return {"results": result}
-
 class RocketLineupScraper(BaseScraper):
     def __init__(self, scraper: Any, scraper_settings: dict[str, Any]):
         super().__init__(scraper, scraper_settings)
 
     def parse(self, soup: BeautifulSoup) -> dict[str, Any]:
-        lineups: dict[str, Any] = {}
+        return {"results": list(self.iter_records(soup))}
+
+    def iter_records(self, soup: BeautifulSoup) -> Iterator[dict[str, Any]]:
         rocket_profiles = soup.find_all("div", class_="rocket-profile")
 
         for profile in rocket_profiles:
@@ -42,21 +23,20 @@ class RocketLineupScraper(BaseScraper):
                 continue
 
             leader_name = name_element.get_text(strip=True)
-            lineups[leader_name] = []
 
             slots = profile.select(".lineup-info .slot")
             for i, slot in enumerate(slots, 1):
                 slot = cast(Tag, slot)
                 pokemon_in_slot = parse_pokemon_list(slot)
 
-                if pokemon_in_slot:
-                    classes = slot.get("class")
-                    is_encounter_slot = classes is not None and "encounter" in classes
-                    lineups[leader_name].append(
-                        {
-                            "slot": i,
-                            "pokemons": pokemon_in_slot,
-                            "is_encounter": is_encounter_slot,
-                        }
-                    )
-        return convert_rocket_json(lineups)
+                classes = slot.get("class")
+                is_encounter_slot = classes is not None and "encounter" in classes
+                for mon in pokemon_in_slot:
+                    yield {
+                        "leader": leader_name,
+                        "slot": i,
+                        "is_encounter": is_encounter_slot,
+                        "name": mon.get("name"),
+                        "shiny_available": mon.get("shiny_available"),
+                        "asset_url": mon.get("asset_url"),
+                    }
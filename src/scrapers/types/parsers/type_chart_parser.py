@@ -7,7 +7,7 @@ Extracts:
         "Fire": {
             "name": "Fire",
             "image": "...",
-            "attack": {...},
+            "attack": {..., "multipliers": {defender: float}},
             "defense": {...},
             "best_counters": [...]
         },
@@ -28,8 +28,9 @@ TYPE_ORDER = [
 
 
 def _parse_multiplier(text: str) -> float:
+    # unrounded: 62.5% must stay 0.625, not 0.62
     try:
-        return round(float(text.replace("%", "")) / 100, 2)
+        return float(text.replace("%", "")) / 100
     except:
         return 1.0
 
@@ -111,6 +112,7 @@ def parse_type_chart(soup: BeautifulSoup):
                 "super_effective": sup_eff,
                 "not_very_effective": not_eff,
                 "no_effect": no_eff,
+                "multipliers": {d: matrix[d][t] for d in TYPE_ORDER},
             },
             "defense": {
                 "weak_to": weak,
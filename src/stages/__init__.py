@@ -0,0 +1,27 @@
+# AUTO-GENERATED — DO NOT EDIT
+
+from . import game_constants
+from .aggregate_stage import AggregateStage
+from .appearance_index_stage import AppearanceIndexStage
+from .evolution_graph_stage import EvolutionGraphStage
+from . import species_outputs
+from .pvp_rank_stage import PvpRankStage
+from .raid_counter_stage import RaidCounterStage
+from .search_index_stage import SearchIndexStage
+from .sqlite_export_stage import SqliteExportStage
+from . import type_matrix
+from .weather_matchup_stage import WeatherMatchupStage
+
+__all__ = [
+    'game_constants',
+    'AggregateStage',
+    'AppearanceIndexStage',
+    'EvolutionGraphStage',
+    'species_outputs',
+    'PvpRankStage',
+    'RaidCounterStage',
+    'SearchIndexStage',
+    'SqliteExportStage',
+    'type_matrix',
+    'WeatherMatchupStage',
+]
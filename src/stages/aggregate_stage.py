@@ -0,0 +1,222 @@
+"""
+aggregate_stage.py
+
+Cross-species aggregates (leaderboards, rankings, lists) maintained
+incrementally over output/monthly/json/pokemon/*.json.
+
+An aggregate is one function registered with @aggregate: it maps a single
+species document to (group, value) pairs. The stage keeps every group
+materialized in its state as group → {species slug → value}, plus the
+groups each species contributed to, so a run:
+  - re-reads only species files whose digest changed (stat pre-check),
+  - swaps those species' old contributions for the new ones,
+  - re-sorts only the groups that were touched.
+A newly registered aggregate (or a bumped `version`) is backfilled once over
+all species.
+
+    @aggregate("shiny", sort=lambda v: v["dex"])
+    def shiny(slug, doc):
+        if overview(doc).get("availability", {}).get("shiny_available"):
+            yield "all", {"slug": slug, "dex": dex_number(slug)}
+
+Output: {"aggregates": {name: {group: [value, ...]}}, "updated_species": [...]}
+"""
+import math
+import os
+import time
+from typing import Any, Callable, Iterable, Optional
+
+from src.base.base_stage import BaseStage
+from src.common import file_digest
+from src.stages.game_constants import CP_MULTIPLIERS, MIN_CP, level_index
+from src.stages.species_outputs import (base_stats, dex_number, list_species_files, load_species_doc, overview,
+                                        species_name, species_slug, species_types)
+
+Contribution = Iterable[tuple[str, Any]]
+
+
+class Aggregate:
+
+    def __init__(self, name: str, contribute: Callable[[str, dict[str, Any]], Contribution],
+                 sort: Optional[Callable[[Any], Any]] = None, top_n: Optional[int] = None, version: int = 1):
+        self.name = name
+        self.contribute = contribute
+        self.sort = sort
+        self.top_n = top_n
+        self.version = version
+
+    def materialize(self, members: dict[str, Any]) -> list[Any]:
+        values = list(members.values())
+        if self.sort:
+            values.sort(key=self.sort)
+        return values[:self.top_n] if self.top_n else values
+
+
+AGGREGATES: dict[str, Aggregate] = {}
+
+
+def aggregate(name: str, sort: Optional[Callable[[Any], Any]] = None, top_n: Optional[int] = None, version: int = 1):
+    """Register `fn(slug, doc) -> [(group, value), ...]` as an aggregate."""
+
+    def register(fn: Callable[[str, dict[str, Any]], Contribution]):
+        AGGREGATES[name] = Aggregate(name, fn, sort, top_n, version)
+        return fn
+
+    return register
+
+
+# -----------------------------
+# Built-in aggregates
+# -----------------------------
+def max_cp(doc: dict[str, Any]) -> Optional[int]:
+    """Level 50 hundo CP: the max CP chart when scraped, else computed from base stats."""
+    chart = doc.get("max_cp_chart") or {}
+    if isinstance(chart.get("50"), int):
+        return chart["50"]
+    stats = base_stats(doc)
+    if not stats:
+        return None
+    atk, dfn, sta = (s + 15 for s in stats)
+    cpm = CP_MULTIPLIERS[level_index(50)]
+    return max(MIN_CP, math.floor(atk * math.sqrt(dfn) * math.sqrt(sta) * cpm ** 2 / 10))
+
+
+def _entry(slug: str, doc: dict[str, Any], **extra: Any) -> dict[str, Any]:
+    return {"slug": slug, "dex": dex_number(slug), "name": species_name(doc, slug), **extra}
+
+
+@aggregate("max_cp", sort=lambda v: (-v["max_cp"], v["dex"]))
+def _max_cp_ranking(slug: str, doc: dict[str, Any]) -> Contribution:
+    cp = max_cp(doc)
+    if cp:
+        yield "all", _entry(slug, doc, max_cp=cp, types=species_types(doc))
+
+
+@aggregate("type_leaderboard", sort=lambda v: (-v["max_cp"], v["dex"]), top_n=50)
+def _type_leaderboard(slug: str, doc: dict[str, Any]) -> Contribution:
+    cp = max_cp(doc)
+    if cp:
+        for t in species_types(doc):
+            yield str(t).lower(), _entry(slug, doc, max_cp=cp)
+
+
+@aggregate("shiny", sort=lambda v: v["dex"])
+def _shiny(slug: str, doc: dict[str, Any]) -> Contribution:
+    if (overview(doc).get("availability") or {}).get("shiny_available"):
+        yield "all", _entry(slug, doc)
+
+
+# -----------------------------
+# Stage
+# -----------------------------
+class AggregateStage(BaseStage):
+
+    def __init__(self, stage: Any, stage_settings: dict[str, Any]):
+        super().__init__(stage, stage_settings)
+        names = stage.get("aggregates") or list(AGGREGATES)
+        self.aggregates = {n: AGGREGATES[n] for n in names if n in AGGREGATES}
+
+    @staticmethod
+    def _contribute(agg: Aggregate, slug: str, doc: dict[str, Any]) -> dict[str, Any]:
+        try:
+            return {str(group): value for group, value in agg.contribute(slug, doc)}
+        except Exception as e:
+            print(f"[Aggregates] {agg.name} failed for {slug}: {e}")
+            return {}
+
+    def build(self) -> Optional[dict[str, Any]]:
+        state = self.load_state()
+        files: dict[str, Any] = state.get("files", {})           # slug → {"stat", "digest"}
+        contrib: dict[str, Any] = state.get("contrib", {})       # slug → {aggregate → [groups]}
+        groups: dict[str, Any] = state.get("groups", {})         # aggregate → group → {slug → value}
+        outputs: dict[str, Any] = state.get("outputs", {})       # aggregate → group → [values]
+        versions: dict[str, int] = state.get("versions", {})
+
+        paths = {species_slug(p): p for p in list_species_files(self.output_root)}
+        if not paths:
+            print("[Aggregates] No pokedex outputs.")
+            return None
+
+        touched: dict[str, set[str]] = {name: set() for name in self.aggregates}
+
+        def apply(slug: str, name: str, new: dict[str, Any]):
+            agg_groups = groups.setdefault(name, {})
+            for group in contrib.get(slug, {}).get(name, []):
+                agg_groups.get(group, {}).pop(slug, None)
+                touched[name].add(group)
+            for group, value in new.items():
+                agg_groups.setdefault(group, {})[slug] = value
+                touched[name].add(group)
+            if new:
+                contrib.setdefault(slug, {})[name] = sorted(new)
+            else:
+                contrib.get(slug, {}).pop(name, None)
+
+        # aggregates that are new, re-versioned or no longer registered
+        stale = [n for n, agg in self.aggregates.items() if versions.get(n) != agg.version]
+        for name in list(groups):
+            if name not in self.aggregates:
+                groups.pop(name)
+                outputs.pop(name, None)
+                versions.pop(name, None)
+                for parts in contrib.values():
+                    parts.pop(name, None)
+        for name in stale:
+            groups[name], outputs[name] = {}, {}
+            for parts in contrib.values():
+                parts.pop(name, None)
+
+        # species removed since the last run
+        removed = [slug for slug in files if slug not in paths]
+        for slug in removed:
+            for name in self.aggregates:
+                apply(slug, name, {})
+            files.pop(slug)
+            contrib.pop(slug, None)
+
+        # species changed since the last run (all of them for stale aggregates)
+        updated = []
+        for slug, path in paths.items():
+            st = os.stat(path)
+            stat = [st.st_mtime_ns, st.st_size]
+            known = files.get(slug)
+            if known and known.get("stat") == stat:
+                changed = False
+            else:
+                # rewritten files keep their contributions when the bytes are the same
+                digest = file_digest(path)
+                changed = not known or known.get("digest") != digest
+                files[slug] = {"stat": stat, "digest": digest}
+
+            todo = list(self.aggregates) if changed else stale
+            if not todo:
+                continue
+            if changed:
+                updated.append(slug)
+
+            doc = load_species_doc(path)
+            for name in todo:
+                apply(slug, name, self._contribute(self.aggregates[name], slug, doc) if doc else {})
+
+        for name, agg in self.aggregates.items():
+            versions[name] = agg.version
+            agg_out = outputs.setdefault(name, {})
+            for group in touched[name]:
+                members = groups.get(name, {}).get(group)
+                if members:
+                    agg_out[group] = agg.materialize(members)
+                else:
+                    groups.get(name, {}).pop(group, None)
+                    agg_out.pop(group, None)
+
+        n_touched = sum(len(t) for t in touched.values())
+        print(f"[Aggregates] {len(updated)} species changed, {len(removed)} removed, "
+              f"{n_touched} groups re-sorted" + (f", backfilled {stale}" if stale else ""))
+
+        self.save_state({"files": files, "contrib": contrib, "groups": groups, "outputs": outputs,
+                         "versions": versions})
+        return {
+            "built_at": int(time.time()),
+            "updated_species": sorted(updated),
+            "aggregates": {name: dict(sorted(outputs.get(name, {}).items())) for name in self.aggregates},
+        }
@@ -0,0 +1,206 @@
+"""
+appearance_index_stage.py
+
+Inverted "where can I get X right now?" index.
+
+Reads the LeekDuck scraper outputs (raids, eggs, research, rocket, events),
+normalizes every species name with species_key() and writes one small
+species → appearances document.
+
+Each source's extracted entries are kept in the stage state together with
+the source file digest, so a run only re-reads the sources that changed
+since the previous run and merges the rest from state.
+"""
+import re
+from typing import Any, Callable, Optional
+
+from src.base.base_stage import BaseStage
+from src.common import file_digest
+from src.stages.species_outputs import name_key, species_key
+
+# source → (pipeline, file_name); override with "sources" in the stage config
+SOURCES = {
+    "raid": ("daily", "boss"),
+    "egg": ("hourly", "eggs"),
+    "research": ("daily", "research"),
+    "rocket": ("daily", "rocket_lineups"),
+    "event": ("weekly", "events"),
+}
+SPECIES_LIST = ("monthly", "pokemon_species")
+
+Entry = tuple[str, list[str], dict[str, Any]]  # (species key, variants, appearance)
+
+
+def _results(data: Any) -> list[dict[str, Any]]:
+    if isinstance(data, dict):
+        data = data.get("results", [])
+    return [r for r in data if isinstance(r, dict)] if isinstance(data, list) else []
+
+
+def _entry(name: Optional[str], appearance: dict[str, Any]) -> Optional[Entry]:
+    key, variants = species_key(name)
+    if not key:
+        return None
+    return key, variants, {k: v for k, v in appearance.items() if v is not None}
+
+
+# -----------------------------
+# Per-source extractors
+# -----------------------------
+def _raid_entries(data: Any, _known: dict[str, str]) -> list[Entry]:
+    return [
+        _entry(r.get("name"), {"source": "raid", "tier": r.get("tier"), "shiny": r.get("shiny_available")})
+        for r in _results(data)
+    ]
+
+
+def _egg_entries(data: Any, _known: dict[str, str]) -> list[Entry]:
+    return [
+        _entry(r.get("name"), {
+            "source": "egg",
+            "egg": r.get("title"),
+            "distance": r.get("hatch_distance"),
+            "rarity": r.get("rarity_tier"),
+            "shiny": r.get("shiny_available"),
+        })
+        for r in _results(data)
+    ]
+
+
+def _research_entries(data: Any, _known: dict[str, str]) -> list[Entry]:
+    return [
+        _entry(r.get("name"), {
+            "source": "research",
+            "task": r.get("task"),
+            "shiny": r.get("shiny_available"),
+        })
+        for r in _results(data)
+        if r.get("reward_type") == "encounter"
+    ]
+
+
+def _rocket_entries(data: Any, _known: dict[str, str]) -> list[Entry]:
+    return [
+        _entry(r.get("name"), {
+            "source": "rocket",
+            "leader": r.get("leader"),
+            "slot": r.get("slot"),
+            "encounter": bool(r.get("is_encounter")),
+            "shiny": r.get("shiny_available"),
+        })
+        for r in _results(data)
+    ]
+
+
+def _event_entries(data: Any, known: dict[str, str]) -> list[Entry]:
+    """Events have no structured Pokémon list: match known names in title/description."""
+    out: list[Entry] = []
+    for ev in _results(data):
+        text = " ".join(str(ev.get(k) or "") for k in ("title", "description"))
+        words = re.findall(r"[\w.'♀♂-]+", text)
+        found: set[str] = set()
+        for size in (1, 2):
+            for i in range(len(words) - size + 1):
+                key = name_key("".join(words[i:i + size]))
+                if key in known:
+                    found.add(key)
+        appearance = {
+            "source": "event",
+            "title": ev.get("title"),
+            "url": ev.get("article_url"),
+            "start": ev.get("start_time"),
+            "end": ev.get("end_time"),
+        }
+        appearance = {k: v for k, v in appearance.items() if v is not None}
+        out.extend((key, [], appearance) for key in sorted(found))
+    return out
+
+
+EXTRACTORS: dict[str, Callable[[Any, dict[str, str]], list[Optional[Entry]]]] = {
+    "raid": _raid_entries,
+    "egg": _egg_entries,
+    "research": _research_entries,
+    "rocket": _rocket_entries,
+    "event": _event_entries,
+}
+
+
+class AppearanceIndexStage(BaseStage):
+
+    def __init__(self, stage: Any, stage_settings: dict[str, Any]):
+        super().__init__(stage, stage_settings)
+        self.sources = {**SOURCES, **{k: tuple(v) for k, v in stage.get("sources", {}).items()}}
+
+    def _known_species(self) -> dict[str, str]:
+        """species key → PokeAPI name (dex list), used for event text matching."""
+        data = self.load_output(*SPECIES_LIST) or {}
+        known = {}
+        for item in _results(data):
+            key, _ = species_key(item.get("name"))
+            if key and len(key) > 2:
+                known[key] = item.get("name")
+        return known
+
+    def build(self) -> Optional[dict[str, Any]]:
+        state = self.load_state()
+        sources_state: dict[str, Any] = state.get("sources", {})
+
+        species_path = self.output_path(*SPECIES_LIST)
+        known: Optional[dict[str, str]] = None
+        changed = []
+        missing = []
+
+        for source, (pipeline, file_name) in self.sources.items():
+            path = self.output_path(pipeline, file_name)
+            source_digest = file_digest(path)
+            if source_digest is None:
+                # another pipeline's output not available in this run: keep what was last seen
+                missing.append(source)
+                continue
+            digest = source_digest
+            if source == "event":
+                # event matching also depends on the species list
+                digest = f"{digest}:{file_digest(species_path)}"
+
+            cached = sources_state.get(source)
+            if cached and cached.get("digest") == digest:
+                continue
+
+            changed.append(source)
+            if source == "event" and known is None:
+                known = self._known_species()
+                # names already seen on LeekDuck count as known too
+                for other in sources_state.values():
+                    for key, _, _ in other.get("entries", []):
+                        known.setdefault(key, key)
+            data = self.load_output(pipeline, file_name)
+            entries = [e for e in EXTRACTORS[source](data, known or {}) if e]
+
+            sources_state[source] = {"digest": digest, "entries": entries}
+            print(f"[Appearances] {source}: {len(entries)} entries (rebuilt)")
+
+        if missing:
+            print(f"[Appearances] Missing inputs {missing}, using their last known entries")
+        if len(missing) == len(self.sources) and state.get("index") is None:
+            print("[Appearances] No inputs available.")
+            return None
+
+        if not changed and state.get("index") is not None:
+            print("[Appearances] No source changed, index unchanged.")
+            return {**state["index"], "updated_sources": []}
+
+        index: dict[str, dict[str, Any]] = {}
+        for source in self.sources:
+            for key, variants, appearance in sources_state.get(source, {}).get("entries", []):
+                slot = index.setdefault(key, {"appearances": []})
+                item = dict(appearance)
+                if variants:
+                    item["variants"] = variants
+                slot["appearances"].append(item)
+
+        for slot in index.values():
+            slot["sources"] = sorted({a["source"] for a in slot["appearances"]})
+
+        result = {"updated_sources": changed, "results": dict(sorted(index.items()))}
+        self.save_state({"sources": sources_state, "index": result})
+        return result
@@ -0,0 +1,282 @@
+"""
+evolution_graph_stage.py
+
+One evolution graph for the whole pokedex.
+
+Every species output carries its own `evolution_chart` (stages + family
+chips), so the same family is repeated on each member's page. This stage
+merges them once into a compact adjacency artifact:
+  - "nodes":    id → {"n": name, "img": ..., "f": family index}
+  - "edges":    id → {to id: [requirements]}   (directed, from → to)
+  - "families": "family index" → [ids...]   connected components (union-find)
+  - "chains":   "family index" → {"path index": [id, id, ...]} root → leaf paths
+
+Lists are only ever one level deep (Firestore rejects arrays nested in
+arrays), so the document uploads as-is; family and path indices are the
+map keys as strings.
+
+Node ids are the last segment of the GO Hub pokemon link ("25",
+"26-alola", ...). The edges, chips and names extracted from each species
+file are kept in the stage state keyed by the file digest, so a run only
+re-reads the species files that changed; components and chains are then
+recomputed from the cached edges (linear in the size of the graph).
+
+EvolutionGraph loads the artifact for "all relatives / ancestors /
+descendants of X" lookups without touching the species files.
+"""
+import json
+import re
+import time
+from typing import Any, Optional
+
+from src.base.base_stage import BaseStage
+from src.common import file_digest
+from src.stages.species_outputs import dex_number, list_species_files, load_species_doc, species_name, species_slug
+
+GRAPH_FORMAT_VERSION = 2
+
+_POKEMON_HREF = re.compile(r"/pokemon/([^/?#]+)")
+
+
+def node_id(chip: Optional[dict[str, Any]]) -> Optional[str]:
+    """Evolution chip → node id (link target, lower-cased)."""
+    if not chip:
+        return None
+    m = _POKEMON_HREF.search(chip.get("href") or "")
+    return m.group(1).lower() if m else None
+
+
+def extract_species(slug: str, doc: dict[str, Any]) -> dict[str, Any]:
+    """This species' contribution: node labels, directed edges and family members."""
+    evo = doc.get("evolution_chart") or {}
+    nodes: dict[str, dict[str, Any]] = {}
+    edges: list[list[Any]] = []
+    family: list[str] = []
+
+    def label(chip: Optional[dict[str, Any]]) -> Optional[str]:
+        nid = node_id(chip)
+        if nid and nid not in nodes:
+            nodes[nid] = {"n": chip.get("name"), "img": chip.get("img")}
+        return nid
+
+    for stage in evo.get("stages") or []:
+        src, dst = label(stage.get("from")), label(stage.get("to"))
+        if src and dst and src != dst:
+            edges.append([src, dst, stage.get("requirements") or []])
+
+    for chip in evo.get("family") or []:
+        nid = label(chip)
+        if nid and nid not in family:
+            family.append(nid)
+
+    # the species itself, even when it does not evolve
+    dex = dex_number(slug)
+    if dex is not None:
+        own = str(dex)
+        nodes.setdefault(own, {"n": species_name(doc, slug), "img": None})
+        nodes[own]["slug"] = slug
+        if own not in family:
+            family.append(own)
+
+    return {"nodes": nodes, "edges": edges, "family": family}
+
+
+# -----------------------------
+# Graph algorithms
+# -----------------------------
+class UnionFind:
+
+    def __init__(self):
+        self.parent: dict[str, str] = {}
+
+    def find(self, x: str) -> str:
+        parent = self.parent.setdefault(x, x)
+        if parent != x:
+            parent = self.parent[x] = self.find(parent)
+        return parent
+
+    def union(self, a: str, b: str):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            # keep the smaller id as root so family order is stable
+            if _sort_key(rb) < _sort_key(ra):
+                ra, rb = rb, ra
+            self.parent[rb] = ra
+
+
+def _sort_key(nid: str) -> tuple[int, str]:
+    m = re.match(r"\d+", nid)
+    return (int(m.group(0)) if m else 1 << 30, nid)
+
+
+def chains_of(members: list[str], edges: dict[str, dict[str, list[Any]]]) -> list[list[str]]:
+    """Root → leaf paths inside one family (cycle-safe)."""
+    targets = {to for m in members for to in edges.get(m, {})}
+    roots = [m for m in members if m not in targets] or members[:1]
+    chains: list[list[str]] = []
+
+    def walk(path: list[str]):
+        nexts = [to for to in edges.get(path[-1], {}) if to not in path]
+        if not nexts:
+            if len(path) > 1:
+                chains.append(path)
+            return
+        for to in nexts:
+            walk(path + [to])
+
+    for root in roots:
+        walk([root])
+    return chains
+
+
+def build_graph(contributions: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    nodes: dict[str, dict[str, Any]] = {}
+    edges: dict[str, dict[str, list[str]]] = {}
+    uf = UnionFind()
+
+    for slug in sorted(contributions):
+        part = contributions[slug]
+        for nid, meta in part["nodes"].items():
+            slot = nodes.setdefault(nid, {})
+            for k, v in meta.items():
+                if v is not None and (k == "slug" or slot.get(k) is None):
+                    slot[k] = v
+            uf.find(nid)
+        for src, dst, reqs in part["edges"]:
+            # the same edge appears on every family member's page; keep the longest requirement list
+            known = edges.setdefault(src, {})
+            if len(reqs) > len(known.get(dst, [])) or dst not in known:
+                known[dst] = reqs
+            uf.union(src, dst)
+        family = part["family"]
+        for other in family[1:]:
+            uf.union(family[0], other)
+
+    groups: dict[str, list[str]] = {}
+    for nid in nodes:
+        groups.setdefault(uf.find(nid), []).append(nid)
+    families = sorted((sorted(g, key=_sort_key) for g in groups.values()), key=lambda g: _sort_key(g[0]))
+
+    adjacency = {
+        src: {dst: reqs for dst, reqs in sorted(targets.items(), key=lambda kv: _sort_key(kv[0]))}
+        for src, targets in sorted(edges.items(), key=lambda kv: _sort_key(kv[0]))
+    }
+    for idx, members in enumerate(families):
+        for nid in members:
+            nodes[nid]["f"] = idx
+
+    return {
+        "nodes": {nid: nodes[nid] for nid in sorted(nodes, key=_sort_key)},
+        "edges": adjacency,
+        "families": {str(idx): members for idx, members in enumerate(families)},
+        "chains": {
+            str(idx): {str(n): path for n, path in enumerate(chains_of(members, adjacency))}
+            for idx, members in enumerate(families)
+        },
+    }
+
+
+# -----------------------------
+# Query side
+# -----------------------------
+class EvolutionGraph:
+
+    def __init__(self, artifact: dict[str, Any]):
+        self.nodes: dict[str, dict[str, Any]] = artifact.get("nodes", {})
+        self.edges: dict[str, dict[str, list[Any]]] = artifact.get("edges", {})
+        self.families: dict[str, list[str]] = artifact.get("families", {})
+        self.chains: dict[str, dict[str, list[str]]] = artifact.get("chains", {})
+        self.by_slug = {meta["slug"]: nid for nid, meta in self.nodes.items() if meta.get("slug")}
+        self.parents: dict[str, list[str]] = {}
+        for src, targets in self.edges.items():
+            for dst in targets:
+                self.parents.setdefault(dst, []).append(src)
+
+    @classmethod
+    def load(cls, path: str) -> "EvolutionGraph":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def resolve(self, key: str) -> Optional[str]:
+        """Node id from a node id, a species slug ("0025-pikachu") or a dex number."""
+        key = str(key).lower()
+        if key in self.nodes:
+            return key
+        if key in self.by_slug:
+            return self.by_slug[key]
+        return str(int(key)) if key.isdigit() and str(int(key)) in self.nodes else None
+
+    def relatives(self, key: str) -> list[str]:
+        nid = self.resolve(key)
+        if nid is None:
+            return []
+        return list(self.families.get(str(self.nodes[nid]["f"]), []))
+
+    def _reach(self, nid: str, step) -> list[str]:
+        seen: list[str] = []
+        stack = list(step(nid))
+        while stack:
+            cur = stack.pop()
+            if cur != nid and cur not in seen:
+                seen.append(cur)
+                stack.extend(step(cur))
+        return sorted(seen, key=_sort_key)
+
+    def descendants(self, key: str) -> list[str]:
+        nid = self.resolve(key)
+        return self._reach(nid, lambda n: list(self.edges.get(n, {}))) if nid else []
+
+    def ancestors(self, key: str) -> list[str]:
+        nid = self.resolve(key)
+        return self._reach(nid, lambda n: self.parents.get(n, [])) if nid else []
+
+
+# -----------------------------
+# Build side
+# -----------------------------
+class EvolutionGraphStage(BaseStage):
+
+    def build(self) -> Optional[dict[str, Any]]:
+        state = self.load_state()
+        species_state: dict[str, Any] = state.get("species", {})
+
+        paths = {species_slug(p): p for p in list_species_files(self.output_root)}
+        if not paths:
+            print("[EvoGraph] No pokedex outputs.")
+            return None
+
+        removed = [slug for slug in species_state if slug not in paths]
+        for slug in removed:
+            species_state.pop(slug)
+
+        updated = []
+        for slug, path in paths.items():
+            digest = file_digest(path)
+            cached = species_state.get(slug)
+            if cached and cached.get("digest") == digest:
+                continue
+            doc = load_species_doc(path)
+            if not doc:
+                continue
+            species_state[slug] = {"digest": digest, **extract_species(slug, doc)}
+            updated.append(slug)
+
+        print(f"[EvoGraph] {len(updated)} species re-read, {len(removed)} removed, "
+              f"{len(paths) - len(updated)} from state")
+
+        cached_graph = state.get("graph")
+        if not updated and not removed and cached_graph and cached_graph.get("version") == GRAPH_FORMAT_VERSION:
+            print("[EvoGraph] No species changed, graph unchanged.")
+            return {**cached_graph, "updated_species": []}
+
+        graph = build_graph(species_state)
+        print(f"[EvoGraph] {len(graph['nodes'])} nodes, {len(graph['families'])} families")
+
+        result = {
+            "version": GRAPH_FORMAT_VERSION,
+            "built_at": int(time.time()),
+            "updated_species": sorted(updated),
+            **graph,
+        }
+        self.save_state({"species": species_state, "graph": {k: v for k, v in result.items() if k != "updated_species"}})
+        return result
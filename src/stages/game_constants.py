@@ -0,0 +1,69 @@
+"""
+game_constants.py
+
+Fixed Pokémon GO game-master values used by the precompute stages.
+"""
+
+# CP multiplier per level, from level 1 to 51 in half-level steps
+CP_MULTIPLIERS = [
+    0.094, 0.1351374318, 0.16639787, 0.192650919, 0.21573247,
+    0.2365726613, 0.25572005, 0.2735303812, 0.29024988, 0.3060573775,
+    0.3210876, 0.3354450362, 0.34921268, 0.3624577511, 0.3752356,
+    0.387592416, 0.39956728, 0.4111935514, 0.42250001, 0.4329264091,
+    0.44310755, 0.4530599591, 0.46279839, 0.4723360832, 0.48168495,
+    0.4908558003, 0.49985844, 0.508701765, 0.51739395, 0.5259425113,
+    0.53435433, 0.5426357375, 0.55079269, 0.5588305862, 0.56675452,
+    0.5745691333, 0.58227891, 0.5898879072, 0.59740001, 0.6048236651,
+    0.61215729, 0.6194041216, 0.62656713, 0.6336491432, 0.64065295,
+    0.6475809666, 0.65443563, 0.6612192524, 0.667934, 0.6745818959,
+    0.68116492, 0.6876849038, 0.69414365, 0.70054287, 0.70688421,
+    0.7131588712, 0.71939909, 0.7255756136, 0.7317, 0.7347410093,
+    0.73776948, 0.7407855938, 0.74378943, 0.7467812109, 0.74976104,
+    0.7527290867, 0.75568551, 0.7586303683, 0.76156384, 0.7644860647,
+    0.76739717, 0.7702972656, 0.7731865, 0.7760649616, 0.77893275,
+    0.7817900548, 0.78463697, 0.7874736075, 0.79030001, 0.792803968,
+    0.79530001, 0.797800015, 0.8003, 0.802799995, 0.8053,
+    0.8078, 0.81029999, 0.812799985, 0.81529999, 0.81779999,
+    0.82029999, 0.82279999, 0.82529999, 0.82779999, 0.83029999,
+    0.83279999, 0.83529999, 0.83779999, 0.84029999, 0.84279999,
+    0.84529999,
+]
+
+MIN_LEVEL = 1.0
+LEVEL_STEP = 0.5
+MIN_CP = 10
+
+# Damage bonuses
+STAB_BONUS = 1.2
+SUPER_EFFECTIVE = 1.6
+NOT_VERY_EFFECTIVE = 0.625
+NO_EFFECT = 0.390625
+
+# Raid boss CP multiplier per tier (Mega / Primal / Legendary use tier 5)
+RAID_BOSS_CPM = {
+    1: 0.5974,
+    3: 0.73,
+    5: 0.79,
+    6: 0.79,
+}
+DEFAULT_RAID_BOSS_CPM = 0.79
+
+# Weather boost: attacking types boosted under each in-game weather
+WEATHER_BOOST = 1.2
+WEATHER_TYPES = {
+    "sunny": ["Fire", "Grass", "Ground"],
+    "rainy": ["Water", "Electric", "Bug"],
+    "partly_cloudy": ["Normal", "Rock"],
+    "cloudy": ["Fairy", "Fighting", "Poison"],
+    "windy": ["Dragon", "Flying", "Psychic"],
+    "snow": ["Ice", "Steel"],
+    "fog": ["Dark", "Ghost"],
+}
+
+
+def level_at(index: int) -> float:
+    return MIN_LEVEL + index * LEVEL_STEP
+
+
+def level_index(level: float) -> int:
+    return int(round((level - MIN_LEVEL) / LEVEL_STEP))
@@ -0,0 +1,170 @@
+"""
+pvp_rank_stage.py
+
+PvP IV-rank precomputation (Great / Ultra / Master league).
+
+For every species with base stats (parse_overview_stats), evaluates all
+4096 IV combinations at the highest half-level that fits under each
+league's CP cap and ranks them by stat product.
+
+The level search is a single np.searchsorted over CPM² per IV (CP is
+monotonic in level), and species are processed in batches, so the whole
+pokedex is a handful of array operations instead of Python loops.
+
+Writes:
+  output/monthly/json/pvp_rankings/<dex>-<name>.json   (top-N per league)
+  output/monthly/json/pvp_rankings/pvp_rankings.json   (rank-1 summary)
+"""
+import os
+from typing import Any, Optional
+
+import numpy as np
+
+from src.base.base_stage import BaseStage
+from src.stages.game_constants import CP_MULTIPLIERS, MIN_CP, level_at, level_index
+from src.stages.species_outputs import base_stats, dex_number, iter_species_docs, species_name
+
+LEAGUES: dict[str, Optional[int]] = {
+    "great": 1500,
+    "ultra": 2500,
+    "master": None,
+}
+
+_IV = np.arange(16)
+IV_GRID = np.stack(np.meshgrid(_IV, _IV, _IV, indexing="ij"), axis=-1).reshape(-1, 3)
+
+
+# -----------------------------
+# Vectorized core
+# -----------------------------
+def rank_league(base: np.ndarray, cp_cap: Optional[int], cpm: np.ndarray, top_n: int) -> dict[str, np.ndarray]:
+    """
+    base: (S, 3) base stats for S species.
+    Returns arrays of shape (S, top_n) for the best IVs under cp_cap.
+    """
+    stats = base[:, None, :].astype(np.float64) + IV_GRID[None, :, :]
+    atk, dfn, sta = stats[..., 0], stats[..., 1], stats[..., 2]
+
+    # CP = floor(x * cpm²), x = atk * sqrt(def) * sqrt(sta) / 10
+    x = atk * np.sqrt(dfn) * np.sqrt(sta) / 10.0
+    cpm_sq = cpm ** 2
+    last = len(cpm) - 1
+
+    if cp_cap is None:
+        idx = np.full(x.shape, last)
+    else:
+        # highest level with floor(x * cpm²) <= cap  <=>  cpm² < (cap + 1) / x
+        idx = np.searchsorted(cpm_sq, (cp_cap + 1) / x, side="left") - 1
+        idx = np.minimum(idx, last)
+        # guard float rounding right at the boundary
+        over = (idx >= 0) & (np.floor(x * cpm_sq[np.maximum(idx, 0)]) > cp_cap)
+        idx = np.where(over, idx - 1, idx)
+
+    valid = idx >= 0
+    level_cpm = cpm[np.maximum(idx, 0)]
+
+    cp = np.maximum(MIN_CP, np.floor(x * level_cpm ** 2))
+    hp = np.maximum(10, np.floor(sta * level_cpm))
+    product = (atk * level_cpm) * (dfn * level_cpm) * hp
+    product = np.where(valid, product, -1.0)
+
+    top_n = min(top_n, product.shape[1])
+    part = np.argpartition(-product, top_n - 1, axis=1)[:, :top_n]
+    order = np.take_along_axis(
+        part, np.argsort(-np.take_along_axis(product, part, axis=1), axis=1, kind="stable"), axis=1
+    )
+    best = np.take_along_axis(product, order[:, :1], axis=1)
+
+    def take(a: np.ndarray) -> np.ndarray:
+        return np.take_along_axis(a, order, axis=1)
+
+    return {
+        "iv": IV_GRID[order],
+        "level_index": take(idx),
+        "cp": take(cp),
+        "hp": take(hp),
+        "stat_product": take(product),
+        "percent": take(product) / np.where(best > 0, best, 1) * 100.0,
+    }
+
+
+def _rank_rows(league: dict[str, np.ndarray], row: int) -> list[dict[str, Any]]:
+    ranks = []
+    for i in range(league["iv"].shape[1]):
+        product = float(league["stat_product"][row, i])
+        if product < 0:
+            break
+        a, d, s = (int(v) for v in league["iv"][row, i])
+        ranks.append({
+            "rank": i + 1,
+            "attack_iv": a,
+            "defense_iv": d,
+            "stamina_iv": s,
+            "level": level_at(int(league["level_index"][row, i])),
+            "cp": int(league["cp"][row, i]),
+            "hp": int(league["hp"][row, i]),
+            "stat_product": round(product, 2),
+            "percent": round(float(league["percent"][row, i]), 2),
+        })
+    return ranks
+
+
+# -----------------------------
+# Stage
+# -----------------------------
+class PvpRankStage(BaseStage):
+
+    def __init__(self, stage: Any, stage_settings: dict[str, Any]):
+        super().__init__(stage, stage_settings)
+        self.top_n = int(stage.get("top_n", 100))
+        self.max_level = float(stage.get("max_level", 50))
+        self.batch_size = int(stage.get("batch_size", 128))
+
+    def build(self) -> Optional[dict[str, Any]]:
+        species = []
+        for slug, doc in iter_species_docs(self.output_root):
+            stats = base_stats(doc)
+            if stats:
+                species.append((slug, species_name(doc, slug), stats))
+
+        if not species:
+            print("[PvP] No species with base stats found.")
+            return None
+
+        print(f"[PvP] Ranking {len(species)} species × {len(IV_GRID)} IVs")
+
+        cpm = np.asarray(CP_MULTIPLIERS[: level_index(self.max_level) + 1], dtype=np.float64)
+        summary = []
+
+        for start in range(0, len(species), self.batch_size):
+            batch = species[start:start + self.batch_size]
+            base = np.asarray([s[2] for s in batch], dtype=np.float64)
+            leagues = {
+                name: rank_league(base, cap, cpm, self.top_n)
+                for name, cap in LEAGUES.items()
+            }
+
+            for row, (slug, name, stats) in enumerate(batch):
+                doc = {
+                    "species": slug,
+                    "dex": dex_number(slug),
+                    "name": name,
+                    "base_stats": dict(zip(("attack", "defense", "stamina"), stats)),
+                    "max_level": self.max_level,
+                    "leagues": {
+                        league: {"cp_cap": LEAGUES[league], "ranks": _rank_rows(arrays, row)}
+                        for league, arrays in leagues.items()
+                    },
+                }
+                self.save_to_json(doc, os.path.join(self.json_dir, f"{slug}.json"))
+
+                summary.append({
+                    "species": slug,
+                    "name": name,
+                    "leagues": {
+                        league: (data["ranks"][0] if data["ranks"] else None)
+                        for league, data in doc["leagues"].items()
+                    },
+                })
+
+        return {"results": summary}
@@ -0,0 +1,241 @@
+"""
+raid_counter_stage.py
+
+Raid counter engine.
+
+Joins RaidBossScraper output (boss.json) with every species' moveset
+combinations (parse_movesets → detailed_combinations), PvE move stats
+(parse_move_table output of the moves scraper) and the type chart.
+
+All (species, moveset) pairs are flattened into arrays once; each boss is
+then a row of type multipliers, so the estimated DPS of every pair against
+every boss is a single (bosses × pairs) NumPy expression.
+
+Writes output/daily/json/raid_counters/raid_counters.json:
+{
+    "results": [
+        {"boss": "Raikou", "tier": 5, "types": [...], "counters": [...]},
+        ...
+    ]
+}
+"""
+import re
+from typing import Any, Optional
+
+import numpy as np
+
+from src.base.base_stage import BaseStage
+from src.stages.game_constants import (
+    CP_MULTIPLIERS, DEFAULT_RAID_BOSS_CPM, RAID_BOSS_CPM, STAB_BONUS, level_index,
+)
+from src.stages.species_outputs import (
+    base_stats, iter_species_docs, name_key, slug_name, species_name, species_types,
+)
+from src.stages.type_matrix import defender_multipliers, type_index, type_matrix
+
+BOSS_PREFIXES = ("shadow", "mega", "primal")
+DEFAULT_BOSS_DEFENSE = 200.0
+
+
+def _duration_seconds(raw: Any) -> Optional[float]:
+    if raw is None:
+        return None
+    if isinstance(raw, (int, float)):
+        value = float(raw)
+    else:
+        m = re.search(r"\d+(?:\.\d+)?", str(raw))
+        if not m:
+            return None
+        value = float(m.group(0))
+        if "ms" in str(raw).lower():
+            value /= 1000.0
+    # tables sometimes list milliseconds without a unit
+    return value / 1000.0 if value > 20 else value
+
+
+def _move_entry(move_type: Any, power: Any, energy: Any, duration: Any) -> Optional[dict[str, Any]]:
+    t = type_index(move_type)
+    dur = _duration_seconds(duration)
+    if t < 0 or power is None or energy is None or not dur:
+        return None
+    try:
+        return {"type": t, "power": float(power), "energy": abs(float(energy)), "duration": dur}
+    except (TypeError, ValueError):
+        return None
+
+
+def _results(data: Any) -> list[Any]:
+    if isinstance(data, dict):
+        data = data.get("results", [])
+    return data if isinstance(data, list) else []
+
+
+class RaidCounterStage(BaseStage):
+
+    def __init__(self, stage: Any, stage_settings: dict[str, Any]):
+        super().__init__(stage, stage_settings)
+        self.top_n = int(stage.get("top_n", 20))
+        self.attacker_level = float(stage.get("attacker_level", 40))
+        self.moves_pipeline = stage.get("moves_pipeline", "daily")
+        self.boss_pipeline = stage.get("boss_pipeline", "daily")
+        self.type_chart_pipeline = stage.get("type_chart_pipeline", "monthly")
+
+    # -----------------------------
+    # Inputs
+    # -----------------------------
+    def _load_move_table(self) -> dict[str, dict[str, Any]]:
+        """name_key → PvE stats from parse_move_table output."""
+        moves: dict[str, dict[str, Any]] = {}
+        for file_name in ("fast_moves", "charge_moves"):
+            data = self.load_output(self.moves_pipeline, file_name, "moves")
+            for move in _results(data):
+                pve = move.get("pve") or {}
+                entry = _move_entry(move.get("type"), pve.get("power"), pve.get("energy"), pve.get("duration"))
+                if entry:
+                    moves[name_key(move.get("name"))] = entry
+        return moves
+
+    @staticmethod
+    def _species_moves(doc: dict[str, Any]) -> dict[str, dict[str, Any]]:
+        """Fallback: move cards on the species page (parse_movesets)."""
+        moves: dict[str, dict[str, Any]] = {}
+        movesets = doc.get("moves_and_best_movesets") or {}
+        for card in (movesets.get("fast_moves") or []) + (movesets.get("charged_moves") or []):
+            stats = card.get("stats") or {}
+            entry = _move_entry(card.get("type"), stats.get("damage"), stats.get("energy"), stats.get("duration"))
+            if entry:
+                moves[name_key(card.get("name"))] = entry
+        return moves
+
+    def _collect_pairs(self, move_table: dict[str, dict[str, Any]]):
+        """Flatten every (species, fast, charged) combination into parallel arrays."""
+        cols: dict[str, list[Any]] = {k: [] for k in (
+            "species", "name", "fast", "charged", "attack", "stab_types",
+            "f_type", "f_power", "f_energy", "f_duration",
+            "c_type", "c_power", "c_energy", "c_duration",
+        )}
+        defense_by_name: dict[str, float] = {}
+
+        for slug, doc in iter_species_docs(self.output_root):
+            stats = base_stats(doc)
+            if not stats:
+                continue
+
+            name = species_name(doc, slug)
+            defense_by_name[name_key(slug_name(slug))] = float(stats[1])
+            defense_by_name[name_key(name)] = float(stats[1])
+
+            movesets = doc.get("moves_and_best_movesets") or {}
+            combos = movesets.get("detailed_combinations") or []
+            if not combos and movesets.get("best_moveset"):
+                combos = [movesets["best_moveset"]]
+
+            local_moves = None
+            own_types = {type_index(t) for t in species_types(doc)}
+
+            for combo in combos:
+                f_key, c_key = name_key(combo.get("fast")), name_key(combo.get("charged"))
+                fast, charged = move_table.get(f_key), move_table.get(c_key)
+                if fast is None or charged is None:
+                    if local_moves is None:
+                        local_moves = self._species_moves(doc)
+                    fast = fast or local_moves.get(f_key)
+                    charged = charged or local_moves.get(c_key)
+                if not fast or not charged or fast["energy"] <= 0:
+                    continue
+
+                cols["species"].append(slug)
+                cols["name"].append(name)
+                cols["fast"].append(combo.get("fast"))
+                cols["charged"].append(combo.get("charged"))
+                cols["attack"].append(stats[0])
+                cols["stab_types"].append(own_types)
+                for prefix, move in (("f", fast), ("c", charged)):
+                    cols[f"{prefix}_type"].append(move["type"])
+                    cols[f"{prefix}_power"].append(move["power"])
+                    cols[f"{prefix}_energy"].append(move["energy"])
+                    cols[f"{prefix}_duration"].append(move["duration"])
+
+        return cols, defense_by_name
+
+    # -----------------------------
+    # Build
+    # -----------------------------
+    def build(self) -> Optional[dict[str, Any]]:
+        bosses = _results(self.load_output(self.boss_pipeline, "boss"))
+        if not bosses:
+            print("[Counters] No raid bosses to score.")
+            return None
+
+        matrix = type_matrix(self.load_output(self.type_chart_pipeline, "type_chart"))
+        cols, defense_by_name = self._collect_pairs(self._load_move_table())
+        n_pairs = len(cols["species"])
+        if not n_pairs:
+            print("[Counters] No species movesets with move stats found.")
+            return None
+
+        print(f"[Counters] Scoring {n_pairs} movesets × {len(bosses)} bosses")
+
+        cpm = CP_MULTIPLIERS[level_index(self.attacker_level)]
+        atk = (np.asarray(cols["attack"], dtype=np.float64) + 15) * cpm
+        f_type = np.asarray(cols["f_type"])
+        c_type = np.asarray(cols["c_type"])
+        f_stab = np.where([t in s for t, s in zip(cols["f_type"], cols["stab_types"])], STAB_BONUS, 1.0)
+        c_stab = np.where([t in s for t, s in zip(cols["c_type"], cols["stab_types"])], STAB_BONUS, 1.0)
+        f_power, c_power = np.asarray(cols["f_power"]), np.asarray(cols["c_power"])
+        f_dur, c_dur = np.asarray(cols["f_duration"]), np.asarray(cols["c_duration"])
+        fasts_per_charge = np.asarray(cols["c_energy"]) / np.asarray(cols["f_energy"])
+        cycle_time = fasts_per_charge * f_dur + c_dur
+
+        # (bosses, types) multipliers and (bosses, 1) defense
+        boss_mult = np.stack([defender_multipliers(matrix, b.get("types") or []) for b in bosses])
+        boss_def = np.asarray([[self._boss_defense(b, defense_by_name)] for b in bosses])
+
+        ratio = atk[None, :] / boss_def
+        f_dmg = np.floor(0.5 * f_power * ratio * f_stab * boss_mult[:, f_type]) + 1
+        c_dmg = np.floor(0.5 * c_power * ratio * c_stab * boss_mult[:, c_type]) + 1
+        dps = (fasts_per_charge * f_dmg + c_dmg) / cycle_time
+
+        order = np.argsort(-dps, axis=1, kind="stable")
+
+        results = []
+        for b, boss in enumerate(bosses):
+            counters = []
+            seen: set[str] = set()
+            for p in order[b]:
+                slug = cols["species"][p]
+                if slug in seen:
+                    continue
+                seen.add(slug)
+                counters.append({
+                    "rank": len(counters) + 1,
+                    "species": slug,
+                    "name": cols["name"][p],
+                    "fast": cols["fast"][p],
+                    "charged": cols["charged"][p],
+                    "dps": round(float(dps[b, p]), 2),
+                    "type_multiplier_fast": round(float(boss_mult[b, f_type[p]]), 3),
+                    "type_multiplier_charged": round(float(boss_mult[b, c_type[p]]), 3),
+                })
+                if len(counters) >= self.top_n:
+                    break
+
+            results.append({
+                "boss": boss.get("name"),
+                "tier": boss.get("tier"),
+                "types": boss.get("types") or [],
+                "counters": counters,
+            })
+
+        return {"results": results}
+
+    @staticmethod
+    def _boss_defense(boss: dict[str, Any], defense_by_name: dict[str, float]) -> float:
+        name = str(boss.get("name") or "")
+        words = [w for w in name.split() if w.lower() not in BOSS_PREFIXES]
+        base = defense_by_name.get(name_key(" ".join(words)))
+        if base is None:
+            base = defense_by_name.get(name_key(words[0])) if words else None
+        base_def = base if base is not None else DEFAULT_BOSS_DEFENSE
+        tier_cpm = RAID_BOSS_CPM.get(boss.get("tier"), DEFAULT_RAID_BOSS_CPM)
+        return (base_def + 15) * tier_cpm
@@ -0,0 +1,225 @@
+"""
+search_index_stage.py
+
+Compact trigram + prefix search index over the pokedex output.
+
+Documents are species names, form names, move names (moves scraper
+output + species move cards) and types. The artifact holds:
+  - "docs":     [{"k": kind, "n": display name, "r": ref, "t": types}, ...]
+  - "trigrams": trigram → sorted doc ids (substring / fuzzy search)
+  - "tokens":   token → doc ids (sorted into a bisect list for prefix search)
+  - "version" / "build": format version and a digest of the inputs
+
+When "build" matches the previous run (kept in the stage state) the old
+"built_at" is reused, so an unchanged index is byte-identical and the
+uploader skips it.
+
+SearchIndex loads the artifact once and answers queries in well under a
+millisecond (postings intersection or a bisect, never a full scan).
+"""
+import hashlib
+import json
+import re
+import time
+import unicodedata
+from bisect import bisect_left
+from typing import Any, Optional
+
+from src.base.base_stage import BaseStage
+from src.common import file_digest
+from src.scrapers.types.parsers.type_chart_parser import TYPE_ORDER
+from src.stages.species_outputs import list_species_files, load_species_doc, overview, species_name, species_slug
+
+INDEX_FORMAT_VERSION = 2
+
+
+def normalize_text(text: Optional[str]) -> str:
+    if not text:
+        return ""
+    txt = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode().lower()
+    return re.sub(r"\s+", " ", re.sub(r"[^a-z0-9]+", " ", txt)).strip()
+
+
+def trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def query_trigrams(text: str) -> set[str]:
+    """Unpadded: a query may start and stop mid-word ("chu" must match "pikachu")."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _results(data: Any) -> list[dict[str, Any]]:
+    if isinstance(data, dict):
+        data = data.get("results", [])
+    return [r for r in data if isinstance(r, dict)] if isinstance(data, list) else []
+
+
+# -----------------------------
+# Query side
+# -----------------------------
+class SearchIndex:
+
+    def __init__(self, artifact: dict[str, Any]):
+        self.version = artifact.get("version")
+        self.docs: list[dict[str, Any]] = artifact.get("docs", [])
+        self.norm = [normalize_text(d["n"]) for d in self.docs]
+        self.postings = {tri: frozenset(ids) for tri, ids in artifact.get("trigrams", {}).items()}
+        pairs = sorted((token, i) for token, ids in artifact.get("tokens", {}).items() for i in ids)
+        self.token_keys = [t for t, _ in pairs]
+        self.token_ids = [i for _, i in pairs]
+
+    @classmethod
+    def load(cls, path: str) -> "SearchIndex":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def _prefix(self, q: str) -> set[int]:
+        out = set()
+        i = bisect_left(self.token_keys, q)
+        while i < len(self.token_keys) and self.token_keys[i].startswith(q):
+            out.add(self.token_ids[i])
+            i += 1
+        return out
+
+    def _trigram(self, q: str) -> set[int]:
+        grams = sorted(query_trigrams(q), key=lambda g: len(self.postings.get(g, ())))
+        lists = [self.postings.get(g, frozenset()) for g in grams]
+
+        exact = set(lists[0]) if lists else set()
+        for ids in lists[1:]:
+            if not exact:
+                break
+            exact &= ids
+        exact = {i for i in exact if q in self.norm[i]}
+        if exact:
+            return exact
+
+        # fuzzy: docs sharing all but one of the query trigrams (one typo)
+        counts: dict[int, int] = {}
+        for ids in lists:
+            for i in ids:
+                counts[i] = counts.get(i, 0) + 1
+        need = max(1, len(grams) - 1)
+        return {i for i, c in counts.items() if c >= need}
+
+    def search(self, query: str, limit: int = 10, kinds: Optional[set[str]] = None) -> list[dict[str, Any]]:
+        q = normalize_text(query)
+        if not q:
+            return []
+
+        if len(q) < 3:
+            hits = self._prefix(q)
+        else:
+            hits = self._trigram(q) | self._prefix(q)
+
+        if kinds:
+            hits = {i for i in hits if self.docs[i]["k"] in kinds}
+
+        def rank(i: int):
+            name = self.norm[i]
+            return (
+                name != q,
+                not name.startswith(q),
+                q not in name,
+                len(name),
+                name,
+            )
+
+        return [self.docs[i] for i in sorted(hits, key=rank)[:limit]]
+
+
+# -----------------------------
+# Build side
+# -----------------------------
+class SearchIndexStage(BaseStage):
+
+    def __init__(self, stage: Any, stage_settings: dict[str, Any]):
+        super().__init__(stage, stage_settings)
+        self.moves_pipeline = stage.get("moves_pipeline", "daily")
+
+    def _collect_docs(self) -> tuple[list[dict[str, Any]], str]:
+        docs: list[dict[str, Any]] = []
+        seen: set[tuple[str, str]] = set()
+        digest = hashlib.sha1()
+
+        def add(kind: str, name: Optional[str], ref: Any = None, types: Optional[list[str]] = None):
+            if not name or (kind, normalize_text(name)) in seen:
+                return
+            seen.add((kind, normalize_text(name)))
+            doc = {"k": kind, "n": name, "r": ref}
+            if types:
+                doc["t"] = types
+            docs.append(doc)
+
+        for t in TYPE_ORDER:
+            add("type", t, t)
+
+        move_names: dict[str, Any] = {}
+        for file_name in ("fast_moves", "charge_moves"):
+            path = self.output_path(self.moves_pipeline, file_name, "moves")
+            digest.update(str(file_digest(path)).encode())
+            for move in _results(self.load_output(self.moves_pipeline, file_name, "moves")):
+                if move.get("name"):
+                    move_names[move["name"]] = {"id": move.get("id"), "type": move.get("type")}
+
+        for path in list_species_files(self.output_root):
+            digest.update(str(file_digest(path)).encode())
+            doc = load_species_doc(path)
+            if not doc:
+                continue
+            slug = species_slug(path)
+            ov = overview(doc)
+            types = list(ov.get("types") or [])
+            add("pokemon", species_name(doc, slug), slug, types)
+
+            for form in ov.get("forms") or []:
+                if normalize_text(form.get("name")) != normalize_text(species_name(doc, slug)):
+                    add("form", form.get("name"), slug, types)
+
+            movesets = doc.get("moves_and_best_movesets") or {}
+            for card in (movesets.get("fast_moves") or []) + (movesets.get("charged_moves") or []):
+                move_names.setdefault(card.get("name"), {"id": None, "type": card.get("type")})
+
+        for name, meta in sorted(move_names.items(), key=lambda kv: str(kv[0])):
+            add("move", name, meta["id"], [meta["type"]] if meta.get("type") else None)
+
+        return docs, digest.hexdigest()
+
+    def build(self) -> Optional[dict[str, Any]]:
+        docs, build_id = self._collect_docs()
+        if len(docs) <= len(TYPE_ORDER):
+            print("[Search] No pokedex / move outputs to index.")
+            return None
+
+        postings: dict[str, list[int]] = {}
+        # maps of id lists, no nested arrays: the artifact is also uploaded to Firestore
+        tokens: dict[str, list[int]] = {}
+        for i, doc in enumerate(docs):
+            norm = normalize_text(doc["n"])
+            for g in trigrams(norm):
+                postings.setdefault(g, []).append(i)
+            for word in set(norm.split()):
+                tokens.setdefault(word, []).append(i)
+            if " " in norm:
+                tokens.setdefault(norm, []).append(i)
+
+        print(f"[Search] Indexed {len(docs)} docs, {len(postings)} trigrams")
+
+        state = self.load_state()
+        if state.get("build") == build_id and state.get("version") == INDEX_FORMAT_VERSION:
+            print("[Search] Inputs unchanged, keeping built_at.")
+            built_at = state["built_at"]
+        else:
+            built_at = int(time.time())
+            self.save_state({"version": INDEX_FORMAT_VERSION, "build": build_id, "built_at": built_at})
+
+        return {
+            "version": INDEX_FORMAT_VERSION,
+            "build": build_id,
+            "built_at": built_at,
+            "docs": docs,
+            "trigrams": {g: postings[g] for g in sorted(postings)},
+            "tokens": {t: tokens[t] for t in sorted(tokens)},
+        }
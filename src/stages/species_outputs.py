@@ -0,0 +1,156 @@
+"""
+species_outputs.py
+
+Helpers for reading the per-species JSON written by PokemonListScraper
+(output/monthly/json/pokemon/<dex>-<name>.json).
+"""
+import json
+import os
+import re
+import unicodedata
+from typing import Any, Iterator, Optional
+
+SPECIES_PIPELINE = "monthly"
+SPECIES_SUBFOLDER = "pokemon"
+SPECIES_FILE_RE = re.compile(r"^(\d{4})-([a-z0-9_\-]+)\.json$")
+
+STAT_KEYS = {
+    "attack": ("base_attack", "attack", "atk"),
+    "defense": ("base_defense", "defense", "def"),
+    "stamina": ("base_stamina", "stamina", "hp", "sta"),
+}
+
+
+def name_key(name: Optional[str]) -> str:
+    """Lowercase ASCII alphanumerics only: "Flabébé" / "flabebe" → "flabebe"."""
+    if not name:
+        return ""
+    txt = unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]", "", txt.lower())
+
+
+# Name prefixes LeekDuck puts in front of the species (kept as variants)
+VARIANT_PREFIXES = {
+    "shadow", "mega", "primal", "alolan", "galarian", "hisuian", "paldean",
+    "dynamax", "gigantamax", "apex", "purified",
+}
+
+
+def species_key(name: Optional[str]) -> tuple[str, list[str]]:
+    """
+    Normalize a display name from any scraper to a species key + variants.
+
+      "Shadow Raikou"        → ("raikou", ["shadow"])
+      "Mega Charizard Y"     → ("charizard", ["mega", "y"])
+      "Pikachu (Flying)"     → ("pikachu", ["flying"])
+      "Nidoran♀" / "nidoran-f" → ("nidoranf", [])
+    """
+    if not name:
+        return "", []
+
+    txt = str(name).replace("♀", " f").replace("♂", " m").strip()
+    variants = [name_key(v) for v in re.findall(r"\(([^)]*)\)", txt) if name_key(v)]
+    txt = re.sub(r"\([^)]*\)", " ", txt)
+
+    words = txt.split()
+    while len(words) > 1 and name_key(words[0]) in VARIANT_PREFIXES:
+        variants.insert(0, name_key(words.pop(0)))
+    if "mega" in variants and len(words) > 1 and name_key(words[-1]) in ("x", "y"):
+        variants.append(name_key(words.pop()))
+
+    joined = " ".join(words)
+    if re.search(r"\s[fm]$", joined):
+        joined = joined[:-2] + joined[-1]
+    return name_key(joined), variants
+
+
+def species_dir(output_root: str) -> str:
+    return os.path.join(output_root, SPECIES_PIPELINE, "json", SPECIES_SUBFOLDER)
+
+
+def list_species_files(output_root: str) -> list[str]:
+    folder = species_dir(output_root)
+    if not os.path.isdir(folder):
+        return []
+    return sorted(
+        os.path.join(folder, fn) for fn in os.listdir(folder)
+        if SPECIES_FILE_RE.match(fn)
+    )
+
+
+def species_slug(path: str) -> str:
+    return os.path.basename(path)[:-5]
+
+
+def dex_number(slug: str) -> Optional[int]:
+    m = re.match(r"^(\d{4})-", slug)
+    return int(m.group(1)) if m else None
+
+
+def load_species_doc(path: str) -> Optional[dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            doc = json.load(f)
+        return doc if isinstance(doc, dict) and doc else None
+    except Exception as e:
+        print(f"[SPECIES] Failed loading {path}: {e}")
+        return None
+
+
+def iter_species_docs(output_root: str) -> Iterator[tuple[str, dict[str, Any]]]:
+    for path in list_species_files(output_root):
+        doc = load_species_doc(path)
+        if doc:
+            yield species_slug(path), doc
+
+
+# -----------------------------
+# Field accessors
+# -----------------------------
+def overview(doc: dict[str, Any]) -> dict[str, Any]:
+    return doc.get("overview_and_stats") or {}
+
+
+def species_name(doc: dict[str, Any], slug: str) -> str:
+    title = overview(doc).get("title")
+    if title:
+        return str(title)
+    return slug_name(slug).replace("-", " ").title()
+
+
+def slug_name(slug: str) -> str:
+    return slug.split("-", 1)[-1]
+
+
+def species_types(doc: dict[str, Any]) -> list[str]:
+    return list(overview(doc).get("types") or [])
+
+
+def _stat_value(raw: Any) -> Optional[int]:
+    if isinstance(raw, bool):
+        return None
+    if isinstance(raw, (int, float)):
+        return int(raw)
+    if isinstance(raw, str):
+        m = re.search(r"\d+", raw)
+        return int(m.group(0)) if m else None
+    return None
+
+
+def base_stats(doc: dict[str, Any]) -> Optional[tuple[int, int, int]]:
+    """
+    (attack, defense, stamina) from parse_overview_stats output,
+    or None when the overview table did not have all three.
+    """
+    ov = overview(doc)
+    stats = []
+    for stat, keys in STAT_KEYS.items():
+        value = None
+        for k in keys:
+            value = _stat_value(ov.get(k))
+            if value:
+                break
+        if not value:
+            return None
+        stats.append(value)
+    return stats[0], stats[1], stats[2]
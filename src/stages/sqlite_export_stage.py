@@ -0,0 +1,490 @@
+"""
+sqlite_export_stage.py
+
+Consolidated SQLite dataset: pokedex, type chart, moves, raids, eggs,
+research, rocket lineups and events in one normalized database with
+foreign keys and indexes.
+
+The build is incremental. Every input document (one species file, or one
+list file such as boss.json) is tracked in the `documents` table by
+digest; only changed documents are upserted / replaced and documents
+whose file disappeared are deleted. Appearance tables link to `pokemon`
+through a normalized species key, resolved in SQL after each build.
+
+The database (with the `documents` digests) lives next to the HTML cache,
+which CI restores between runs, and is the only copy: the data branch
+holds one binary per run, not a working copy plus a published one. The
+manifest points at it by its path under output/.
+
+Writes:
+  output/<pipeline>/html/pogo_dataset/pogo_dataset.sqlite   (database)
+  output/<pipeline>/json/pogo_dataset/pogo_dataset.json     (manifest)
+"""
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Callable, Optional
+
+from src.base.base_stage import BaseStage
+from src.common import file_digest
+from src.common.utils import parse_cp_range
+from src.scrapers.types.parsers.type_chart_parser import TYPE_ORDER
+from src.stages.species_outputs import (
+    base_stats, dex_number, list_species_files, load_species_doc, overview,
+    slug_name, species_key, species_name, species_slug, species_types,
+)
+
+SCHEMA_VERSION = 1
+
+# document source → (pipeline, file_name, subfolder)
+LIST_SOURCES = {
+    "type_chart": ("monthly", "type_chart", None),
+    "fast_moves": ("daily", "fast_moves", "moves"),
+    "charge_moves": ("daily", "charge_moves", "moves"),
+    "boss": ("daily", "boss", None),
+    "eggs": ("hourly", "eggs", None),
+    "research": ("daily", "research", None),
+    "rocket_lineups": ("daily", "rocket_lineups", None),
+    "events": ("weekly", "events", None),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS documents (
+    source TEXT NOT NULL,
+    doc_key TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    updated_at INTEGER NOT NULL,
+    PRIMARY KEY (source, doc_key)
+);
+CREATE TABLE IF NOT EXISTS types (
+    name TEXT PRIMARY KEY,
+    image TEXT
+);
+CREATE TABLE IF NOT EXISTS type_effectiveness (
+    attacker TEXT NOT NULL REFERENCES types(name),
+    defender TEXT NOT NULL REFERENCES types(name),
+    multiplier REAL NOT NULL,
+    PRIMARY KEY (attacker, defender)
+);
+CREATE TABLE IF NOT EXISTS pokemon (
+    id TEXT PRIMARY KEY,
+    dex INTEGER,
+    name TEXT NOT NULL,
+    species_key TEXT NOT NULL,
+    attack INTEGER,
+    defense INTEGER,
+    stamina INTEGER,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_pokemon_dex ON pokemon(dex);
+CREATE INDEX IF NOT EXISTS idx_pokemon_name ON pokemon(name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_pokemon_species_key ON pokemon(species_key);
+CREATE TABLE IF NOT EXISTS pokemon_types (
+    pokemon_id TEXT NOT NULL REFERENCES pokemon(id) ON DELETE CASCADE,
+    slot INTEGER NOT NULL,
+    type TEXT NOT NULL REFERENCES types(name),
+    PRIMARY KEY (pokemon_id, slot)
+);
+CREATE INDEX IF NOT EXISTS idx_pokemon_types_type ON pokemon_types(type);
+CREATE TABLE IF NOT EXISTS moves (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    type TEXT REFERENCES types(name),
+    pve_power REAL,
+    pve_energy REAL,
+    pve_duration TEXT,
+    pve_dps REAL,
+    pvp TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_moves_name ON moves(name COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS pokemon_movesets (
+    pokemon_id TEXT NOT NULL REFERENCES pokemon(id) ON DELETE CASCADE,
+    rank INTEGER,
+    fast TEXT,
+    charged TEXT,
+    dps REAL,
+    tdo REAL,
+    score REAL
+);
+CREATE INDEX IF NOT EXISTS idx_movesets_pokemon ON pokemon_movesets(pokemon_id);
+CREATE INDEX IF NOT EXISTS idx_movesets_fast ON pokemon_movesets(fast);
+CREATE INDEX IF NOT EXISTS idx_movesets_charged ON pokemon_movesets(charged);
+CREATE TABLE IF NOT EXISTS raid_bosses (
+    name TEXT NOT NULL,
+    tier TEXT,
+    shiny INTEGER,
+    cp_min INTEGER,
+    cp_max INTEGER,
+    boosted_cp_min INTEGER,
+    boosted_cp_max INTEGER,
+    types TEXT,
+    asset_url TEXT,
+    species_key TEXT,
+    pokemon_id TEXT REFERENCES pokemon(id) ON DELETE SET NULL
+);
+CREATE INDEX IF NOT EXISTS idx_raid_bosses_pokemon ON raid_bosses(pokemon_id);
+CREATE TABLE IF NOT EXISTS eggs (
+    title TEXT,
+    name TEXT NOT NULL,
+    hatch_distance INTEGER,
+    rarity_tier INTEGER,
+    shiny INTEGER,
+    asset_url TEXT,
+    species_key TEXT,
+    pokemon_id TEXT REFERENCES pokemon(id) ON DELETE SET NULL
+);
+CREATE INDEX IF NOT EXISTS idx_eggs_pokemon ON eggs(pokemon_id);
+CREATE TABLE IF NOT EXISTS research (
+    title TEXT,
+    task TEXT,
+    reward_type TEXT,
+    name TEXT,
+    quantity INTEGER,
+    shiny INTEGER,
+    cp_min INTEGER,
+    cp_max INTEGER,
+    asset_url TEXT,
+    species_key TEXT,
+    pokemon_id TEXT REFERENCES pokemon(id) ON DELETE SET NULL
+);
+CREATE INDEX IF NOT EXISTS idx_research_pokemon ON research(pokemon_id);
+CREATE INDEX IF NOT EXISTS idx_research_reward_type ON research(reward_type);
+CREATE TABLE IF NOT EXISTS rocket_lineups (
+    leader TEXT NOT NULL,
+    slot INTEGER,
+    is_encounter INTEGER,
+    name TEXT,
+    shiny INTEGER,
+    asset_url TEXT,
+    species_key TEXT,
+    pokemon_id TEXT REFERENCES pokemon(id) ON DELETE SET NULL
+);
+CREATE INDEX IF NOT EXISTS idx_rocket_pokemon ON rocket_lineups(pokemon_id);
+CREATE TABLE IF NOT EXISTS events (
+    article_url TEXT PRIMARY KEY,
+    category TEXT,
+    title TEXT,
+    banner_url TEXT,
+    start_time TEXT,
+    end_time TEXT,
+    description TEXT,
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_start ON events(start_time);
+"""
+
+APPEARANCE_TABLES = ("raid_bosses", "eggs", "research", "rocket_lineups")
+
+
+def _results(data: Any) -> list[dict[str, Any]]:
+    if isinstance(data, dict):
+        data = data.get("results", [])
+    return [r for r in data if isinstance(r, dict)] if isinstance(data, list) else []
+
+
+def _cp(rng: Optional[dict[str, int]], key: str) -> Optional[int]:
+    return rng.get(key) if isinstance(rng, dict) else None
+
+
+def _bool(v: Any) -> Optional[int]:
+    return None if v is None else int(bool(v))
+
+
+# -----------------------------
+# List document loaders: (conn, data) → rows written
+# -----------------------------
+def _load_type_chart(conn: sqlite3.Connection, data: Any) -> int:
+    types = (data or {}).get("results") or {}
+    conn.execute("DELETE FROM type_effectiveness")
+    for name, entry in types.items():
+        conn.execute(
+            "INSERT INTO types(name, image) VALUES(?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET image = excluded.image",
+            (name, entry.get("image")),
+        )
+    rows = [
+        (attacker, defender, float(mult))
+        for attacker, entry in types.items()
+        for defender, mult in ((entry.get("attack") or {}).get("multipliers") or {}).items()
+        if mult is not None
+    ]
+    conn.executemany("INSERT INTO type_effectiveness VALUES(?, ?, ?)", rows)
+    return len(rows)
+
+
+def _move_loader(category: str) -> Callable[[sqlite3.Connection, Any], int]:
+    def load(conn: sqlite3.Connection, data: Any) -> int:
+        conn.execute("DELETE FROM moves WHERE category = ?", (category,))
+        rows = []
+        for m in _results(data):
+            if m.get("id") is None:
+                continue
+            pve = m.get("pve") or {}
+            rows.append((
+                m["id"], m.get("name"), category, m.get("type") if m.get("type") in TYPE_ORDER else None,
+                pve.get("power"), pve.get("energy"), pve.get("duration"), pve.get("dps"),
+                json.dumps(m.get("pvp"), ensure_ascii=False) if m.get("pvp") else None,
+            ))
+        conn.executemany("INSERT OR REPLACE INTO moves VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+    return load
+
+
+def _load_boss(conn: sqlite3.Connection, data: Any) -> int:
+    conn.execute("DELETE FROM raid_bosses")
+    rows = [
+        (
+            r.get("name"), str(r.get("tier")), _bool(r.get("shiny_available")),
+            _cp(r.get("cp_range"), "min"), _cp(r.get("cp_range"), "max"),
+            _cp(r.get("boosted_cp_range"), "min"), _cp(r.get("boosted_cp_range"), "max"),
+            json.dumps(r.get("types") or []), r.get("asset_url"), species_key(r.get("name"))[0], None,
+        )
+        for r in _results(data) if r.get("name")
+    ]
+    conn.executemany("INSERT INTO raid_bosses VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    return len(rows)
+
+
+def _load_eggs(conn: sqlite3.Connection, data: Any) -> int:
+    conn.execute("DELETE FROM eggs")
+    rows = [
+        (
+            r.get("title"), r.get("name"), r.get("hatch_distance"), r.get("rarity_tier"),
+            _bool(r.get("shiny_available")), r.get("asset_url"), species_key(r.get("name"))[0], None,
+        )
+        for r in _results(data) if r.get("name")
+    ]
+    conn.executemany("INSERT INTO eggs VALUES(?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    return len(rows)
+
+
+def _load_research(conn: sqlite3.Connection, data: Any) -> int:
+    conn.execute("DELETE FROM research")
+    rows = []
+    for r in _results(data):
+        cp_range = r.get("cp_range")
+        if isinstance(cp_range, str):
+            cp_range = parse_cp_range(cp_range)
+        is_encounter = r.get("reward_type") == "encounter"
+        rows.append((
+            r.get("title"), r.get("task"), r.get("reward_type"), r.get("name"), r.get("quantity"),
+            _bool(r.get("shiny_available")), _cp(cp_range, "min"), _cp(cp_range, "max"), r.get("asset_url"),
+            species_key(r.get("name"))[0] if is_encounter else None, None,
+        ))
+    conn.executemany("INSERT INTO research VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    return len(rows)
+
+
+def _load_rocket(conn: sqlite3.Connection, data: Any) -> int:
+    conn.execute("DELETE FROM rocket_lineups")
+    rows = [
+        (
+            r.get("leader"), r.get("slot"), _bool(r.get("is_encounter")), r.get("name"),
+            _bool(r.get("shiny_available")), r.get("asset_url"), species_key(r.get("name"))[0], None,
+        )
+        for r in _results(data) if r.get("leader")
+    ]
+    conn.executemany("INSERT INTO rocket_lineups VALUES(?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    return len(rows)
+
+
+def _load_events(conn: sqlite3.Connection, data: Any) -> int:
+    conn.execute("DELETE FROM events")
+    rows = [
+        (
+            r["article_url"], r.get("category"), r.get("title"), r.get("banner_url"),
+            None if r.get("start_time") is None else str(r.get("start_time")),
+            None if r.get("end_time") is None else str(r.get("end_time")),
+            r.get("description"), json.dumps(r.get("details") or {}, ensure_ascii=False),
+        )
+        for r in _results(data) if r.get("article_url")
+    ]
+    conn.executemany("INSERT OR REPLACE INTO events VALUES(?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    return len(rows)
+
+
+LIST_LOADERS: dict[str, Callable[[sqlite3.Connection, Any], int]] = {
+    "type_chart": _load_type_chart,
+    "fast_moves": _move_loader("fast"),
+    "charge_moves": _move_loader("charged"),
+    "boss": _load_boss,
+    "eggs": _load_eggs,
+    "research": _load_research,
+    "rocket_lineups": _load_rocket,
+    "events": _load_events,
+}
+
+
+class SqliteExportStage(BaseStage):
+
+    def __init__(self, stage: Any, stage_settings: dict[str, Any]):
+        super().__init__(stage, stage_settings)
+        # next to the stage state (restored in CI); the single copy, nothing is published
+        self.db_path = os.path.join(os.path.dirname(self.state_path), f"{self.file_name}.sqlite")
+        # left behind by builds that published a second copy
+        self.legacy_path = os.path.join(self.json_dir, f"{self.file_name}.sqlite")
+        self.sources = {**LIST_SOURCES, **{k: tuple(v) for k, v in stage.get("sources", {}).items()}}
+
+    # -----------------------------
+    # Connection / bookkeeping
+    # -----------------------------
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.executescript(SCHEMA)
+        conn.executemany("INSERT OR IGNORE INTO types(name) VALUES(?)", [(t,) for t in TYPE_ORDER])
+        # only write when it differs: a no-op run must leave the file byte-identical
+        conn.execute(
+            "INSERT INTO meta VALUES('schema_version', ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value WHERE value IS NOT excluded.value",
+            (str(SCHEMA_VERSION),),
+        )
+        conn.commit()
+        return conn
+
+    @staticmethod
+    def _known_digests(conn: sqlite3.Connection, source: str) -> dict[str, str]:
+        return dict(conn.execute("SELECT doc_key, digest FROM documents WHERE source = ?", (source,)))
+
+    @staticmethod
+    def _mark(conn: sqlite3.Connection, source: str, doc_key: str, digest: Optional[str]):
+        if digest is None:
+            conn.execute("DELETE FROM documents WHERE source = ? AND doc_key = ?", (source, doc_key))
+        else:
+            conn.execute(
+                "INSERT OR REPLACE INTO documents VALUES(?, ?, ?, ?)",
+                (source, doc_key, digest, int(time.time())),
+            )
+
+    # -----------------------------
+    # Pokedex documents
+    # -----------------------------
+    @staticmethod
+    def _upsert_pokemon(conn: sqlite3.Connection, slug: str, doc: dict[str, Any]):
+        stats = base_stats(doc) or (None, None, None)
+        conn.execute(
+            """
+            INSERT INTO pokemon(id, dex, name, species_key, attack, defense, stamina, data)
+            VALUES(?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                dex = excluded.dex, name = excluded.name, species_key = excluded.species_key,
+                attack = excluded.attack, defense = excluded.defense, stamina = excluded.stamina,
+                data = excluded.data
+            """,
+            (
+                slug, dex_number(slug), species_name(doc, slug), species_key(slug_name(slug))[0],
+                stats[0], stats[1], stats[2], json.dumps(overview(doc), ensure_ascii=False),
+            ),
+        )
+        conn.execute("DELETE FROM pokemon_types WHERE pokemon_id = ?", (slug,))
+        conn.executemany(
+            "INSERT INTO pokemon_types VALUES(?, ?, ?)",
+            [(slug, i, t) for i, t in enumerate(species_types(doc), 1) if t in TYPE_ORDER],
+        )
+        conn.execute("DELETE FROM pokemon_movesets WHERE pokemon_id = ?", (slug,))
+        combos = (doc.get("moves_and_best_movesets") or {}).get("detailed_combinations") or []
+        conn.executemany(
+            "INSERT INTO pokemon_movesets VALUES(?, ?, ?, ?, ?, ?, ?)",
+            [
+                (slug, c.get("rank") if isinstance(c.get("rank"), int) else None,
+                 c.get("fast"), c.get("charged"), c.get("dps"), c.get("tdo"), c.get("score"))
+                for c in combos
+            ],
+        )
+
+    def _sync_pokedex(self, conn: sqlite3.Connection) -> int:
+        known = self._known_digests(conn, "pokemon")
+        changed = 0
+        present = set()
+
+        paths = list_species_files(self.output_root)
+        if not paths:
+            # pokedex outputs not available in this run: keep the stored rows
+            print("[SQLite] No pokedex outputs, pokemon table kept.")
+            return 0
+
+        for path in paths:
+            slug = species_slug(path)
+            present.add(slug)
+            digest = file_digest(path)
+            if known.get(slug) == digest:
+                continue
+            doc = load_species_doc(path)
+            if not doc:
+                continue
+            self._upsert_pokemon(conn, slug, doc)
+            self._mark(conn, "pokemon", slug, digest)
+            changed += 1
+
+        for slug in set(known) - present:
+            conn.execute("DELETE FROM pokemon WHERE id = ?", (slug,))
+            self._mark(conn, "pokemon", slug, None)
+            changed += 1
+
+        return changed
+
+    # -----------------------------
+    # List documents
+    # -----------------------------
+    def _sync_lists(self, conn: sqlite3.Connection) -> int:
+        changed = 0
+        for source, (pipeline, file_name, subfolder) in self.sources.items():
+            path = self.output_path(pipeline, file_name, subfolder)
+            digest = file_digest(path)
+            if digest is None or self._known_digests(conn, source).get(file_name) == digest:
+                continue
+            data = self.load_output(pipeline, file_name, subfolder)
+            rows = LIST_LOADERS[source](conn, data)
+            self._mark(conn, source, file_name, digest)
+            print(f"[SQLite] {source}: {rows} rows")
+            changed += 1
+        return changed
+
+    @staticmethod
+    def _link_species(conn: sqlite3.Connection):
+        for table in APPEARANCE_TABLES:
+            conn.execute(
+                f"""
+                UPDATE {table} SET pokemon_id = (
+                    SELECT p.id FROM pokemon p WHERE p.species_key = {table}.species_key
+                    ORDER BY p.dex LIMIT 1
+                )
+                WHERE species_key IS NOT NULL
+                """
+            )
+
+    def build(self) -> Optional[dict[str, Any]]:
+        conn = self._connect()
+        try:
+            with conn:
+                changed = self._sync_pokedex(conn) + self._sync_lists(conn)
+                if changed:
+                    self._link_species(conn)
+                    conn.execute("INSERT OR REPLACE INTO meta VALUES('built_at', ?)", (str(int(time.time())),))
+
+            if changed:
+                conn.execute("ANALYZE")
+
+            tables = [r[0] for r in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+            )]
+            counts = {t: conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in tables}
+        finally:
+            conn.close()
+
+        if os.path.exists(self.legacy_path):
+            os.remove(self.legacy_path)
+        print(f"[SQLite] {changed} documents changed → {self.db_path}")
+        return {
+            "database": os.path.relpath(self.db_path, self.output_root).replace(os.sep, "/"),
+            "schema_version": SCHEMA_VERSION,
+            "changed_documents": changed,
+            "tables": counts,
+        }
@@ -0,0 +1,79 @@
+"""
+type_matrix.py
+
+Dense attacker × defender effectiveness matrix built from TypeScraper
+output (type_chart.json), for the NumPy precompute stages.
+"""
+from typing import Any, Optional
+
+import numpy as np
+
+from src.scrapers.types.parsers.type_chart_parser import TYPE_ORDER
+from src.stages.game_constants import NO_EFFECT, NOT_VERY_EFFECTIVE, SUPER_EFFECTIVE
+
+TYPE_INDEX = {t: i for i, t in enumerate(TYPE_ORDER)}
+GAME_MULTIPLIERS = (SUPER_EFFECTIVE, 1.0, NOT_VERY_EFFECTIVE, NO_EFFECT)
+
+
+def snap_multiplier(value: float) -> float:
+    """
+    Scraped multiplier → exact game constant. The chart shows rounded
+    percentages and older outputs stored them rounded to 2 decimals
+    (0.625 → 0.62, 0.390625 → 0.39).
+    """
+    nearest = min(GAME_MULTIPLIERS, key=lambda c: abs(c - value))
+    return nearest if abs(nearest - value) <= 0.05 * nearest else value
+
+
+def type_index(name: Optional[str]) -> int:
+    """Index into TYPE_ORDER, -1 when unknown."""
+    if not name:
+        return -1
+    return TYPE_INDEX.get(str(name).strip().capitalize(), -1)
+
+
+def type_matrix(type_chart: Optional[dict[str, Any]]) -> np.ndarray:
+    """
+    M[attacker, defender] multiplier.
+
+    Uses the raw "multipliers" recorded by parse_type_chart; older outputs
+    only have the bucketed lists, which are mapped to the game constants.
+    """
+    m = np.ones((len(TYPE_ORDER), len(TYPE_ORDER)), dtype=np.float64)
+    types = (type_chart or {}).get("results") or {}
+
+    for attacker, entry in types.items():
+        a = type_index(attacker)
+        if a < 0:
+            continue
+        attack = entry.get("attack") or {}
+
+        raw = attack.get("multipliers")
+        if raw:
+            for defender, mult in raw.items():
+                d = type_index(defender)
+                if d >= 0 and mult is not None:
+                    m[a, d] = snap_multiplier(float(mult))
+            continue
+
+        for key, mult in (
+                ("super_effective", SUPER_EFFECTIVE),
+                ("not_very_effective", NOT_VERY_EFFECTIVE),
+                ("no_effect", NO_EFFECT),
+        ):
+            for defender in attack.get(key) or []:
+                d = type_index(defender)
+                if d >= 0:
+                    m[a, d] = mult
+
+    return m
+
+
+def defender_multipliers(matrix: np.ndarray, defender_types: list[str]) -> np.ndarray:
+    """(n_types,) multiplier of every attacking type against a (dual-)typed defender."""
+    out = np.ones(matrix.shape[0], dtype=np.float64)
+    for t in defender_types:
+        d = type_index(t)
+        if d >= 0:
+            out *= matrix[:, d]
+    return out
@@ -0,0 +1,154 @@
+"""
+weather_matchup_stage.py
+
+Best attacking types per weather × defender typing.
+
+Combines the type chart (TypeScraper output) with the fixed weather →
+boosted types map and scores every attacking type against every defender
+typing (18 single + 153 dual) under every weather, plus "none", in one
+NumPy broadcast:
+
+    score[w, d, a] = M[a, type 1 of d] × M[a, type 2 of d] × (WEATHER_BOOST if a is boosted in w)
+
+Only the top_n attackers of each cell are kept, best first. The artifact is
+written compact, so clients can serve it as-is. Cells are keyed by
+"weather|Defender" (Firestore rejects arrays nested in arrays):
+  - "types":     TYPE_ORDER (attacker indices below point here)
+  - "weathers":  ["none", "sunny", ...]
+  - "boosted":   {weather: [type index, ...]}
+  - "defenders": ["Normal", ..., "Fire/Flying", ...]
+  - "rank":      {"rainy|Fire/Flying": [attacker index, ...]}
+  - "mult":      {"rainy|Fire/Flying": [multiplier, ...]}
+
+Multipliers come from the snapped game constants (type_matrix), so the
+products are exact up to float noise, which 6 decimals remove.
+
+WeatherMatchups answers "best types vs Fire/Flying in the rain" from it.
+"""
+import itertools
+import json
+import re
+import time
+from typing import Any, Optional
+
+import numpy as np
+
+from src.base.base_stage import BaseStage
+from src.scrapers.types.parsers.type_chart_parser import TYPE_ORDER
+from src.stages.game_constants import WEATHER_BOOST, WEATHER_TYPES
+from src.stages.type_matrix import type_index, type_matrix
+
+MATCHUP_FORMAT_VERSION = 2
+NO_WEATHER = "none"
+WEATHERS = [NO_WEATHER] + list(WEATHER_TYPES)
+WEATHER_ALIASES = {"clear": "sunny", "rain": "rainy", "snowy": "snow", "foggy": "fog", "extreme": NO_WEATHER}
+
+
+def weather_key(name: Optional[str]) -> str:
+    """Weather name → WEATHERS key ("Partly Cloudy" → "partly_cloudy", empty → "none")."""
+    key = re.sub(r"[^a-z]+", "_", str(name or "").lower()).strip("_") or NO_WEATHER
+    return WEATHER_ALIASES.get(key, key)
+
+
+def cell_key(weather: str, defender: str) -> str:
+    """rank / mult key of one cell: "rainy|Fire/Flying"."""
+    return f"{weather}|{defender}"
+
+
+def defender_typings() -> list[tuple[int, ...]]:
+    """Every single type, then every unordered pair (TYPE_ORDER indices)."""
+    n = len(TYPE_ORDER)
+    return [(i,) for i in range(n)] + list(itertools.combinations(range(n), 2))
+
+
+def boost_matrix() -> np.ndarray:
+    """B[w, a] weather multiplier of attacking type a, rows in WEATHERS order."""
+    boost = np.ones((len(WEATHERS), len(TYPE_ORDER)), dtype=np.float64)
+    for w, name in enumerate(WEATHERS):
+        for t in WEATHER_TYPES.get(name, []):
+            boost[w, type_index(t)] = WEATHER_BOOST
+    return boost
+
+
+def rank_matchups(matrix: np.ndarray, typings: list[tuple[int, ...]], top_n: int) -> tuple[np.ndarray, np.ndarray]:
+    """(W, D, top_n) attacker indices and multipliers, best first (ties in TYPE_ORDER order)."""
+    n = matrix.shape[0]
+    # an extra neutral column stands in for the missing second type
+    padded = np.hstack([matrix, np.ones((n, 1))])
+    first = [t[0] for t in typings]
+    second = [t[1] if len(t) > 1 else n for t in typings]
+    defend = (padded[:, first] * padded[:, second]).T               # (D, A)
+
+    score = boost_matrix()[:, None, :] * defend[None, :, :]         # (W, D, A)
+    order = np.argsort(-score, axis=-1, kind="stable")[..., :top_n]
+    return order, np.take_along_axis(score, order, axis=-1)
+
+
+# -----------------------------
+# Query side
+# -----------------------------
+class WeatherMatchups:
+
+    def __init__(self, artifact: dict[str, Any]):
+        self.types: list[str] = artifact.get("types", [])
+        self.rank: dict[str, list[int]] = artifact.get("rank", {})
+        self.mult: dict[str, list[float]] = artifact.get("mult", {})
+        self.weathers = set(artifact.get("weathers", []))
+        self.defenders = {
+            tuple(sorted(type_index(t) for t in key.split("/"))): key
+            for key in artifact.get("defenders", [])
+        }
+
+    @classmethod
+    def load(cls, path: str) -> "WeatherMatchups":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def best(self, weather: Optional[str], defender_types: list[str]) -> list[tuple[str, float]]:
+        """Ranked [(attacking type, multiplier)], [] for an unknown weather or typing."""
+        w = weather_key(weather)
+        d = self.defenders.get(tuple(sorted({type_index(t) for t in defender_types})))
+        if w not in self.weathers or d is None:
+            return []
+        key = cell_key(w, d)
+        return [(self.types[a], m) for a, m in zip(self.rank.get(key, []), self.mult.get(key, []))]
+
+
+# -----------------------------
+# Build side
+# -----------------------------
+class WeatherMatchupStage(BaseStage):
+
+    json_indent = None
+
+    def __init__(self, stage: Any, stage_settings: dict[str, Any]):
+        super().__init__(stage, stage_settings)
+        self.top_n = max(1, min(int(stage.get("top_n", 5)), len(TYPE_ORDER)))
+        self.type_chart_pipeline = stage.get("type_chart_pipeline", "monthly")
+
+    def build(self) -> Optional[dict[str, Any]]:
+        chart = self.load_output(self.type_chart_pipeline, "type_chart")
+        if not (chart or {}).get("results"):
+            print("[Weather] No type chart to build from.")
+            return None
+
+        typings = defender_typings()
+        order, mult = rank_matchups(type_matrix(chart), typings, self.top_n)
+        print(f"[Weather] {len(WEATHERS)} weathers × {len(typings)} defender typings, top {self.top_n} attackers")
+
+        defenders = ["/".join(TYPE_ORDER[i] for i in t) for t in typings]
+        order, mult = order.tolist(), np.round(mult, 6).tolist()
+        cells = [(w, d, cell_key(weather, defender))
+                 for w, weather in enumerate(WEATHERS) for d, defender in enumerate(defenders)]
+
+        return {
+            "version": MATCHUP_FORMAT_VERSION,
+            "built_at": int(time.time()),
+            "weather_boost": WEATHER_BOOST,
+            "types": TYPE_ORDER,
+            "weathers": WEATHERS,
+            "boosted": {name: [type_index(t) for t in WEATHER_TYPES.get(name, [])] for name in WEATHERS},
+            "defenders": defenders,
+            "rank": {key: order[w][d] for w, d, key in cells},
+            "mult": {key: mult[w][d] for w, d, key in cells},
+        }
@@ -1,16 +1,61 @@
 # src/upload_firestore.py
+import hashlib
 import json
 import os
 import re
 import sys
+import threading
 import time
-from typing import Any, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Protocol
 
 import firebase_admin
 from firebase_admin import credentials, firestore
 
+from src.common.delta_utils import (
+    confirm_snapshot, has_changes, index_records, is_delta_file, load_delta, record_digest,
+)
+
 RETRY_ATTEMPTS = 3
 RETRY_BACKOFF = 2
+BATCH_LIMIT = 500  # Firestore max writes per batch
+RECORDS_SUBCOLLECTION = "records"
+
+
+class FirestoreClient(Protocol):
+    """
+    The part of the Firestore client the uploader uses. Satisfied by
+    firestore.client(), a google.cloud.firestore.Client pointed at the
+    emulator, and src.firestore_fake.FakeFirestore.
+    """
+
+    def collection(self, name: str) -> Any: ...
+
+    def batch(self) -> Any: ...
+
+
+class UploadRun:
+    """Batch / concurrency / retry settings shared by every upload of one run, plus its counters."""
+
+    def __init__(self, batch_size: int = BATCH_LIMIT, concurrency: int = 1, retry_backoff: float = RETRY_BACKOFF):
+        self.batch_size = max(1, min(int(batch_size), BATCH_LIMIT))
+        self.concurrency = max(1, int(concurrency))
+        self.retry_backoff = retry_backoff
+        self.stats = {"writes": 0, "commits": 0, "doc_sets": 0, "retries": 0, "failed": 0}
+        self._lock = threading.Lock()
+
+    def count(self, key: str, n: int = 1):
+        with self._lock:
+            self.stats[key] += n
+
+    def backoff(self, attempt: int):
+        if self.retry_backoff:
+            time.sleep(self.retry_backoff ** attempt)
+
+    def batch_fill(self) -> float:
+        """Average share of the batch size each commit carried."""
+        commits = self.stats["commits"]
+        return self.stats["writes"] / (commits * self.batch_size) if commits else 0.0
 
 
 # ----------------------------------------------------------
@@ -42,11 +87,22 @@ def init_firebase(service_account_path: str):
     return firestore.client()
 
 
+def init_emulator(host: str, project: str = "demo-pogo") -> FirestoreClient:
+    """Client for a local Firestore emulator (gcloud emulators firestore start --host-port=<host>)."""
+    from google.cloud import firestore as gcloud_firestore
+
+    os.environ["FIRESTORE_EMULATOR_HOST"] = host
+    return gcloud_firestore.Client(project=project)
+
+
 # ----------------------------------------------------------
 # Find JSON files under output/<freq>/json/**
 # ----------------------------------------------------------
-def find_json_files(repo_root: str) -> List[str]:
+def find_json_files(repo_root: str, pipeline: Optional[str] = None) -> List[str]:
+    """Output files of every pipeline, or of `pipeline` only (CI restores the others as stage inputs)."""
     output_root = os.path.join(repo_root, "output")
+    if pipeline:
+        output_root = os.path.join(output_root, pipeline)
     if not os.path.isdir(output_root):
         return []
 
@@ -58,7 +114,8 @@ def find_json_files(repo_root: str) -> List[str]:
             continue
 
         for fn in files:
-            if fn.lower().endswith(".json"):
+            # <file>.delta.json patches are read alongside their output file
+            if fn.lower().endswith(".json") and not is_delta_file(fn):
                 json_files.append(os.path.join(root, fn))
 
     return sorted(json_files)
@@ -69,14 +126,35 @@ def find_json_files(repo_root: str) -> List[str]:
 # ----------------------------------------------------------
 
 
-def resolve_collection(config: Dict[str, Any], filename: str) -> str:
+def resolve_entry(config: Dict[str, Any], filename: str, folder: str = "") -> Dict[str, Any]:
+    base = filename[:-5]
+    entries = {**config.get("scrapers", {}), **config.get("stages", {})}
+    for _, meta in entries.items():
+        if meta.get("file_name") == base:
+            return meta
+
+    # Extra files of an entry with their own upload settings, e.g.
+    #   "files": {"move_details": {"record_key": ["id"], "upload_mode": "records"}}
+    for _, meta in entries.items():
+        if folder and (meta.get("subfolder") or meta.get("file_name")) == folder and base in meta.get("files", {}):
+            return {**meta, **meta["files"][base]}
+    return {}
+
+
+def resolve_collection(config: Dict[str, Any], filename: str, folder: str = "") -> str:
     base = filename[:-5]  # remove .json
+    entries = {**config.get("scrapers", {}), **config.get("stages", {})}
 
     # 1️⃣ Check explicit mapping in config.json
-    for _, meta in config.get("scrapers", {}).items():
+    for _, meta in entries.items():
         if meta.get("file_name") == base:
             return meta.get("collection", "misc")
 
+    # 1️⃣b Extra files written into an entry's folder (e.g. pvp_rankings/0001-bulbasaur, moves/fast_moves)
+    for _, meta in entries.items():
+        if folder and (meta.get("subfolder") or meta.get("file_name")) == folder:
+            return meta.get("collection", "misc")
+
     # 2️⃣ Pokémon details: 4 digits + "-" + name
     #     e.g. 0001-bulbasaur, 0359-absol
     if re.match(r"^\d{4}-[a-z0-9_\-]+$", base):
@@ -89,47 +167,162 @@ def resolve_collection(config: Dict[str, Any], filename: str) -> str:
 # ----------------------------------------------------------
 # Firestore upload
 # ----------------------------------------------------------
-def upload_doc(db, collection: str, doc_id: str, data: Dict[str, Any]):
+def upload_doc(db: FirestoreClient, collection: str, doc_id: str, data: Dict[str, Any],
+               run: Optional[UploadRun] = None):
+    run = run or UploadRun()
     payload = dict(data)
     payload["_updated_at"] = firestore.SERVER_TIMESTAMP
 
     for attempt in range(1, RETRY_ATTEMPTS + 1):
         try:
             db.collection(collection).document(doc_id).set(payload)
+            run.count("doc_sets")
             return
         except Exception as e:
             print(f"[WARN] Upload failed ({attempt}/{RETRY_ATTEMPTS}): {e}")
 
             if attempt == RETRY_ATTEMPTS:
+                run.count("failed")
                 raise
-            time.sleep(RETRY_BACKOFF ** attempt)
+            run.count("retries")
+            run.backoff(attempt)
 
 
 # ----------------------------------------------------------
-# Main pipeline
+# Per-record upload (upload_mode = "records")
+#   <collection>/<doc_id>                   → summary
+#   <collection>/<doc_id>/records/<rec_id>  → one results[] entry
 # ----------------------------------------------------------
-def main():
-    repo_root = get_repo_root()
-    service_account_path = os.path.join(repo_root, "serviceAccount.json")
-
-    print(f"[Firestore] repo_root = {repo_root}")
+def record_doc_id(rid: str) -> str:
+    """Stable Firestore-safe id for a record key (keys may contain '/')."""
+    return hashlib.sha1(rid.encode("utf-8")).hexdigest()
 
-    config = load_config(repo_root)
-
-    try:
-        db = init_firebase(service_account_path)
-    except Exception as e:
-        print(f"[ERROR] Firebase init failed: {e}")
-        sys.exit(1)
 
-    files = find_json_files(repo_root)
+def _commit_chunk(db: FirestoreClient, chunk: List[tuple], run: UploadRun):
+    for attempt in range(1, RETRY_ATTEMPTS + 1):
+        batch = db.batch()
+        for op, ref, payload in chunk:
+            if op == "set":
+                batch.set(ref, payload)
+            else:
+                batch.delete(ref)
+        try:
+            batch.commit()
+            run.count("commits")
+            run.count("writes", len(chunk))
+            return
+        except Exception as e:
+            print(f"[WARN] Batch commit failed ({attempt}/{RETRY_ATTEMPTS}): {e}")
 
-    if not files:
-        print("[Firestore] No JSON files found.")
+            if attempt == RETRY_ATTEMPTS:
+                run.count("failed")
+                raise
+            run.count("retries")
+            run.backoff(attempt)
+
+
+def commit_batched(db: FirestoreClient, ops: List[tuple], run: Optional[UploadRun] = None):
+    """
+    ops: ("set", ref, payload) | ("delete", ref, None), committed run.batch_size
+    at a time, up to run.concurrency batches in flight. The last chunk (which
+    carries the summary doc in records mode) commits after all the others.
+    """
+    run = run or UploadRun()
+    chunks = [ops[start:start + run.batch_size] for start in range(0, len(ops), run.batch_size)]
+    if not chunks:
         return
 
-    print(f"[Firestore] Found {len(files)} JSON files.")
+    head, last = chunks[:-1], chunks[-1]
+    if run.concurrency > 1 and len(head) > 1:
+        with ThreadPoolExecutor(max_workers=run.concurrency) as pool:
+            for _ in pool.map(lambda chunk: _commit_chunk(db, chunk, run), head):
+                pass
+    else:
+        for chunk in head:
+            _commit_chunk(db, chunk, run)
+    _commit_chunk(db, last, run)
+
+
+def record_payload(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Stored form of one record: its fields (without "_id") plus _hash and _updated_at."""
+    payload = {k: v for k, v in record.items() if k != "_id"}
+    payload["_hash"] = record_digest(payload)
+    payload["_updated_at"] = firestore.SERVER_TIMESTAMP
+    return payload
+
+
+def upload_records(
+        db: FirestoreClient,
+        collection: str,
+        doc_id: str,
+        records: List[Dict[str, Any]],
+        key_fields: List[str],
+        delta: Optional[Dict[str, Any]] = None,
+        run: Optional[UploadRun] = None,
+        reconcile: bool = False,
+) -> Dict[str, int]:
+    """
+    Apply `delta` (diffed against the last confirmed upload): upsert its added
+    and changed records, delete its removed ones. Costs O(change).
+
+    Without a delta, for a first snapshot, or with `reconcile`, the stored
+    records are diffed instead (one read of ids + hashes, O(dataset)).
+    """
+    parent = db.collection(collection).document(doc_id)
+    records_ref = parent.collection(RECORDS_SUBCOLLECTION)
+    ops: List[tuple] = []
+
+    if delta and not delta.get("first_snapshot") and not reconcile:
+        for rec in delta.get("added", []) + delta.get("changed", []):
+            ops.append(("set", records_ref.document(record_doc_id(rec["_id"])), record_payload(rec)))
+        for rec in delta.get("removed", []):
+            ops.append(("delete", records_ref.document(record_doc_id(rec["_id"])), None))
+    else:
+        current = {record_doc_id(rid): r for rid, r in index_records(records, key_fields).items()}
+        stored = {
+            snap.id: (snap.to_dict() or {}).get("_hash")
+            for snap in records_ref.select(["_hash"]).stream()
+        }
+        for rec_id, rec in current.items():
+            payload = record_payload(rec)
+            if stored.get(rec_id) != payload["_hash"]:
+                ops.append(("set", records_ref.document(rec_id), payload))
+        for rec_id in set(stored) - set(current):
+            ops.append(("delete", records_ref.document(rec_id), None))
+
+    if ops:
+        ops.append(("set", parent, {
+            "count": len(records),
+            "key": key_fields,
+            "mode": "records",
+            "_updated_at": firestore.SERVER_TIMESTAMP,
+        }))
+        commit_batched(db, ops, run)
+
+    written = sum(1 for op, ref, _ in ops if op == "set" and ref is not parent)
+    deleted = sum(1 for op, _, _ in ops if op == "delete")
+    return {"written": written, "deleted": deleted}
+
 
+# ----------------------------------------------------------
+# Main pipeline
+# ----------------------------------------------------------
+def upload_tree(
+        db: FirestoreClient,
+        config: Dict[str, Any],
+        files: List[str],
+        run: Optional[UploadRun] = None,
+        use_delta: bool = True,
+        confirm: bool = True,
+        reconcile: bool = False,
+) -> bool:
+    """
+    Upload every output file; returns True when any file failed.
+    With `confirm`, each uploaded file's staged snapshot is promoted, so its
+    next delta starts from what Firestore actually holds. `reconcile` diffs
+    records-mode files against the stored hashes instead of their delta.
+    """
+    run = run or UploadRun()
     any_error = False
 
     for path in files:
@@ -138,6 +331,14 @@ def main():
 
         print(f"\n→ Processing JSON: {filename}")
 
+        # Record-level delta since the last confirmed upload: nothing added/removed/changed → skip
+        delta = load_delta(path) if use_delta else None
+        if use_delta and not has_changes(delta):
+            print(f"[SKIP] {filename} unchanged since last upload")
+            if confirm:
+                confirm_snapshot(path, delta)
+            continue
+
         try:
             with open(path, "r", encoding="utf-8") as f:
                 data = json.load(f)
@@ -146,25 +347,83 @@ def main():
             any_error = True
             continue
 
-        collection = resolve_collection(config, filename)
+        # a failed fetch saves {}: never let it overwrite what is stored
+        if not data:
+            print(f"[SKIP] {filename} is empty (failed fetch?)")
+            continue
+
+        folder = os.path.basename(os.path.dirname(path))
+        collection = resolve_collection(config, filename, folder)
         doc_id = base
+        entry = resolve_entry(config, filename, folder)
+        results = data.get("results") if isinstance(data, dict) else None
+
+        if entry.get("upload_mode") == "records" and entry.get("record_key") and isinstance(results, list):
+            print(f"[Firestore] Upload records → {collection}/{doc_id}/{RECORDS_SUBCOLLECTION}")
+            try:
+                stats = upload_records(db, collection, doc_id, results, entry["record_key"],
+                                       delta, run, reconcile)
+            except Exception as e:
+                print(f"[ERROR] Record upload failed for {filename}: {e}")
+                any_error = True
+                continue
+
+            print(f"[OK] {collection}/{doc_id}: {stats['written']} written, {stats['deleted']} deleted")
+            if confirm:
+                confirm_snapshot(path, delta)
+            continue
 
         print(f"[Firestore] Upload → {collection}/{doc_id}")
 
         try:
-            upload_doc(db, collection, doc_id, data)
+            upload_doc(db, collection, doc_id, data, run)
         except Exception as e:
             print(f"[ERROR] Upload failed for {filename}: {e}")
             any_error = True
             continue
 
         print(f"[OK] Uploaded {collection}/{doc_id}")
+        if confirm:
+            confirm_snapshot(path, delta)
+
+    return any_error
+
+
+def main(db: Optional[FirestoreClient] = None):
+    repo_root = get_repo_root()
+    service_account_path = os.path.join(repo_root, "serviceAccount.json")
+
+    print(f"[Firestore] repo_root = {repo_root}")
+
+    config = load_config(repo_root)
+
+    if db is None:
+        try:
+            db = init_firebase(service_account_path)
+        except Exception as e:
+            print(f"[ERROR] Firebase init failed: {e}")
+            sys.exit(1)
+
+    # python -m src.upload_firestore [pipeline] [--reconcile]
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    reconcile = "--reconcile" in sys.argv[1:]
+    pipeline = args[0].lower() if args else None
+    files = find_json_files(repo_root, pipeline)
+
+    if not files:
+        print("[Firestore] No JSON files found.")
+        return
+
+    print(f"[Firestore] Found {len(files)} JSON files.")
+
+    upload_cfg = config.get("firestore", {})
+    run = UploadRun(upload_cfg.get("batch_size", BATCH_LIMIT), upload_cfg.get("concurrency", 1))
 
-    if any_error:
+    if upload_tree(db, config, files, run, reconcile=reconcile):
         sys.exit(2)
 
-    print("\n[Firestore] All uploads complete.")
+    print(f"\n[Firestore] All uploads complete: {run.stats}")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Benchmark RaidNowScraper.parse (BlockSpec single pass) against the previous
+select_one-per-field implementation and check both give identical output.
+
+    python tools/bench_raidnow_parse.py [page.html ...] [--blocks N] [--repeat R]
+
+Without pages, the cached RaidNow page is used if present, otherwise a
+synthetic page with N blocks.
+"""
+import argparse
+import logging
+import os
+import random
+import re
+import sys
+import time
+from typing import Any, Dict, List
+
+from bs4 import BeautifulSoup
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.common.records import as_plain  # noqa: E402
+from src.scrapers.raids.raid_now_scraper import RaidNowScraper  # noqa: E402
+
+CACHED_PAGE = os.path.join(PROJECT_ROOT, "output", "hourly", "html", "raidnow", "raidnow.html")
+
+
+def legacy_parse(soup: BeautifulSoup) -> dict[str, Any]:
+    """RaidNowScraper.parse before the BlockSpec rewrite (reference output)."""
+    raids: List[Dict[str, Any]] = []
+
+    blocks = (
+            soup.select("div.top_raids_list div.par_raid_list")
+            or soup.select("div.par_raid_list")
+    )
+
+    for block in blocks:
+        try:
+            # 1. Basic fields
+            img_el = block.select_one(".pokemon-box img.w67") or block.select_one(".pokemon-box img")
+            image = img_el.get("data-src") or img_el.get("src") if img_el else None
+
+            shiny = bool(block.select_one("img.shiny"))
+
+            # 2. CP values
+            cp = cp_weather = None
+            cp_c = block.select_one(".font-s8")
+            if cp_c:
+                g = cp_c.select_one("span.gray")
+                if g and g.text.strip().isdigit():
+                    cp = int(g.text.strip())
+                w = cp_c.select_one("span.weather_color")
+                if w and w.text.strip().isdigit():
+                    cp_weather = int(w.text.strip())
+
+            # 3. Expired
+            expired = False
+            t = block.select_one(".fa-clock-o")
+            if t:
+                text = t.parent.get_text(" ", strip=True)
+                expired = "Expired" in text or "expired" in text
+
+            # 4. Players
+
+            # 5. Country
+            country = None
+            flag = block.select_one(".national_flag_icon img")
+            if flag:
+                src = flag.get("data-src") or flag.get("src") or ""
+                country = src.split("/")[-1].split("?")[0].replace(".png", "")
+
+            # 6. Name & post id
+            name_el = block.select_one(".top_list_poke_name")
+            name = name_el.get_text(strip=True) if name_el else None
+            post_id = (block.select_one(".dpn") or {}).get_text(strip=True) if block.select_one(".dpn") else None
+
+            # 7. Stars
+            stars = None
+            star_el = block.select_one(".fa-star")
+            if star_el:
+                import re
+                m = re.search(r"\d+", star_el.parent.get_text())
+                if m:
+                    stars = int(m.group(0))
+
+            # 8. Trainer Level
+            trainer_level = None
+            for el in block.select(".font-12px"):
+                txt = el.get_text(" ", strip=True)
+                if "TL" in txt:
+                    import re
+                    m = re.search(r"TL\s*:?(\d+)", txt)
+                    if m:
+                        trainer_level = int(m.group(1))
+                    break
+
+            # 9. Flags
+            is_hot = bool(block.select_one(".hot_post_label"))
+            is_mega = bool(block.select_one(".mega_poke_label"))
+
+            # 10. Limited
+            limited_tl = None
+            ltd = block.select_one(".limited_tl_label")
+            if ltd:
+                import re
+                nums = re.findall(r"\d+", ltd.text)
+                if nums:
+                    limited_tl = int(nums[0])
+
+            # 11. Weather
+            weather_icon = None
+            w_ic = block.select_one(".current_wethar_icon")
+            if w_ic:
+                weather_icon = w_ic.get("data-src") or w_ic.get("src")
+
+            # 12. Team
+            team = None
+            if block.select_one(".gym_color_valor"):
+                team = "Valor"
+            elif block.select_one(".gym_color_mystic"):
+                team = "Mystic"
+            elif block.select_one(".gym_color_instinct"):
+                team = "Instinct"
+
+            raids.append(
+                {
+                    "name": name,
+                    "post_id": post_id,
+                    "country": country,
+                    "image": image,
+                    "shiny": shiny,
+                    "cp": cp,
+                    "cp_weather": cp_weather,
+                    "expired": expired,
+                    "trainer_level": trainer_level,
+                    "stars": stars,
+                    "is_hot": is_hot,
+                    "is_mega": is_mega,
+                    "limited_tl": limited_tl,
+                    "weather_icon": weather_icon,
+                    "team": team,
+                }
+            )
+
+        except Exception as e:
+            pass
+
+    return {"results": raids}
+
+
+# -----------------------------
+# Synthetic page
+# -----------------------------
+def synthetic_block(rng: random.Random, i: int) -> str:
+    def maybe(html: str, p: float = 0.8) -> str:
+        return html if rng.random() < p else ""
+
+    shiny = maybe('<img class="shiny" src="s.png">', 0.3)
+    parts = [
+        maybe(f'<div class="pokemon-box"><img class="w67" data-src="/img/{i}.png" src="x.gif">{shiny}</div>', 0.97),
+        maybe(f'<div class="top_list_poke_name">Mon {i}</div>'),
+        maybe(f'<span class="dpn">{100000 + i}</span>', 0.95),
+        maybe(f'<div class="font-s8"><span class="gray">{1000 + i}</span> / '
+              f'<span class="weather_color">{1200 + i}</span></div>'),
+        maybe(f'<p><i class="fa fa-star"></i> {rng.randint(1, 6)}</p>'),
+        maybe(f'<p><i class="fa fa-clock-o"></i> {rng.choice(["Expired", "12 min left"])}</p>'),
+        '<div class="font-12px">Players 3/5</div>',
+        maybe(f'<div class="font-12px">TL: {rng.randint(1, 50)}</div>'),
+        maybe('<div class="national_flag_icon"><img data-src="/flags/us.png?v=2"></div>'),
+        maybe('<span class="hot_post_label">HOT</span>', 0.2),
+        maybe('<span class="mega_poke_label">MEGA</span>', 0.2),
+        maybe(f'<span class="limited_tl_label">TL {rng.randint(10, 40)}+</span>', 0.3),
+        maybe('<img class="current_wethar_icon" src="/w/sunny.png">', 0.5),
+        f'<div class="gym_color_{rng.choice(["valor", "mystic", "instinct"])}"></div>',
+    ]
+    return f'<div class="par_raid_list"><div class="row"><div class="info">{"".join(parts)}</div></div></div>'
+
+
+def synthetic_page(n: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    blocks = "".join(synthetic_block(rng, i) for i in range(n))
+    return f"<html><body><div class='top_raids_list'>{blocks}</div></body></html>"
+
+
+def bench(fn, soup, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(soup)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("pages", nargs="*")
+    ap.add_argument("--blocks", type=int, default=500)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+    logging.disable(logging.CRITICAL)  # skipped blocks are expected on synthetic pages
+
+    pages = args.pages or ([CACHED_PAGE] if os.path.exists(CACHED_PAGE) else [])
+    sources = [(p, open(p, encoding="utf-8").read()) for p in pages] or [
+        (f"synthetic ({args.blocks} blocks)", synthetic_page(args.blocks))
+    ]
+
+    new_parse = RaidNowScraper.parse.__get__(object.__new__(RaidNowScraper))
+    failed = False
+
+    for label, html in sources:
+        soup = BeautifulSoup(html, "lxml")
+        old_out, new_out = legacy_parse(soup), as_plain(new_parse(soup))
+        same = old_out == new_out
+        failed |= not same
+
+        t_old = bench(legacy_parse, soup, args.repeat)
+        t_new = bench(new_parse, soup, args.repeat)
+        n = len(new_out["results"])
+        print(f"{label}: {n} raids | legacy {t_old * 1000:.1f} ms | spec {t_new * 1000:.1f} ms | "
+              f"x{t_old / t_new:.2f} | identical output: {same}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
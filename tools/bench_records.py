@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Benchmark the slotted record classes (src/common/records.py) against the
+free-form dicts the parsers used to build.
+
+    python tools/bench_records.py [--n N] [--repeat R]
+
+Per entity it reports memory per record (tracemalloc), build time, time to
+JSON and the two combined (old dicts → records). "JSON" is the text
+save_to_json writes (indent=4): json.dumps for the dicts, dumps_indented
+for the records. For research rewards the "dict" side is the old two-step
+path: nested {title: [{task, rewards}]} followed by the
+convert_research_json flattening copy. Both sides build from the same
+field reads, the way the parsers do: a dict literal vs a positional
+record constructor.
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.common.records import RaidBoss, RaidNowEntry, ResearchReward, as_plain, dumps_indented  # noqa: E402
+
+
+# -----------------------------
+# Sample values (shared by both sides)
+# -----------------------------
+def raidnow_values(rng: random.Random, n: int) -> list[dict]:
+    return [{
+        "name": f"Mon {i}", "post_id": str(100000 + i), "country": "us", "image": f"/img/{i}.png",
+        "shiny": rng.random() < 0.3, "cp": 1000 + i, "cp_weather": 1200 + i, "expired": rng.random() < 0.5,
+        "trainer_level": rng.randint(1, 50), "stars": rng.randint(1, 6), "is_hot": False, "is_mega": False,
+        "limited_tl": None, "weather_icon": "/w/sunny.png", "team": "Valor",
+    } for i in range(n)]
+
+
+def boss_values(rng: random.Random, n: int) -> list[dict]:
+    return [{
+        "name": f"Boss {i}", "tier": rng.choice([1, 3, 5, "Mega"]), "shiny_available": rng.random() < 0.5,
+        "cp_range": {"min": 1500 + i, "max": 1600 + i}, "boosted_cp_range": {"min": 1900 + i, "max": 2000 + i},
+        "types": ["fire", "flying"], "asset_url": f"/assets/{i}.png",
+    } for i in range(n)]
+
+
+def research_values(rng: random.Random, n: int) -> list[tuple[str, str, dict]]:
+    out = []
+    for i in range(n):
+        title, task = f"Category {i // 40}", f"Task {i // 2}"
+        if rng.random() < 0.5:
+            reward = {"type": "encounter", "name": f"Mon {i}", "shiny_available": True,
+                      "cp_range": {"min": 300, "max": 400}, "asset_url": f"/img/{i}.png"}
+        else:
+            reward = {"type": "item", "name": "Poké Ball", "quantity": 5, "asset_url": "/img/ball.png"}
+        out.append((title, task, reward))
+    return out
+
+
+# -----------------------------
+# Builders
+# -----------------------------
+def research_legacy(values):
+    nested: dict = {}
+    for title, task, reward in values:
+        tasks = nested.setdefault(title, [])
+        if not tasks or tasks[-1]["task"] != task:
+            tasks.append({"task": task, "rewards": []})
+        tasks[-1]["rewards"].append(dict(reward))
+
+    result = []
+    for title, tasks in nested.items():
+        for task_entry in tasks:
+            for reward in task_entry["rewards"]:
+                result.append({
+                    "title": title, "task": task_entry["task"], "reward_type": reward.get("type"),
+                    "name": reward.get("name"), "shiny_available": reward.get("shiny_available"),
+                    "cp_range": reward.get("cp_range"), "quantity": reward.get("quantity"),
+                    "asset_url": reward.get("asset_url"),
+                })
+    return result
+
+
+def research_records(values):
+    rows = []
+    for title, task, reward in values:
+        rows.append(ResearchReward(
+            title=title, task=task, reward_type=reward["type"], name=reward["name"],
+            shiny_available=reward.get("shiny_available"), cp_range=reward.get("cp_range"),
+            quantity=reward.get("quantity"), asset_url=reward["asset_url"],
+        ))
+    return rows
+
+
+def raidnow_dicts(values):
+    return [{
+        "name": v["name"], "post_id": v["post_id"], "country": v["country"], "image": v["image"],
+        "shiny": v["shiny"], "cp": v["cp"], "cp_weather": v["cp_weather"], "expired": v["expired"],
+        "trainer_level": v["trainer_level"], "stars": v["stars"], "is_hot": v["is_hot"],
+        "is_mega": v["is_mega"], "limited_tl": v["limited_tl"], "weather_icon": v["weather_icon"],
+        "team": v["team"],
+    } for v in values]
+
+
+def raidnow_records(values):
+    return [RaidNowEntry(
+        v["name"], v["post_id"], v["country"], v["image"], v["shiny"], v["cp"], v["cp_weather"],
+        v["expired"], v["trainer_level"], v["stars"], v["is_hot"], v["is_mega"], v["limited_tl"],
+        v["weather_icon"], v["team"],
+    ) for v in values]
+
+
+def boss_dicts(values):
+    return [{
+        "name": v["name"], "tier": v["tier"], "shiny_available": v["shiny_available"],
+        "cp_range": v["cp_range"], "boosted_cp_range": v["boosted_cp_range"], "types": v["types"],
+        "asset_url": v["asset_url"],
+    } for v in values]
+
+
+def boss_records(values):
+    return [RaidBoss(
+        v["name"], v["tier"], v["shiny_available"], v["cp_range"], v["boosted_cp_range"], v["types"],
+        v["asset_url"],
+    ) for v in values]
+
+
+CASES = [
+    ("RaidNowEntry", raidnow_values, raidnow_dicts, raidnow_records),
+    ("RaidBoss", boss_values, boss_dicts, boss_records),
+    ("ResearchReward", research_values, research_legacy, research_records),
+]
+
+
+# -----------------------------
+# Measurement
+# -----------------------------
+def dump_dicts(dicts: list[dict]) -> str:
+    return json.dumps({"results": dicts}, ensure_ascii=False, indent=4)
+
+
+def best_time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def retained_bytes(build, values) -> int:
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    built = build(values)
+    size = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del built
+    return size
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=20000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    failed = False
+    for label, make_values, build_dicts, build_records in CASES:
+        values = make_values(random.Random(7), args.n)
+        dicts, records = build_dicts(values), build_records(values)
+
+        same = (dicts == as_plain(records)
+                and dump_dicts(dicts) == dumps_indented({"results": records}))
+        failed |= not same
+
+        mem_d = retained_bytes(build_dicts, values) / args.n
+        mem_r = retained_bytes(build_records, values) / args.n
+        t_build_d = best_time(lambda: build_dicts(values), args.repeat)
+        t_build_r = best_time(lambda: build_records(values), args.repeat)
+        t_json_d = best_time(lambda: dump_dicts(dicts), args.repeat)
+        t_json_r = best_time(lambda: dumps_indented({"results": records}), args.repeat)
+        t_total_d = best_time(lambda: dump_dicts(build_dicts(values)), args.repeat)
+        t_total_r = best_time(lambda: dumps_indented({"results": build_records(values)}), args.repeat)
+
+        print(f"{label} x{args.n}: "
+              f"mem {mem_d:.0f} → {mem_r:.0f} B/record | "
+              f"build {t_build_d * 1000:.1f} → {t_build_r * 1000:.1f} ms | "
+              f"to JSON {t_json_d * 1000:.1f} → {t_json_r * 1000:.1f} ms | "
+              f"build+JSON {t_total_d * 1000:.1f} → {t_total_r * 1000:.1f} ms | "
+              f"identical output: {same}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Firestore uploader (src/upload_firestore.py) on the local
+output/ tree without touching production.
+
+    python tools/bench_upload.py [--batch-sizes 100,250,500] [--concurrency 1,4,8]
+                                 [--latency-ms 40] [--per-write-ms 0.05] [--error-rate 0.01]
+                                 [--emulator localhost:8080] [--deltas] [--limit N]
+
+Every (batch size, concurrency) pair uploads the same files into a fresh
+in-memory FakeFirestore (or a cleared emulator with --emulator) through
+upload_tree, and reports documents written per second, commits, retries,
+failures and batch efficiency (average share of the batch size each commit
+carried). --deltas uploads like CI: files without changes are skipped and
+records-mode files apply their delta's added / changed / removed lists.
+By default every file is uploaded in full (records-mode files through the
+stored-hash reconcile). Snapshots are never confirmed, so the next real
+upload still sees the same deltas.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import requests
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.firestore_fake import FakeFirestore  # noqa: E402
+from src.upload_firestore import UploadRun, find_json_files, init_emulator, load_config, upload_tree  # noqa: E402
+
+
+def int_list(raw: str) -> list[int]:
+    return [int(x) for x in raw.split(",") if x.strip()]
+
+
+def clear_emulator(host: str, project: str):
+    url = f"http://{host}/emulator/v1/projects/{project}/databases/(default)/documents"
+    requests.delete(url, timeout=30).raise_for_status()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--batch-sizes", type=int_list, default=[100, 250, 500])
+    ap.add_argument("--concurrency", type=int_list, default=[1, 4, 8])
+    ap.add_argument("--latency-ms", type=float, default=40.0, help="fake round trip per RPC")
+    ap.add_argument("--per-write-ms", type=float, default=0.05, help="fake extra time per write in a commit")
+    ap.add_argument("--error-rate", type=float, default=0.01, help="fake share of RPCs failing with 503")
+    ap.add_argument("--backoff", type=float, default=1.1, help="retry backoff base in seconds (uploader uses 2)")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--emulator", help="host:port of a Firestore emulator instead of the in-memory fake")
+    ap.add_argument("--project", default="demo-pogo")
+    ap.add_argument("--deltas", action="store_true", help="upload only changed files, like CI")
+    ap.add_argument("--limit", type=int, help="first N output files only")
+    ap.add_argument("--verbose", action="store_true", help="keep the uploader's per-file log")
+    args = ap.parse_args()
+
+    config = load_config(PROJECT_ROOT)
+    files = find_json_files(PROJECT_ROOT)[:args.limit]
+    if not files:
+        print("[Bench] No JSON files under output/ — run the scrapers first.")
+        sys.exit(1)
+
+    size_mb = sum(os.path.getsize(p) for p in files) / 1024 / 1024
+    target = f"emulator {args.emulator}" if args.emulator else (
+        f"fake (latency {args.latency_ms:g} ms + {args.per_write_ms:g} ms/write, errors {args.error_rate:.1%})")
+    print(f"[Bench] {len(files)} files ({size_mb:.1f} MB) → {target}")
+    print(f"{'batch':>6} {'conc':>5} {'docs':>7} {'secs':>7} {'docs/s':>8} {'commits':>8} "
+          f"{'sets':>5} {'retries':>8} {'failed':>7} {'fill':>6}")
+
+    failed = False
+    for batch_size in args.batch_sizes:
+        for concurrency in args.concurrency:
+            if args.emulator:
+                clear_emulator(args.emulator, args.project)
+                db = init_emulator(args.emulator, args.project)
+            else:
+                db = FakeFirestore(args.latency_ms, args.per_write_ms, args.error_rate, seed=args.seed)
+            run = UploadRun(batch_size, concurrency, retry_backoff=args.backoff)
+
+            log = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+            started = time.perf_counter()
+            with log:
+                any_error = upload_tree(db, config, files, run, use_delta=args.deltas, confirm=False)
+            elapsed = time.perf_counter() - started
+            failed |= any_error
+
+            s = run.stats
+            docs = s["writes"] + s["doc_sets"]
+            print(f"{run.batch_size:>6} {run.concurrency:>5} {docs:>7} {elapsed:>7.2f} "
+                  f"{docs / elapsed if elapsed else 0:>8.0f} {s['commits']:>8} {s['doc_sets']:>5} "
+                  f"{s['retries']:>8} {s['failed']:>7} {run.batch_fill():>6.0%}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()